@@ -1,6 +1,7 @@
 """
-This module contains Hex Widget class that is used by
-main window to display map cells
+This module contains HexItem scene item that is used by main window
+to display map cells. Each distinct hex appearance is rendered into
+QPixmap tile once and then reused
 """
 import math
 from functools import lru_cache
@@ -10,66 +11,99 @@ from PySide6 import QtWidgets, QtGui, QtCore
 
 import GUI.ui as ui
 
+TILE_CACHE: dict[tuple[float, tuple[int, int, int], str], QtGui.QPixmap] = {}
 
-class Hex(QtWidgets.QWidget):
+
+def get_hex_points(radius: float) -> Generator:
+    """
+    Creates generator of vertex coordinates in pixels relative
+    to center of hexagon inscribed in a circle of given radius
+    :param radius: circumscribed circle radius
+    :return: Generator
+    """
+    width = radius * 2
+    height = math.sqrt(3) * radius
+    return (
+        (
+            width / 2 + radius * math.cos(math.radians(60 * i)),
+            height / 2 + radius * math.sin(math.radians(60 * i)),
+        )
+        for i in range(6)
+    )
+
+
+@lru_cache(maxsize=None)
+def create_hex(radius: float) -> QtGui.QPolygonF:
     """
-    Hexagonal Widget class used to display map cells in main window
+    Creates PySide QPolygonF obj of hexagon inscribed in a circle of given radius,
+    polygon is shared by all tiles of the same radius
+    :param radius: circumscribed circle radius
+    :return: PySide QPolygonF obj
+    """
+    polygon = QtGui.QPolygonF()
+    for point in get_hex_points(radius):
+        polygon.append(QtCore.QPointF(*point))
+    return polygon
+
+
+def get_tile(radius: float, color: tuple[int, int, int], text: str) -> QtGui.QPixmap:
+    """
+    Returns pre-rendered hexagon with border, fill and text. Tile is
+    rendered once for each (radius, color, text), tile has margin of
+    border weight on each side, so hexagon starts at (HEX_BORDER_WEIGHT,
+    HEX_BORDER_WEIGHT) pixel
+    :param radius: circumscribed circle radius
+    :param color: fill color
+    :param text: text to display
+    :return: QPixmap obj
+    """
+    key = (radius, color, text)
+    tile = TILE_CACHE.get(key)
+    if tile is not None:
+        return tile
+    margin = ui.HEX_BORDER_WEIGHT
+    tile = QtGui.QPixmap(
+        math.ceil(radius * 2) + margin * 2,
+        math.ceil(math.sqrt(3) * radius) + margin * 2,
+    )
+    tile.fill(QtCore.Qt.transparent)
+    pen = QtGui.QPen(QtGui.QColor(*ui.HEX_BORDER_COLOR))
+    pen.setWidth(ui.HEX_BORDER_WEIGHT)
+    painter = QtGui.QPainter(tile)
+    painter.setRenderHint(QtGui.QPainter.Antialiasing)
+    painter.translate(margin, margin)
+    painter.setPen(pen)
+    painter.setBrush(QtGui.QBrush(QtGui.QColor(*color)))
+    painter.drawPolygon(create_hex(radius))
+    painter.drawText(12, 12, f"{text}")
+    painter.end()
+    TILE_CACHE[key] = tile
+    return tile
+
+
+class HexItem(QtWidgets.QGraphicsPixmapItem):
+    """
+    Hexagonal item of QGraphicsScene used to display map cells
+    in main window, item is created once per map cell and only
+    its tile is changed during the game
     """
 
     def __init__(
         self,
-        hex_outer_radius: int,
+        radius: float,
         color: tuple[int, int, int],
         text: Optional[str] = "",
-        parent: Optional[QtWidgets.QTabWidget] = None,
     ):
-        super().__init__(parent)
-        self.color = color
-        self.text = text
-        self.pen = QtGui.QPen(QtGui.QColor(*ui.HEX_BORDER_COLOR))
-        self.pen.setWidth(ui.HEX_BORDER_WEIGHT)
-        self.brush = QtGui.QBrush(QtGui.QColor(*self.color))
-        self.polygon = self.create_hex(hex_outer_radius)
-
-    @lru_cache(1)
-    def create_hex(self, radius: float) -> QtGui.QPolygonF:
-        """
-        Creates PySide QPolygonF obj of hexagon inscribed in a circle of given radius
-        :param radius: circumscribed circle radius
-        :return: PySide QPolygonF obj
-        """
-        polygon = QtGui.QPolygonF()
-        for point in self.get_hex_points(radius):
-            polygon.append(QtCore.QPointF(*point))
-        return polygon
-
-    @staticmethod
-    def get_hex_points(radius: float) -> Generator:
-        """
-        Creates generator of vertex coordinates in pixels relative
-        to center of hexagon inscribed in a circle of given radius
-        :param radius: circumscribed circle radius
-        :return: Generator
-        """
-        width = radius * 2
-        height = math.sqrt(3) * radius
-        return (
-            (
-                width / 2 + radius * math.cos(math.radians(60 * i)),
-                height / 2 + radius * math.sin(math.radians(60 * i)),
-            )
-            for i in range(6)
-        )
+        super().__init__()
+        self.radius = radius
+        self.setOffset(-ui.HEX_BORDER_WEIGHT, -ui.HEX_BORDER_WEIGHT)
+        self.set_fill(text, color)
 
-    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+    def set_fill(self, text: str, color: tuple[int, int, int]) -> None:
         """
-        Paint event handler
-        :param event: system generated event
+        Changes tile to the one with given text and fill color
+        :param text: text to display
+        :param color: fill color
         :return: None
         """
-        painter = QtGui.QPainter(self)
-        painter.setPen(self.pen)
-        painter.setBrush(self.brush)
-        painter.drawPolygon(self.polygon)
-        painter.drawText(12, 12, f"{self.text}")
-        painter.end()
+        self.setPixmap(get_tile(self.radius, color, text))
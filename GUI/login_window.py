@@ -2,16 +2,50 @@
 This module contains LoginWindow that
 is called on the starting of the app
 """
-import random
-from copy import deepcopy
 from typing import Optional
 
-from PySide6 import QtWidgets
+from PySide6 import QtCore, QtWidgets
 
-from logic.game import Game
+from logic.generator import generate_map
+from logic.parallel import create_search
+from logic.tournament import run_tournament
 from GUI.main_window import Window
 from config.config import DEFAULT_LOGIN
 
+TOURNAMENT_SEATING = ["default"] * 3
+TOURNAMENT_MAP_SIZE = 11
+
+
+class TournamentThread(QtCore.QThread):
+    """
+    Runs tournament of simulated games in process pool,
+    so login window is not blocked
+    """
+
+    report = QtCore.Signal(str)
+
+    def __init__(self, games: int, num_turns: int, seed: int = 0):
+        super().__init__(None)
+        self.games = games
+        self.num_turns = num_turns
+        self.seed = seed
+
+    def run(self) -> None:
+        """
+        inherited from QTread method, plays games on generated map
+        and emits report
+        :return: None
+        """
+        map_data = generate_map(TOURNAMENT_MAP_SIZE, seed=self.seed)
+        result = run_tournament(
+            map_data,
+            TOURNAMENT_SEATING,
+            self.games,
+            seed=self.seed,
+            num_turns=self.num_turns,
+        )
+        self.report.emit(str(result))
+
 
 class LoginWindow(QtWidgets.QWidget):
     """
@@ -24,7 +58,7 @@ class LoginWindow(QtWidgets.QWidget):
         super().__init__(parent)
         self.default_login = DEFAULT_LOGIN
         self.login_data: Optional[dict] = None
-        self.threads: list[Game] = []
+        self.tournament: Optional[TournamentThread] = None
 
         self.init_UI()
         self.init_signals()
@@ -58,8 +92,13 @@ class LoginWindow(QtWidgets.QWidget):
         is_full_label = QtWidgets.QLabel("Full game?")
         self.is_full_input = QtWidgets.QCheckBox()
 
-        is_test_label = QtWidgets.QLabel("Run test multiplayer?")
-        self.is_test_input = QtWidgets.QCheckBox()
+        tournament_games_label = QtWidgets.QLabel("Tournament games:")
+        self.tournament_games_input = QtWidgets.QSpinBox()
+        self.tournament_games_input.setRange(1, 100000)
+        self.tournament_games_input.setValue(100)
+
+        is_search_label = QtWidgets.QLabel("Use lookahead search?")
+        self.is_search_input = QtWidgets.QCheckBox()
 
         grid_layout.addWidget(name_label, 1, 1)
         grid_layout.addWidget(self.name_input, 1, 2)
@@ -73,13 +112,17 @@ class LoginWindow(QtWidgets.QWidget):
         grid_layout.addWidget(self.num_players_input, 5, 2)
         grid_layout.addWidget(is_full_label, 6, 1)
         grid_layout.addWidget(self.is_full_input, 6, 2)
-        grid_layout.addWidget(is_test_label, 7, 1)
-        grid_layout.addWidget(self.is_test_input, 7, 2)
+        grid_layout.addWidget(tournament_games_label, 7, 1)
+        grid_layout.addWidget(self.tournament_games_input, 7, 2)
+        grid_layout.addWidget(is_search_label, 8, 1)
+        grid_layout.addWidget(self.is_search_input, 8, 2)
 
         self.start_button = QtWidgets.QPushButton("Start game!")
+        self.tournament_button = QtWidgets.QPushButton("Run tournament")
 
         main_layout.addLayout(grid_layout)
         main_layout.addWidget(self.start_button)
+        main_layout.addWidget(self.tournament_button)
 
         self.setLayout(main_layout)
 
@@ -89,24 +132,7 @@ class LoginWindow(QtWidgets.QWidget):
         :return: None
         """
         self.start_button.clicked.connect(self.start_game)
-        self.is_test_input.stateChanged.connect(self.block_input)
-
-    def block_input(self) -> None:
-        """
-        Signal connected to CheckBox that asks about multiplayer
-        test mode, if mode selected - data in blocked fields will be
-        generated automatically in init_test_login method
-        :return:
-        """
-        if self.is_test_input.isChecked():
-            self.num_players_input.setValue(3)
-            self.num_players_input.setEnabled(False)
-            self.name_input.setEnabled(False)
-            self.game_input.setEnabled(False)
-        else:
-            self.num_players_input.setEnabled(True)
-            self.name_input.setEnabled(True)
-            self.game_input.setEnabled(True)
+        self.tournament_button.clicked.connect(self.start_tournament)
 
     def init_login_data(self) -> None:
         """
@@ -126,45 +152,45 @@ class LoginWindow(QtWidgets.QWidget):
     def start_game(self) -> None:
         """
         Takes user data using init_login_data, instantiates
-        main window with given login_data, if multiplayer test
-        mod selected - calls init_test_login to create additional bots
+        main window with given login_data.
+        If lookahead search selected - our bot uses BeamSearch engine,
+        its rollouts are played in config.SEARCH_WORKERS processes
         :return: None
         """
         self.init_login_data()
-
-        if self.is_test_input.isChecked():
-            self.init_test_login()
-
-        self.main_window = Window(self.login_data, parent=None)
+        engine = create_search() if self.is_search_input.isChecked() else None
+        self.main_window = Window(self.login_data, parent=None, engine=engine)
         self.main_window.closed.connect(self.on_close_main_widget)
         self.main_window.show()
         self.start_button.setEnabled(False)
 
-    def init_test_login(self) -> None:
+    def start_tournament(self) -> None:
+        """
+        Plays number of games set in login form between bots of default
+        strategy in simulator on all CPU cores, report is shown when
+        all games are played
+        :return: None
+        """
+        self.tournament_button.setEnabled(False)
+        self.tournament = TournamentThread(
+            self.tournament_games_input.value(), self.num_turns_input.value()
+        )
+        self.tournament.report.connect(self.show_tournament_report)
+        self.tournament.start()
+
+    def show_tournament_report(self, report: str) -> None:
         """
-        Generates random login data if multiplayer test
-        mod selected, runs additional bots in threads
+        Slot connected to signal emitted by tournament thread
+        :param report: text of TournamentReport
         :return: None
         """
-        self.login_data["name"] = f"{random.random()}"
-        self.login_data["game"] = f"{random.random()}"
-        login_data2 = deepcopy(self.login_data)
-        login_data3 = deepcopy(self.login_data)
-        login_data2["name"] += "1"
-        login_data3["name"] += "2"
-        self.threads.append(Game(login_data2))
-        self.threads.append(Game(login_data3))
-        for thread in self.threads:
-            thread.start()
+        QtWidgets.QMessageBox.information(self, "Tournament", report)
+        self.tournament_button.setEnabled(True)
 
     def on_close_main_widget(self) -> None:
         """
         Slot connected to signal emitted by main_window
-        when it is closed, it stops all bot_threads if
-        they exist, and sets start_button enabled
+        when it is closed, sets start_button enabled
         :return: None
         """
-        for thread in self.threads:
-            thread.exit()
-        self.threads = []
         self.start_button.setEnabled(True)
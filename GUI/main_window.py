@@ -3,14 +3,17 @@ This module contains implementation of main window, using PySide6
 
 """
 import math
+from typing import Optional
 
 from PySide6 import QtWidgets, QtGui, QtCore
 
 from logic.cell import Cell
 from logic.game import Game
-from logic.model import GameMap, GameState
+from logic.model import GameMap
+from logic.search import BeamSearch
+from logic.snapshot import StateDiff, ViewModel
 from GUI import ui
-from GUI.hex_widget import Hex
+from GUI.hex_widget import HexItem
 
 
 class Window(QtWidgets.QMainWindow):
@@ -20,9 +23,15 @@ class Window(QtWidgets.QMainWindow):
 
     closed = QtCore.Signal()
 
-    def __init__(self, login_data: dict, parent=None):
+    def __init__(
+        self,
+        login_data: dict,
+        parent=None,
+        engine: Optional[BeamSearch] = None,
+        max_fps: int = ui.MAX_FPS,
+    ):
         super().__init__(parent)
-        self.presenter_thread = Game(login_data)
+        self.presenter_thread = Game(login_data, engine)
         self.presenter_thread.start()
         self.screen = QtWidgets.QApplication.screenAt(self.pos())
         self.setGeometry(
@@ -33,9 +42,22 @@ class Window(QtWidgets.QMainWindow):
         )
         self.setFixedSize(self.size())
         self.hex_outer_radius = None
+        self.map_name: Optional[str] = None
+        self.hex_items: dict[Cell, HexItem] = {}
+        self.hex_positions: dict[Cell, tuple[int, int]] = {}
+        self.content_fill: dict[Cell, tuple[str, tuple[int, int, int]]] = {}
+        self.cell_fill: dict[Cell, tuple[str, tuple[int, int, int]]] = {}
+        self.view_model = ViewModel()
+        self.scene = QtWidgets.QGraphicsScene(self)
+        self.view = QtWidgets.QGraphicsView(self.scene, self)
+        self.init_view()
         self.statistics_label = QtWidgets.QLabel(self)
         self.init_statistics()
+        self.profile_label = QtWidgets.QLabel(self)
+        self.init_profile()
+        self.frame_timer = QtCore.QTimer(self)
         self.init_signals()
+        self.frame_timer.start(1000 // max_fps)
 
     def get_mid_map(self) -> tuple[int, int]:
         """
@@ -51,9 +73,23 @@ class Window(QtWidgets.QMainWindow):
         Initiates signals from thread
         :return: None
         """
-        self.presenter_thread.game_state_updated.connect(self.refresh_map)
+        self.frame_timer.timeout.connect(self.poll_state)
         self.presenter_thread.game_ended.connect(self.show_message)
         self.presenter_thread.update.connect(self.update_statistics)
+        self.presenter_thread.profile.connect(self.update_profile)
+
+    def init_view(self) -> None:
+        """
+        Initiates graphics view that covers whole window,
+        scene coordinates are equal to window pixels
+        :return: None
+        """
+        self.view.setGeometry(0, 0, self.width(), self.height())
+        self.view.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.view.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.view.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.view.setRenderHint(QtGui.QPainter.Antialiasing)
+        self.scene.setSceneRect(0, 0, self.width(), self.height())
 
     def init_statistics(self) -> None:
         """
@@ -62,11 +98,27 @@ class Window(QtWidgets.QMainWindow):
         """
         self.statistics_label.setText("Statistics:")
         self.statistics_label.move(*ui.STATISTICS_LABEL_OFFSET)
-        self.statistics_label.setFixedWidth(self.width())
+        self.statistics_label.setFixedWidth(self.width() // 2)
+
+    def init_profile(self) -> None:
+        """
+        Initiates live panel of turn profile next to statistic label
+        :return: None
+        """
+        self.profile_label.setFont(
+            QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont)
+        )
+        self.profile_label.setAlignment(QtCore.Qt.AlignTop | QtCore.Qt.AlignRight)
+        self.profile_label.setGeometry(
+            self.width() // 2,
+            ui.STATISTICS_LABEL_OFFSET[1],
+            self.width() // 2 - ui.STATISTICS_LABEL_OFFSET[0],
+            self.height() // 3,
+        )
 
     def set_hex_radius(self, map_size: int) -> None:
         """
-        Set radius of Hex Widgets dependent on window size and map size
+        Set radius of Hex items dependent on window size and map size
         :param map_size: game map size (max coordinate value)
         :return: None
         """
@@ -76,8 +128,8 @@ class Window(QtWidgets.QMainWindow):
 
     def hex_to_pixel(self, cell: Cell) -> tuple[int, int]:
         """
-        Calculates axis shift in pixels of each Hex Widget dependent on
-        coordinates relative to central Hex Widget
+        Calculates axis shift in pixels of each Hex item dependent on
+        coordinates relative to central Hex item
         :param cell: Cell obj
         :return: pixels shift (x, y)
         """
@@ -87,38 +139,78 @@ class Window(QtWidgets.QMainWindow):
         )
         return int(round(shift_x)), int(round(shift_y))
 
-    def refresh_map(self, map_: GameMap, state: GameState) -> None:
+    def get_hex_positions(self, map_: GameMap) -> dict[Cell, tuple[int, int]]:
+        """
+        Creates lookup table of pixel position of each map cell,
+        calculated once per map
+        :param map_: GameMap obj
+        :return: dict (Cell: pixels x, y)
+        """
+        mid_x, mid_y = self.get_mid_map()
+        positions = {}
+        for cell in map_.cells:
+            shift_x, shift_y = self.hex_to_pixel(cell)
+            positions[cell] = mid_x + shift_x, mid_y + shift_y
+        return positions
+
+    def init_scene(self, map_: GameMap) -> None:
         """
-        Slot connected to presenter signal game_state_updated.
-        Updates widgets in main window dependent on current game content.
-        Create child Hex Widgets of proper type, move Widgets to correct pixel.
-        Every turn sets parent as None for widgets created on previous turn,
-        that decrease reference count of each widget to 0
+        Creates Hex items of all map cells, called once per map.
+        Content cells are filled by their content, other by default fill
         :param map_: GameMap obj
-        :param state: GameState obj
         :return: None
         """
-        if self.hex_outer_radius is None:
-            self.set_hex_radius(map_.size)
+        self.scene.clear()
+        self.hex_items = {}
+        self.content_fill = {}
+        self.view_model = ViewModel()
+        self.map_name = map_.name
+        self.set_hex_radius(map_.size)
+        self.hex_positions = self.get_hex_positions(map_)
+        content_cells = map_.get_content_cells()
 
         for cell in map_.cells:
-            existing_cell = self.findChild(Hex, f"{cell}")
-            if existing_cell:
-                existing_cell.setParent(None)
-
-            text = ""
-            color = ui.HEX_DEFAULT_FILL
-            if cell in state.tank_cells:
-                text, color = self.get_vehicle_fill(cell, state)
-            elif cell in map_.get_content_cells():
-                text, color = self.get_content_fill(cell, map_)
-
-            hex_ = Hex(self.hex_outer_radius, color, text)
-            hex_.setParent(self)
-            hex_.setObjectName(f"{cell}")
-            shift_x, shift_y = self.hex_to_pixel(cell)
-            hex_.move(self.get_mid_map()[0] + shift_x, self.get_mid_map()[1] + shift_y)
-            hex_.show()
+            fill = ("", ui.HEX_DEFAULT_FILL)
+            if cell in content_cells:
+                fill = self.get_content_fill(cell, map_)
+            item = HexItem(self.hex_outer_radius, fill[1], fill[0])
+            item.setPos(*self.hex_positions[cell])
+            self.scene.addItem(item)
+            self.hex_items[cell] = item
+            self.content_fill[cell] = fill
+        self.cell_fill = dict(self.content_fill)
+
+    def poll_state(self) -> None:
+        """
+        Slot connected to frame timer, takes game state diff from presenter
+        states channel, diffs received between frames are already merged
+        :return: None
+        """
+        item = self.presenter_thread.states.take()
+        if item is not None:
+            self.refresh_map(*item)
+
+    def refresh_map(self, map_: GameMap, diff: StateDiff) -> None:
+        """
+        Called by poll_state at most once per frame.
+        Creates Hex items when new map is received, applies diff to view
+        model and updates only dirty cells, item is repainted if its text
+        or color is changed
+        :param map_: GameMap obj
+        :param diff: StateDiff obj
+        :return: None
+        """
+        if map_.name != self.map_name:
+            self.init_scene(map_)
+
+        for cell in self.view_model.apply(diff):
+            if cell in self.view_model.vehicle_cells:
+                fill = self.get_vehicle_fill(cell, self.view_model)
+            else:
+                fill = self.content_fill[cell]
+            if self.cell_fill[cell] != fill:
+                self.cell_fill[cell] = fill
+                self.hex_items[cell].set_fill(*fill)
 
     @staticmethod
     def get_content_fill(cell: Cell, map_: GameMap) -> tuple[str, tuple[int, int, int]]:
@@ -144,18 +236,18 @@ class Window(QtWidgets.QMainWindow):
 
     @staticmethod
     def get_vehicle_fill(
-        cell: Cell, state: GameState
+        cell: Cell, state: ViewModel
     ) -> tuple[str, tuple[int, int, int]]:
         """
         Return text and color for drawing tank cells, depends on tank owner
         :param cell: Cell obj
-        :param state: GameState obj
+        :param state: ViewModel obj
         :return: tuple(text, color)
         """
-        if cell in state.get_our_tanks_cells():
-            tank_id = state.get_our_tank_id(cell)
-            return str(state.our_tanks[tank_id].health), ui.OUR_TANKS_COLOR
-        return str(state.enemy_tanks[cell].health), ui.ENEMY_COLOR
+        vehicle = state.vehicle_cells[cell]
+        if vehicle.player_id == state.idx:
+            return str(vehicle.health), ui.OUR_TANKS_COLOR
+        return str(vehicle.health), ui.ENEMY_COLOR
 
     def update_statistics(self, stats: str) -> None:
         """
@@ -165,6 +257,14 @@ class Window(QtWidgets.QMainWindow):
         """
         self.statistics_label.setText(f"Statistics: {stats}")
 
+    def update_profile(self, summary: str) -> None:
+        """
+        Slot that updates turn profile panel in main window
+        :param summary: table of turn phases received from game thread
+        :return: None
+        """
+        self.profile_label.setText(summary)
+
     def show_message(self, text: str) -> None:
         """
         Create pop-up message window
@@ -18,3 +18,4 @@ CONTENT_FILL = {
     "spawn": ("", (160, 160, 160)),
 }
 STATISTICS_LABEL_OFFSET = (10, 0)
+MAX_FPS = 30  # maximum number of map repaints per second
@@ -0,0 +1,45 @@
+from collections import deque
+
+import pytest
+
+from logic.cell import Cell
+from logic.model import GameMap
+
+pytest.importorskip("pytest_benchmark")
+
+CENTER = Cell(0, 0, 0)
+OTHER = Cell(3, -7, 4)
+
+
+def test_cube_distance(benchmark):
+    benchmark(CENTER.cube_distance, OTHER)
+
+
+def test_neighbours(benchmark):
+    benchmark(OTHER.neighbours)
+
+
+def test_in_radius(benchmark, size):
+    benchmark(CENTER.in_radius, size - 1)
+
+
+def test_in_radius_excl(benchmark):
+    benchmark(OTHER.in_radius_excl, 1, 3)
+
+
+def test_normal_directions(benchmark):
+    benchmark(OTHER.normal_directions, 4)
+
+
+def test_a_star(benchmark, game_map: GameMap):
+    available = game_map.get_available_cells()
+    # path to map center from the last cell found by breadth-first search
+    queue = deque([CENTER])
+    explored = {CENTER}
+    while queue:
+        start = queue.popleft()
+        for cell in sorted(start.neighbours() & available - explored, key=tuple):
+            explored.add(cell)
+            queue.append(cell)
+    path = benchmark(start.a_star, available, CENTER)
+    assert path[-1] == CENTER
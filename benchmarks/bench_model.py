@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from config.config import Actions
+from logic.model import GameMap, GameState
+
+pytest.importorskip("pytest_benchmark")
+
+# views of GameState used by vehicles in every turn
+VIEWS = ("our_tanks", "enemy_tanks", "tank_cells", "aggressive_tanks", "vehicles")
+
+
+def test_game_map(benchmark, map_data):
+    data = json.loads(map_data)
+    benchmark(GameMap, data)
+
+
+def test_game_state(benchmark, state_data):
+    # GameState changes its data, so each round gets a fresh copy
+    benchmark.pedantic(
+        GameState,
+        setup=lambda: ((json.loads(state_data), 1), {}),
+        rounds=50,
+    )
+
+
+def create_state(data: dict) -> GameState:
+    """
+    Creates GameState and its views of vehicles, views are cached
+    properties created on first access
+    :param data: dict in format of GAME_STATE response
+    :return: GameState obj
+    """
+    state = GameState(data, 1)
+    for name in VIEWS:
+        getattr(state, name)
+    return state
+
+
+def test_game_state_views(benchmark, state_data):
+    # parsing is measured together with the first use of views
+    benchmark.pedantic(
+        create_state,
+        setup=lambda: ((json.loads(state_data),), {}),
+        rounds=50,
+    )
+
+
+def test_update_data(benchmark, game_map, state_data):
+    state = GameState(json.loads(state_data), 1)
+    t_id, tank = next(
+        (t_id, tank)
+        for t_id, tank in state.get_ordered_tanks()
+        if tank.vehicle_type != "at_spg"
+    )
+    target = min(
+        tank.coordinates.neighbours()
+        & game_map.get_available_cells() - state.tank_cells,
+        key=tuple,
+    )
+    action = Actions.MOVE, {
+        "vehicle_id": t_id,
+        "target": {"x": target.x, "y": target.y, "z": target.z},
+    }
+    benchmark.pedantic(
+        lambda state: state.update_data(action),
+        setup=lambda: ((create_state(json.loads(state_data)),), {}),
+        rounds=200,
+    )
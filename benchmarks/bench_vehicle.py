@@ -0,0 +1,40 @@
+import json
+import random
+
+import pytest
+
+from logic.model import GameState
+from benchmarks.support import create_game
+
+pytest.importorskip("pytest_benchmark")
+
+
+def test_get_hot_spots(benchmark, game_map, game_state):
+    benchmark(game_map.attack_index.get_hot_spots, game_state.enemy_tanks)
+
+
+def test_get_directions(benchmark, game_map, game_state):
+    tank = next(
+        tank
+        for tank in game_state.enemy_tanks.values()
+        if tank.vehicle_type == "at_spg"
+    )
+    attack_index = game_map.attack_index
+    args = (tank.vehicle_type, tank.shoot_range_bonus, tank.coordinates)
+
+    # directions are built on the first query and reused for the whole game
+    def setup():
+        attack_index.directions.clear()
+        return args, {}
+
+    benchmark.pedantic(attack_index.get_directions, setup=setup, rounds=100)
+
+
+def test_make_turn(benchmark, game_map, state_data):
+    # vehicles keep priorities between turns, so each round gets a new game
+    def setup():
+        random.seed(0)
+        game = create_game(game_map, GameState(json.loads(state_data), 1))
+        return (game,), {}
+
+    benchmark.pedantic(lambda game: game.make_turn(), setup=setup, rounds=20)
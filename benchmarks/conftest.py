@@ -0,0 +1,67 @@
+"""
+Fixtures of benchmark suite: generated maps and game states
+parametrised by map size and number of tanks
+"""
+import json
+from functools import lru_cache
+
+import pytest
+
+from config import game_balance as gb_cf
+from logic.generator import generate_map, generate_state
+from logic.model import GameMap, GameState
+
+SIZES = (11, 30, 60)
+TANKS = (1, 3)  # vehicles of each type per player
+
+
+@lru_cache(maxsize=None)
+def get_map_data(size: int, tanks: int) -> str:
+    """
+    :param size: map size
+    :param tanks: vehicles of each type per player
+    :return: GAME_MAP response in json
+    """
+    vehicles = {vehicle_type: tanks for vehicle_type in gb_cf.TURN_ORDER}
+    return json.dumps(generate_map(size, 0.1, 3, vehicles, seed=size))
+
+
+@lru_cache(maxsize=None)
+def get_state_data(size: int, tanks: int) -> str:
+    """
+    :param size: map size
+    :param tanks: vehicles of each type per player
+    :return: GAME_STATE response in json, vehicles are scattered
+    """
+    map_data = json.loads(get_map_data(size, tanks))
+    return json.dumps(generate_state(map_data, scatter=True, seed=size))
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"size{size}")
+def size(request) -> int:
+    return request.param
+
+
+@pytest.fixture(params=TANKS, ids=lambda tanks: f"tanks{tanks}")
+def tanks(request) -> int:
+    return request.param
+
+
+@pytest.fixture
+def map_data(size, tanks) -> str:
+    return get_map_data(size, tanks)
+
+
+@pytest.fixture
+def game_map(map_data) -> GameMap:
+    return GameMap(json.loads(map_data))
+
+
+@pytest.fixture
+def state_data(size, tanks) -> str:
+    return get_state_data(size, tanks)
+
+
+@pytest.fixture
+def game_state(state_data) -> GameState:
+    return GameState(json.loads(state_data), 1)
@@ -0,0 +1,183 @@
+"""
+Replay-driven benchmark of vehicle decisions. Game states are taken
+from game records created by recorder.WireRecorder, or from games played
+in simulator on given or generated maps. For each turn of our player GameState is
+rebuilt and Game.make_turn is timed, together with set_priority,
+move_to_priority and targets_in_range of each Vehicle subclass.
+Report contains p50/p95/p99 latency per map size and stage.
+
+Usage: python -m benchmarks.decision_replay --record game.wgr --size 11 50 100
+"""
+import argparse
+import random
+import time
+from collections import defaultdict
+from typing import Optional
+
+from config.config import Actions
+from logic.game import Game
+from logic.generator import generate_map
+from logic.model import GameMap, GameState
+from logic.simulator import Simulator
+from logic.tournament import percentile
+from logic.vehicle import Vehicle
+from recorder import ReplayReader
+from benchmarks.support import create_game, load_map_data
+
+STAGES = ("set_priority", "move_to_priority", "targets_in_range")
+
+
+class DecisionBenchmark:
+    """
+    Collects latencies of decision stages by (map size, stage name)
+    """
+
+    def __init__(self):
+        self.timings: defaultdict[tuple[int, str], list[float]] = defaultdict(list)
+
+    def create_game(self, idx: int, map_: GameMap, state: GameState) -> Game:
+        """
+        Creates Game with vehicles of player, decisions are not cached,
+        vehicle stages are timed
+        :param idx: player id
+        :param map_: GameMap obj
+        :param state: GameState obj
+        :return: Game obj
+        """
+        game = create_game(map_, state, idx)
+        for vehicle in game.vehicles_list:
+            self.instrument(vehicle, map_.size)
+        return game
+
+    def instrument(self, vehicle: Vehicle, size: int) -> None:
+        """
+        Replaces vehicle stage methods by timed wrappers
+        :param vehicle: Vehicle obj
+        :param size: map size
+        :return: None
+        """
+        for name in STAGES:
+            method = getattr(vehicle, name)
+            timings = self.timings[(size, f"{type(vehicle).__name__}.{name}")]
+
+            def timed(*args, method=method, timings=timings):
+                start = time.perf_counter()
+                result = method(*args)
+                timings.append(time.perf_counter() - start)
+                return result
+
+            setattr(vehicle, name, timed)
+
+    def make_turn(
+        self, game: Optional[Game], data: dict, idx: int, map_: GameMap
+    ) -> tuple[Game, list[tuple[Actions, dict]]]:
+        """
+        Rebuilds GameState and makes turn of player
+        :param game: Game obj of player, created if None
+        :param data: dict in format of GAME_STATE response
+        :param idx: player id
+        :param map_: GameMap obj
+        :return: Game obj and actions of turn
+        """
+        start = time.perf_counter()
+        state = GameState(data, idx)
+        self.timings[(map_.size, "GameState")].append(time.perf_counter() - start)
+        if game is None:
+            game = self.create_game(idx, map_, state)
+        game.game_state = state
+        game.connection.actions = []
+        start = time.perf_counter()
+        game.make_turn()
+        self.timings[(map_.size, "Game.make_turn")].append(
+            time.perf_counter() - start
+        )
+        return game, game.connection.actions
+
+    def run_record(self, path: str) -> None:
+        """
+        Replays our turns of game record
+        :param path: path to record file
+        :return: None
+        """
+        with ReplayReader(path) as reader:
+            games: dict[int, Game] = {}
+            for game_round, turn in reader.get_turns():
+                idx = reader.get_idx(game_round)
+                record = reader.get_record(reader.turns[(game_round, turn)])
+                data = record.get_response()
+                if data["finished"] or data["current_player_idx"] != idx:
+                    continue
+                games[game_round], _ = self.make_turn(
+                    games.get(game_round), data, idx, reader.get_map(game_round)
+                )
+
+    def run_simulated(self, map_data: dict, games: int, seed: int) -> None:
+        """
+        Plays games in simulator, all players are timed
+        :param map_data: dict in format of GAME_MAP response
+        :param games: number of games
+        :param seed: random seed
+        :return: None
+        """
+        random.seed(seed)
+        for _ in range(games):
+            sim = Simulator.from_map_data(map_data)
+            players: dict[int, Game] = {}
+            while not sim.is_finished:
+                idx = sim.current_player
+                players[idx], actions = self.make_turn(
+                    players.get(idx), sim.state_data(), idx, sim.map
+                )
+                sim.step(actions)
+
+    def __str__(self) -> str:
+        lines = [
+            f"{'size':>6}  {'stage':<36}{'calls':>8}"
+            f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        ]
+        for (size, stage), timings in sorted(self.timings.items()):
+            timings = sorted(timings)
+            lines.append(
+                f"{size:>6}  {stage:<36}{len(timings):>8}"
+                f"{percentile(timings, 50) * 1000:>9.3f}"
+                f"{percentile(timings, 95) * 1000:>9.3f}"
+                f"{percentile(timings, 99) * 1000:>9.3f}"
+            )
+        return "\n".join(lines)
+
+
+def main() -> None:
+    """
+    Command line entry point
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--record", nargs="*", default=[], help="game record files")
+    parser.add_argument(
+        "--map", nargs="*", default=[], help="json files with GAME_MAP response"
+    )
+    parser.add_argument(
+        "--size", type=int, nargs="*", default=[], help="sizes of generated maps"
+    )
+    parser.add_argument("--obstacles", type=float, default=0.05)
+    parser.add_argument("--games", type=int, default=3, help="games per map")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    benchmark = DecisionBenchmark()
+    for path in args.record:
+        benchmark.run_record(path)
+    maps = []
+    for path in args.map:
+        maps.append(load_map_data(path))
+    for size in args.size:
+        maps.append(generate_map(size, args.obstacles, seed=args.seed))
+    if not maps and not args.record:
+        maps.append(load_map_data())
+    for map_data in maps:
+        benchmark.run_simulated(map_data, args.games, args.seed)
+    print(benchmark)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark of ParallelEvaluator, scores the same set of random joint
+candidates in current process and in worker pools of growing size,
+prints speedup per number of processes.
+
+Usage: python -m benchmarks.parallel_speedup --candidates 512
+"""
+import argparse
+import os
+import random
+import time
+
+from logic.parallel import ParallelEvaluator
+from logic.search import BeamSearch
+from logic.simulator import Simulator, SimulatedPlayer
+from benchmarks.support import DEFAULT_MAP, load_map_data
+
+
+def random_candidates(
+    engine: BeamSearch, root: Simulator, vehicles: list[int], count: int
+) -> list[list]:
+    """
+    Creates random valid joint actions of our vehicles
+    :param engine: BeamSearch obj used to generate vehicle candidates
+    :param root: Simulator obj in current state
+    :param vehicles: our vehicle numbers in order of turn
+    :param count: number of joint actions
+    :return: list of joint actions
+    """
+    distances = engine.base_distance[root.map.name]
+    result = []
+    for _ in range(count):
+        sim = root.fork()
+        actions = []
+        for vehicle in vehicles:
+            command, target = random.choice(engine.candidates(sim, vehicle, distances))
+            if command is not None and sim.act(command, vehicle, target):
+                actions.append((command, vehicle, target))
+        result.append(actions)
+    return result
+
+
+def main() -> None:
+    """
+    Command line entry point
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--map", default=DEFAULT_MAP, help="json file with GAME_MAP response"
+    )
+    parser.add_argument("--candidates", type=int, default=512)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    map_data = load_map_data(args.map)
+
+    random.seed(args.seed)
+    sim = Simulator.from_map_data(map_data)
+    state = sim.get_state(1)
+    player = SimulatedPlayer(1)
+    player.init_vehicles(state)
+    engine = BeamSearch(depth=args.depth)
+    root = Simulator.from_game_state(sim.map, state, engine.get_tables(sim.map))
+    vehicles = [root.id_index[vehicle.t_id] for vehicle in player.vehicles_list]
+    candidates = random_candidates(engine, root, vehicles, args.candidates)
+    distances = engine.base_distance[sim.map.name]
+
+    start = time.perf_counter()
+    for candidate in candidates:
+        rollout = root.fork()
+        for action in candidate:
+            rollout.act(*action)
+        engine.look_ahead(rollout, 1, distances)
+    serial = time.perf_counter() - start
+    print(f"{'processes':>10}{'seconds':>10}{'speedup':>10}{'efficiency':>12}")
+    print(f"{'serial':>10}{serial:>10.3f}{1:>10.2f}{1:>12.2f}")
+
+    processes = 1
+    while processes <= os.cpu_count():
+        with ParallelEvaluator(processes, args.depth) as evaluator:
+            evaluator.score(root, candidates[:processes], 1)  # warm up workers
+            start = time.perf_counter()
+            evaluator.score(root, candidates, 1)
+            elapsed = time.perf_counter() - start
+        speedup = serial / elapsed
+        print(
+            f"{processes:>10}{elapsed:>10.3f}{speedup:>10.2f}"
+            f"{speedup / processes:>12.2f}"
+        )
+        processes *= 2
+
+
+if __name__ == "__main__":
+    main()
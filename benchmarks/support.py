@@ -0,0 +1,73 @@
+"""
+Helpers shared by benchmark scripts and pytest-benchmark suite
+"""
+import json
+import os
+from typing import Optional
+
+from config.config import Actions
+from logic.game import Game
+from logic.model import GameMap, GameState
+
+# 11-size map of three players with every kind of content
+DEFAULT_MAP = os.path.join(os.path.dirname(__file__), "default_map.json")
+
+
+def load_map_data(path: str = DEFAULT_MAP) -> dict:
+    """
+    :param path: json file with GAME_MAP response, default map by default
+    :return: dict in format of GAME_MAP response
+    """
+    with open(path) as file:
+        return json.load(file)
+
+
+class ActionSink:
+    """
+    Replaces connection of Game, collects actions sent by make_turn
+    """
+
+    def __init__(self):
+        self.actions: list[tuple[Actions, dict]] = []
+
+    def send(self, command: Actions, data: Optional[dict] = None) -> None:
+        """
+        :param command: action from enum type Actions
+        :param data: action data
+        :return: None
+        """
+        self.actions.append((command, data))
+
+
+class OfflineGame(Game):
+    """
+    Game that is played without server, its frames are not recorded
+    even if RECORDS_DIR is set
+    """
+
+    def create_recorder(self) -> None:
+        """
+        :return: None, recording is disabled
+        """
+        return None
+
+
+def create_game(map_: GameMap, state: GameState, idx: int = 1) -> Game:
+    """
+    Creates OfflineGame with vehicles of player that sends actions
+    to ActionSink, decisions are not cached
+    :param map_: GameMap obj
+    :param state: GameState obj
+    :param idx: player id
+    :return: Game obj
+    """
+    game = OfflineGame({})
+    game.connection.close_connection()
+    game.connection = ActionSink()
+    game.idx = idx
+    game.map = map_
+    game.game_state = state
+    game.init_vehicles()
+    for vehicle in game.vehicles_list:
+        vehicle.decisions = None
+    return game
@@ -1,6 +1,7 @@
 """
 This module contains constants used in app
 """
+import os
 from enum import IntEnum
 
 
@@ -11,6 +12,22 @@ RESPONSE_HEADER_SIZE = 8
 RESULT_CODE_SIZE = 4
 ACTION_ENCODE_SIZE = 4
 LENGTH_ENCODE_SIZE = 4
+TRANSPOSITION_TABLE_SIZE = 4096
+SEARCH_TIME_BUDGET = 0.5  # seconds for lookahead search in one turn
+SEARCH_BEAM_WIDTH = 6
+SEARCH_MOVE_CANDIDATES = 4
+SEARCH_DEPTH = 2  # number of opponent turns to look ahead
+SEARCH_WORKERS = 0  # processes for lookahead rollouts, 0 plays them in game thread
+RECORDS_DIR = None  # directory for binary records of games, None disables recording
+RECORDER_FLUSH_INTERVAL = 1.0  # seconds
+MAP_CACHE_DIR = os.path.join(  # directory for cached map tables, None disables cache
+    os.path.expanduser("~"), ".cache", "software-sorcerers", "maps"
+)
+SHARE_MAP_TABLES = True  # bots of one host publish map tables in shared memory once
+PROFILE_DIR = None  # directory for turn profiles dumped at game end, None disables dump
+PROFILE_REPORT_INTERVAL = 2.0  # seconds between profile summaries sent to main window
+CLUSTER_MAP_SIZE = 40  # hierarchical pathfinding is used on maps of this size and above
+CLUSTER_SIZE = 8  # number of cells on side of cluster of hierarchical pathfinding
 
 
 class StatusCode(IntEnum):
@@ -27,3 +27,8 @@ TURN_ORDER = {         # If at_spg turn order will be changed
 }
 MAX_CATAPULT_USAGE = 3
 MAX_CAPTURE_POINTS = 6
+CATAPULT_RANGE_BONUS = 1
+MAX_PLAYERS_ON_BASE = 2
+
+LIGHT_REPAIR_TYPES = {"medium_tank"}
+HARD_REPAIR_TYPES = {"medium_tank", "heavy_tank", "at_spg"}
@@ -3,20 +3,150 @@ This module contains class Connection for client-server interact
 """
 import socket
 import json
+import time
+from collections import Counter
 from typing import Optional
 
 from config import config as cf
+from logic.profiler import Histogram, TurnProfiler
+from recorder import WireRecorder
+
+
+class ConnectionStats:
+    """
+    Counters of client-server interact: number of requests and bytes
+    sent and received per action, histograms of round trip time in
+    microseconds and response size in bytes, count of each status code
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.requests: Counter[cf.Actions] = Counter()
+        self.bytes_sent: Counter[cf.Actions] = Counter()
+        self.bytes_received: Counter[cf.Actions] = Counter()
+        self.round_trip: dict[cf.Actions, Histogram] = {}
+        self.response_size = Histogram()
+        self.status_codes: Counter[int] = Counter()
+
+    def record(
+        self,
+        action: cf.Actions,
+        sent: int,
+        received: int,
+        status_code: int,
+        round_trip: float,
+    ) -> None:
+        """
+        :param action: action from enum type Actions
+        :param sent: number of bytes of request
+        :param received: number of bytes of response with header
+        :param status_code: status code of response
+        :param round_trip: round trip time in seconds
+        :return: None
+        """
+        self.requests[action] += 1
+        self.bytes_sent[action] += sent
+        self.bytes_received[action] += received
+        if action not in self.round_trip:
+            self.round_trip[action] = Histogram()
+        self.round_trip[action].record(int(round_trip * 1_000_000))
+        self.response_size.record(received)
+        self.status_codes[status_code] += 1
+
+    def get_round_trip(self) -> Histogram:
+        """
+        :return: histogram of round trip time of all actions
+        """
+        histogram = Histogram()
+        for action_histogram in self.round_trip.values():
+            histogram.merge(action_histogram)
+        return histogram
+
+    def to_dict(self) -> dict:
+        """
+        :return: dict with all counters, keys are names of actions and status codes
+        """
+        duration = time.time() - self.started
+        total = sum(self.requests.values())
+        return {
+            "duration": duration,
+            "requests": total,
+            "requests_per_second": total / duration if duration else 0,
+            "actions": {
+                action.name: {
+                    "requests": count,
+                    "bytes_sent": self.bytes_sent[action],
+                    "bytes_received": self.bytes_received[action],
+                    "round_trip": self.round_trip[action].to_dict(),
+                }
+                for action, count in self.requests.items()
+            },
+            "round_trip": self.get_round_trip().to_dict(),
+            "response_size": self.response_size.to_dict(),
+            "status_codes": {
+                self.get_status_name(code): count
+                for code, count in self.status_codes.items()
+            },
+        }
+
+    @staticmethod
+    def get_status_name(code: int) -> str:
+        """
+        :param code: status code of response
+        :return: name of StatusCode, or code itself if it is unknown
+        """
+        try:
+            return cf.StatusCode(code).name
+        except ValueError:
+            return str(code)
+
+    def summary(self) -> str:
+        """
+        :return: table of actions with requests, bytes and round trip in ms
+        """
+        lines = [
+            f"{'action':<14}{'requests':>9}{'sent B':>10}{'received B':>12}"
+            f"{'p50 ms':>9}{'p99 ms':>9}"
+        ]
+        for action, count in self.requests.items():
+            histogram = self.round_trip[action]
+            lines.append(
+                f"{action.name:<14}{count:>9}{self.bytes_sent[action]:>10}"
+                f"{self.bytes_received[action]:>12}"
+                f"{histogram.percentile(50) / 1000:>9.2f}"
+                f"{histogram.percentile(99) / 1000:>9.2f}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path: str) -> None:
+        """
+        Writes counters in json file
+        :param path: path to file
+        :return: None
+        """
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
 
 
 class Connection:
     """
     Creates socket, encode Python objects into byte strings,
     send it to server using socket, receive byte strings,
-    and decode them into Python objects
+    and decode them into Python objects. If recorder is given, every
+    request and response is appended to its binary log. If profiler is
+    given, network round trip and JSON decoding are timed. Requests,
+    bytes, round trip time and status codes are counted in stats
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        recorder: Optional[WireRecorder] = None,
+        profiler: Optional[TurnProfiler] = None,
+    ):
         self.sock = socket.socket()
+        self.recorder = recorder
+        self.profiler = profiler
+        self.stats = ConnectionStats()
 
     def init_connection(self):
         """
@@ -27,10 +157,12 @@ class Connection:
 
     def close_connection(self):
         """
-        Initiates disconnect from server
+        Initiates disconnect from server, closes recorder
         :return: None
         """
         self.sock.close()
+        if self.recorder is not None:
+            self.recorder.close()
 
     def send(self, command: cf.Actions, data: Optional[dict] = None) -> Optional[dict]:
         """
@@ -41,16 +173,35 @@ class Connection:
         :param data: dict | None
         :return: dict response
         """
-        self.sock.send(self.encode(command, data))
-        response = self.receive()
-        if response:
-            return json.loads(response.decode("UTF-8"))
-        return None
+        sent = time.time()
+        start = time.perf_counter()
+        request = self.encode(command, data)
+        self.sock.send(request)
+        status_code, response = self.receive()
+        round_trip = time.perf_counter() - start
+        self.stats.record(
+            command,
+            len(request),
+            cf.RESPONSE_HEADER_SIZE + len(response),
+            status_code,
+            round_trip,
+        )
+        if self.profiler is not None:
+            self.profiler.record("network", start)
+            start = time.perf_counter()
+        message = json.loads(response.decode("UTF-8")) if response else None
+        if self.profiler is not None:
+            self.profiler.record("json_decode", start)
+        if self.recorder is not None:
+            self.recorder.record(
+                command, data, status_code, response, sent, time.time(), message
+            )
+        return message
 
-    def receive(self) -> bytes:
+    def receive(self) -> tuple[int, bytes]:
         """
         Reads data from socket buffer
-        :return: byte string
+        :return: status code and byte string
         """
         chunks = []
         init_read = self.sock.recv(cf.RESPONSE_HEADER_SIZE)
@@ -68,7 +219,7 @@ class Connection:
             bytes_recd = bytes_recd + len(chunk)
         if status_code != cf.StatusCode.OKEY:
             print(f"{cf.StatusCode(status_code)}", b"".join(chunks))
-        return b"".join(chunks)
+        return status_code, b"".join(chunks)
 
     @staticmethod
     def encode(action: cf.Actions, data: Optional[dict] = None) -> bytes:
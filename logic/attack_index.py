@@ -0,0 +1,136 @@
+"""
+This module contains AttackIndex - index of cells that vehicles can
+shoot, built once per map. It answers "which cells can hit which"
+by lookup instead of expanding range of each vehicle on every query
+"""
+from config import game_balance as gb_cf
+from logic.cell import Cell
+
+MAX_SHOOT_RANGE = max(gb_cf.MAX_RANGE.values()) + gb_cf.CATAPULT_RANGE_BONUS
+
+
+class AttackIndex:
+    """
+    Index of shooting ranges of map cells. Range of vehicle depends on
+    its type, shoot range bonus and position, AT-SPG ranges are rays
+    interrupted by obstacles. Ranges are clipped by map border and
+    created on the first query, then reused for the whole game.
+    Shooting relation is symmetric: vehicle on cell A can shoot cell B
+    if and only if the same vehicle on B can shoot A, so cells that can
+    attack a cell are given by range of this cell
+    """
+
+    def __init__(self, cells: set[Cell], obstacles: set[Cell]):
+        self.cells = cells
+        self.obstacles = obstacles
+        self.ranges: dict[tuple[str, int, Cell], frozenset[Cell]] = {}
+        self.directions: dict[
+            tuple[str, int, Cell], tuple[frozenset[Cell], ...]
+        ] = {}
+
+    def get_directions(
+        self, vehicle_type: str, bonus: int, cell: Cell
+    ) -> tuple[frozenset[Cell], ...]:
+        """
+        Returns cells on each normal direction in shooting range,
+        direction is interrupted by obstacle or map border
+        :param vehicle_type: type of vehicle
+        :param bonus: shoot range bonus of vehicle
+        :param cell: position of vehicle
+        :return: tuple of directions in order of Cell.normal_directions
+        """
+        key = (vehicle_type, bonus, cell)
+        directions = self.directions.get(key)
+        if directions is None:
+            directions = []
+            radius = gb_cf.MAX_RANGE[vehicle_type] + bonus
+            for direction in cell.normal_directions(radius):
+                ray = []
+                for ray_cell in sorted(direction, key=cell.cube_distance):
+                    if ray_cell in self.obstacles or ray_cell not in self.cells:
+                        break
+                    ray.append(ray_cell)
+                directions.append(frozenset(ray))
+            directions = self.directions[key] = tuple(directions)
+        return directions
+
+    def get_range(
+        self, vehicle_type: str, bonus: int, cell: Cell
+    ) -> frozenset[Cell]:
+        """
+        Returns map cells that vehicle can shoot
+        :param vehicle_type: type of vehicle
+        :param bonus: shoot range bonus of vehicle
+        :param cell: position of vehicle
+        :return: frozenset of Cell
+        """
+        key = (vehicle_type, bonus, cell)
+        cells = self.ranges.get(key)
+        if cells is None:
+            if vehicle_type == "at_spg":
+                cells = frozenset().union(
+                    *self.get_directions(vehicle_type, bonus, cell)
+                )
+            else:
+                cells = frozenset(
+                    cell.in_radius_excl(
+                        gb_cf.MIN_RANGE[vehicle_type],
+                        gb_cf.MAX_RANGE[vehicle_type] + bonus,
+                    ).intersection(self.cells)
+                )
+            self.ranges[key] = cells
+        return cells
+
+    def get_attackers(
+        self, vehicle_type: str, bonus: int, target: Cell
+    ) -> frozenset[Cell]:
+        """
+        Returns cells from which vehicle can shoot target, equal to
+        range of target because shooting is symmetric. The only exception
+        is obstacle, AT-SPG can not shoot it as its ray is interrupted
+        :param vehicle_type: type of vehicle
+        :param bonus: shoot range bonus of vehicle
+        :param target: target cell
+        :return: frozenset of Cell
+        """
+        if vehicle_type == "at_spg" and target in self.obstacles:
+            return frozenset()
+        return self.get_range(vehicle_type, bonus, target)
+
+    def can_shoot(
+        self, vehicle_type: str, bonus: int, cell: Cell, target: Cell
+    ) -> bool:
+        """
+        :param vehicle_type: type of vehicle
+        :param bonus: shoot range bonus of vehicle
+        :param cell: position of vehicle
+        :param target: target cell
+        :return: True if vehicle on cell can shoot target
+        """
+        return target in self.get_range(vehicle_type, bonus, cell)
+
+    def get_hot_spots(self, tanks: dict) -> set[Cell]:
+        """
+        :param tanks: dict (Cell: TankModel) of tanks
+        :return: set of cells that given tanks can shoot
+        """
+        return set().union(
+            *(
+                self.get_range(tank.vehicle_type, tank.shoot_range_bonus, cell)
+                for cell, tank in tanks.items()
+            )
+        )
+
+    def is_hot_spot(self, target: Cell, tanks: dict) -> bool:
+        """
+        :param target: any cell
+        :param tanks: dict (Cell: TankModel) of tanks
+        :return: True if any of given tanks can shoot target
+        """
+        for cell, tank in tanks.items():
+            attackers = self.get_attackers(
+                tank.vehicle_type, tank.shoot_range_bonus, target
+            )
+            if cell in attackers:
+                return True
+        return False
@@ -19,7 +19,7 @@ class Cell:
     z: int
 
     def __iter__(self):
-        return iter(dataclasses.astuple(self))
+        return iter((self.x, self.y, self.z))
 
     def cube_distance(self, other) -> int:
         """
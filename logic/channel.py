@@ -0,0 +1,52 @@
+"""
+This module contains LatestChannel - bounded thread safe channel
+between game thread and main window. Channel keeps only the latest
+item, so reader never processes states that are already outdated
+"""
+import threading
+from typing import Any, Callable, Optional
+
+
+class LatestChannel:
+    """
+    Channel of capacity one, "latest item wins": writer never
+    blocks and replaces item that was not taken yet, reader
+    polls channel with its own rate. If merge function is given,
+    pending item is combined with new one instead of being dropped
+    """
+
+    def __init__(self, merge: Optional[Callable[[Any, Any], Any]] = None):
+        self.merge = merge
+        self.lock = threading.Lock()
+        self.item: Optional[Any] = None
+        self.has_item = False
+        self.sent = 0
+        self.dropped = 0
+
+    def put(self, item: Any) -> None:
+        """
+        Stores item, pending item is dropped or merged with new one
+        :param item: any obj, should not be changed after put
+        :return: None
+        """
+        with self.lock:
+            if self.has_item:
+                self.dropped += 1
+                if self.merge is not None:
+                    item = self.merge(self.item, item)
+            self.item = item
+            self.has_item = True
+            self.sent += 1
+
+    def take(self) -> Optional[Any]:
+        """
+        Takes pending item
+        :return: the latest item or None if there is no new item
+        """
+        with self.lock:
+            if not self.has_item:
+                return None
+            item = self.item
+            self.item = None
+            self.has_item = False
+            return item
@@ -0,0 +1,212 @@
+"""
+This module contains ClusterGraph - hierarchical abstraction of map for
+pathfinding on large maps (HPA*). Long routes are planned on a small
+graph of cluster entrances and refined by local searches
+"""
+import heapq
+from collections import deque
+from itertools import count
+from typing import Optional
+
+from config import config as cf
+from logic.cell import Cell
+from logic.pathfinding import build_path, find_nearest
+
+ClusterKey = tuple[int, int]
+
+
+class ClusterGraph:
+    """
+    Graph of cluster entrances built once per map. Cluster is parallelogram
+    of cluster_size x cluster_size cells by x and y cube coordinates. Each
+    connected part of border between two clusters gives one pair of
+    entrances in its middle, entrances of one cluster are connected by
+    length of the shortest path inside the cluster
+    """
+
+    def __init__(self, cells: set[Cell], cluster_size: int = cf.CLUSTER_SIZE):
+        """
+        :param cells: set of cells path may go through
+        :param cluster_size: number of cells on side of cluster
+        """
+        self.cells = cells
+        self.cluster_size = cluster_size
+        self.adjacent: dict[Cell, tuple[Cell, ...]] = {
+            cell: tuple(cells.intersection(cell.neighbours())) for cell in cells
+        }
+        self.clusters: dict[ClusterKey, set[Cell]] = {}
+        for cell in cells:
+            self.clusters.setdefault(self.get_key(cell), set()).add(cell)
+        self.entrances: dict[ClusterKey, set[Cell]] = {
+            key: set() for key in self.clusters
+        }
+        self.edges: dict[Cell, dict[Cell, int]] = {}
+        self.build_entrances()
+        for key, entrances in self.entrances.items():
+            for entrance in entrances:
+                distances = self.get_distances(entrance, self.clusters[key])
+                for other in entrances.intersection(distances):
+                    if other != entrance:
+                        self.edges[entrance][other] = distances[other]
+
+    def get_key(self, cell: Cell) -> ClusterKey:
+        """
+        :param cell: Cell obj
+        :return: key of cluster that contains cell
+        """
+        return cell.x // self.cluster_size, cell.y // self.cluster_size
+
+    def get_adjacent(self, cell: Cell) -> tuple[Cell, ...]:
+        """
+        :param cell: any cell, it may be out of graph cells
+        :return: tuple of neighbours of cell that belong to graph cells
+        """
+        adjacent = self.adjacent.get(cell)
+        if adjacent is None:
+            adjacent = tuple(self.cells.intersection(cell.neighbours()))
+        return adjacent
+
+    def build_entrances(self) -> None:
+        """
+        Finds connected parts of borders between clusters
+        and places entrances in the middle of each part
+        :return: None
+        """
+        borders: dict[tuple[ClusterKey, ClusterKey], set[Cell]] = {}
+        for cell in self.cells:
+            key = self.get_key(cell)
+            for neighbour in self.adjacent[cell]:
+                other = self.get_key(neighbour)
+                if key < other:
+                    borders.setdefault((key, other), set()).add(cell)
+        for (key, other), border in borders.items():
+            for part in self.split_connected(border):
+                cell = sorted(part, key=tuple)[len(part) // 2]
+                neighbour = min(
+                    (i for i in self.adjacent[cell] if self.get_key(i) == other),
+                    key=tuple,
+                )
+                self.entrances[key].add(cell)
+                self.entrances[other].add(neighbour)
+                self.edges.setdefault(cell, {})[neighbour] = 1
+                self.edges.setdefault(neighbour, {})[cell] = 1
+
+    def split_connected(self, cells: set[Cell]) -> list[set[Cell]]:
+        """
+        :param cells: set of graph cells
+        :return: list of connected parts of given cells
+        """
+        parts = []
+        left = set(cells)
+        while left:
+            part = set(self.get_distances(left.pop(), left))
+            left.difference_update(part)
+            parts.append(part)
+        return parts
+
+    def get_distances(
+        self,
+        start: Cell,
+        region: set[Cell],
+        available: Optional[set[Cell]] = None,
+    ) -> dict[Cell, int]:
+        """
+        Breadth-first search that does not leave given region
+        :param start: start cell
+        :param region: set of cells search may visit
+        :param available: set of cells path may go through, graph cells
+        by default
+        :return: dict (cell: number of steps from start)
+        """
+        distances = {start: 0}
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            for neighbour in self.get_adjacent(cell):
+                if (
+                    neighbour in region
+                    and neighbour not in distances
+                    and (available is None or neighbour in available)
+                ):
+                    distances[neighbour] = distances[cell] + 1
+                    queue.append(neighbour)
+        return distances
+
+    def find_route(
+        self, start: Cell, goal: Cell, available: set[Cell]
+    ) -> Optional[list[Cell]]:
+        """
+        Plans route on graph of entrances. Start and goal are connected
+        to entrances of their clusters by searches inside clusters, start
+        cluster is searched only through available cells
+        :param start: start cell
+        :param goal: target cell
+        :param available: set of cells path may go through
+        :return: list of entrances on route followed by goal, start is
+        excluded, None if goal is not reachable
+        """
+        start_key = self.get_key(start)
+        from_start = self.get_distances(
+            start, self.clusters.get(start_key, set()), available
+        )
+        if goal in from_start:
+            return [goal]
+        from_start = {
+            cell: steps
+            for cell, steps in from_start.items()
+            if cell in self.entrances[start_key]
+        }
+        goal_key = self.get_key(goal)
+        to_goal = {
+            cell: steps
+            for cell, steps in self.get_distances(
+                goal, self.clusters.get(goal_key, set())
+            ).items()
+            if cell in self.entrances[goal_key]
+        }
+
+        previous: dict[Cell, Optional[Cell]] = {start: None}
+        costs = {start: 0}
+        order = count()
+        queue = [(start.cube_distance(goal), 0, next(order), start)]
+        while queue:
+            _, cost, _, cell = heapq.heappop(queue)
+            if cell == goal:
+                return build_path(previous, goal)
+            if cost > costs[cell]:
+                continue
+            edges = dict(self.edges.get(cell, {}))
+            if cell == start:
+                edges.update(from_start)
+            if cell in to_goal:
+                edges[goal] = to_goal[cell]
+            for other, steps in edges.items():
+                other_cost = cost + steps
+                if other_cost < costs.get(other, other_cost + 1):
+                    costs[other] = other_cost
+                    previous[other] = cell
+                    estimate = other_cost + other.cube_distance(goal)
+                    heapq.heappush(queue, (estimate, other_cost, next(order), other))
+        return None
+
+    def find_path(
+        self, start: Cell, goal: Cell, available: set[Cell]
+    ) -> Optional[list[Cell]]:
+        """
+        Plans route on graph of entrances and refines it to cells
+        :param start: start cell
+        :param goal: target cell
+        :param available: set of cells path may go through
+        :return: list with path Cell excluding start, as Cell.a_star,
+        None if goal is not reachable
+        """
+        route = self.find_route(start, goal, available)
+        if route is None:
+            return None
+        path = []
+        for waypoint in route:
+            _, part = find_nearest(path[-1] if path else start, available, {waypoint})
+            if not part:
+                return None
+            path.extend(part)
+        return path
@@ -1,15 +1,37 @@
 """
 This module contains Game thread class - mediator that contains main game loop
 """
-from copy import deepcopy
+import os
+import time
 from typing import Optional
 
 from PySide6 import QtCore
 
-from config.config import Actions
+from config.config import (
+    Actions,
+    PROFILE_DIR,
+    PROFILE_REPORT_INTERVAL,
+    RECORDS_DIR,
+    SHARE_MAP_TABLES,
+    TRANSPOSITION_TABLE_SIZE,
+)
 from connection import Connection
+from logic.channel import LatestChannel
 from logic.model import GameState, GameMap, GameActions
+from logic.profiler import TurnProfiler
+from logic.search import BeamSearch
+from logic.shared_tables import share_tables
+from logic.snapshot import ColumnsSnapshot, StateDiff
+from logic.transposition import TranspositionTable
 from logic.vehicle import Vehicle
+from recorder import WireRecorder
+
+VEHICLE_PHASES = (
+    "set_priority",
+    "targets_in_range",
+    "choose_target",
+    "move_to_priority",
+)
 
 
 class Game(QtCore.QThread):
@@ -18,19 +40,25 @@ class Game(QtCore.QThread):
     runs as a thread called from main window
     """
 
-    game_state_updated = QtCore.Signal(GameMap, GameState)
     game_ended = QtCore.Signal(str)
     update = QtCore.Signal(str)
+    profile = QtCore.Signal(str)
 
-    def __init__(self, login_data: dict):
+    def __init__(self, login_data: dict, engine: Optional[BeamSearch] = None):
         super().__init__(None)
         self.idx: Optional[int] = None
         self.login_data = login_data
-        self.connection = Connection()
+        self.engine = engine
+        self.profiler = TurnProfiler()
+        self.last_report = time.monotonic()
+        self.connection = Connection(self.create_recorder(), self.profiler)
         self.vehicles_list: list[Vehicle] = []
         self.game_state: Optional[GameState] = None
         self.game_actions: Optional[GameActions] = None
         self.map: Optional[GameMap] = None
+        self.snapshot: Optional[ColumnsSnapshot] = None
+        self.states = LatestChannel(self.merge_updates)
+        self.decisions = TranspositionTable(TRANSPOSITION_TABLE_SIZE)
         self.game_statistic = {"Draws": 0, }
 
     def run(self) -> None:
@@ -45,6 +73,7 @@ class Game(QtCore.QThread):
 
         # <---------------------- main loop ---------------------
         while True:
+            self.report_profile()
             self.refresh_game_state()
             if not self.game_state.is_ready():
                 continue
@@ -57,26 +86,45 @@ class Game(QtCore.QThread):
                 break
             if self.game_state.current_turn != turn:
                 turn = self.game_state.current_turn
-                self.game_state_updated.emit(self.map, deepcopy(self.game_state))
+                self.publish_state()
             if self.game_state.current_player != self.idx:
                 self.connection.send(Actions.TURN)
                 continue
+            start = time.perf_counter()
             self.make_turn()
+            self.profiler.record("make_turn", start)
             self.connection.send(Actions.TURN)
         # <-------------------- end of main loop ----------------
 
+        self.dump_profile()
+        if self.engine is not None and self.engine.evaluator is not None:
+            self.engine.evaluator.close()
         self.game_ended.emit(str(self.game_statistic))
         self.connection.send(Actions.LOGOUT)
         self.connection.close_connection()
         self.quit()
 
+    def create_recorder(self) -> Optional[WireRecorder]:
+        """
+        Creates recorder of client-server frames if RECORDS_DIR is set,
+        file name contains player name, game name and start time
+        :return: WireRecorder obj or None
+        """
+        if RECORDS_DIR is None:
+            return None
+        name = f"{self.login_data['name']}_{self.login_data.get('game')}"
+        return WireRecorder(os.path.join(RECORDS_DIR, f"{name}_{int(time.time())}.wgr"))
+
     def refresh_game_state(self) -> None:
         """
         Method that creates GameState obj from GAME_STATE dict response,
         and refreshes self.game_state
         :return: None
         """
-        self.game_state = GameState(self.connection.send(Actions.GAME_STATE), self.idx)
+        data = self.connection.send(Actions.GAME_STATE)
+        start = time.perf_counter()
+        self.game_state = GameState(data, self.idx)
+        self.profiler.record("game_state", start)
 
     def refresh_game_actions(self) -> None:
         """
@@ -89,31 +137,57 @@ class Game(QtCore.QThread):
     def init_vehicles(self) -> None:
         """
         Instantiates vehicles at the beginning of the game according
-        to game_state, add them into list in the order of their turn
+        to game_state, add them into list in the order of their turn.
+        Decision steps of vehicles are timed by profiler
         :return: None
         """
         for t_id, spec in self.game_state.get_ordered_tanks():
-            self.vehicles_list.append(Vehicle.build(t_id, spec))
+            vehicle = Vehicle.build(t_id, spec)
+            vehicle.decisions = self.decisions
+            self.profiler.instrument(
+                vehicle, VEHICLE_PHASES, f"decision.{type(vehicle).__name__}"
+            )
+            self.vehicles_list.append(vehicle)
 
     def make_turn(self) -> None:
         """
         Asks ours vehicle to make turn in order they were instantiated
-        in the beginning of the game
+        in the beginning of the game, or asks strategy engine to plan
+        joint turn of all vehicles if engine is set
         :return: None
         """
+        if self.engine is not None:
+            start = time.perf_counter()
+            actions = self.engine.plan(self.game_state, self.map, self.vehicles_list)
+            self.profiler.record("decision", start)
+            for action in actions:
+                self.send_action(action)
+            return
         for vehicle in self.vehicles_list:
+            start = time.perf_counter()
             vehicle_turn = vehicle.make_turn(self.game_state, self.map)
+            self.profiler.record("decision", start)
             if vehicle_turn:
                 self.game_state.update_data(vehicle_turn)
-                self.connection.send(*vehicle_turn)
+                self.send_action(vehicle_turn)
+
+    def send_action(self, action: tuple[Actions, dict]) -> None:
+        """
+        Sends MOVE or SHOOT action to server, time of sending is profiled
+        :param action: tuple(Actions, data)
+        :return: None
+        """
+        start = time.perf_counter()
+        self.connection.send(*action)
+        self.profiler.record("action_send", start)
 
     def init_game(self) -> None:
         """
         Provides such actions at the beginning of the game: starts connection,
         login, defines player id using login response, calls first refreshing
         of game_state, instantiates GameMap obj using GAME_MAP response,
-        call players vehicle instantiation, emit signal for first main window
-        update
+        call players vehicle instantiation, publishes first state for main
+        window
         :return: None
         """
 
@@ -122,8 +196,69 @@ class Game(QtCore.QThread):
         self.idx = login_answer["idx"]
         self.refresh_game_state()
         self.map = GameMap(self.connection.send(Actions.MAP))
+        if SHARE_MAP_TABLES:
+            self.map.tables = share_tables(self.map)
+        self.map.build_cluster_graph()
         self.init_vehicles()
-        self.game_state_updated.emit(self.map, self.game_state)
+        self.publish_state()
+
+    def publish_state(self) -> None:
+        """
+        Puts diff between previous and current snapshot of game state to
+        states channel, diffs not taken by main window yet are merged.
+        Snapshots are vehicle columns, so only changed vehicles are
+        converted to changes
+        :return: None
+        """
+        start = time.perf_counter()
+        snapshot = ColumnsSnapshot.from_state(self.game_state)
+        self.states.put((self.map, snapshot.diff(self.snapshot)))
+        self.snapshot = snapshot
+        self.profiler.record("gui", start)
+
+    def get_profile_summary(self) -> str:
+        """
+        :return: summary of turn phases and connection counters
+        """
+        return f"{self.profiler.summary()}\n\n{self.connection.stats.summary()}"
+
+    def report_profile(self) -> None:
+        """
+        Emits summary of turn profile not more often than once
+        per PROFILE_REPORT_INTERVAL seconds
+        :return: None
+        """
+        now = time.monotonic()
+        if now - self.last_report >= PROFILE_REPORT_INTERVAL:
+            self.last_report = now
+            self.profile.emit(self.get_profile_summary())
+
+    def dump_profile(self) -> None:
+        """
+        Writes turn profile and connection counters of the game to
+        PROFILE_DIR if it is set, file names contain player name,
+        game name and start time
+        :return: None
+        """
+        self.profile.emit(self.get_profile_summary())
+        if PROFILE_DIR is None:
+            return
+        name = f"{self.login_data['name']}_{self.login_data.get('game')}"
+        path = os.path.join(PROFILE_DIR, f"{name}_{int(self.profiler.started)}")
+        self.profiler.dump(f"{path}.json")
+        self.connection.stats.dump(f"{path}_connection.json")
+
+    @staticmethod
+    def merge_updates(
+        pending: tuple[GameMap, StateDiff], update: tuple[GameMap, StateDiff]
+    ) -> tuple[GameMap, StateDiff]:
+        """
+        Merges pending update of states channel with new one
+        :param pending: (GameMap, StateDiff) not taken by main window
+        :param update: new (GameMap, StateDiff)
+        :return: merged (GameMap, StateDiff)
+        """
+        return update[0], pending[1].merge(update[1])
 
     def update_statistic(self) -> None:
         """
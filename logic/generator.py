@@ -0,0 +1,222 @@
+"""
+This module contains generator of synthetic maps and game states in
+format of GAME_MAP and GAME_STATE responses, used to test and benchmark
+game logic on maps bigger than official ones. Generation is seeded,
+so the same arguments always produce the same map
+
+Usage: python -m logic.generator --size 100 --obstacles 0.1 --out map.json
+"""
+import argparse
+import json
+import random
+from collections import deque
+from typing import Optional
+
+from config import game_balance as gb_cf
+from logic.cell import Cell
+from logic.model import CENTER_POINT
+from logic.simulator import Simulator
+
+CORNERS = (  # in order of going around the map
+    (1, -1, 0),
+    (1, 0, -1),
+    (0, 1, -1),
+    (-1, 1, 0),
+    (-1, 0, 1),
+    (0, -1, 1),
+)
+
+
+def point(cell: Cell) -> dict:
+    """
+    :param cell: Cell obj
+    :return: dict with x, y, z keys
+    """
+    return {"x": cell.x, "y": cell.y, "z": cell.z}
+
+
+def generate_map(
+    size: int = 11,
+    obstacle_density: float = 0.05,
+    num_players: int = 3,
+    vehicle_counts: Optional[dict[str, int]] = None,
+    content_count: Optional[int] = None,
+    base_radius: int = 1,
+    seed: int = 0,
+) -> dict:
+    """
+    Generates map in format of GAME_MAP response. Base is in the center
+    of map, spawn points of players are near different corners of map,
+    repairs and catapults are placed randomly. Obstacles are placed on
+    random free cells, then passages are cleared, so every spawn point
+    and content cell is reachable from base
+    :param size: map size, number of cells from center to border + 1
+    :param obstacle_density: share of free cells occupied by obstacles
+    :param num_players: number of players, from 1 to 6
+    :param vehicle_counts: dict (vehicle type: number of vehicles of
+    each player), one vehicle of each type by default
+    :param content_count: number of repairs and catapults of each type,
+    grows with map size by default
+    :param base_radius: radius of base around center
+    :param seed: random seed
+    :return: dict in format of GAME_MAP response
+    """
+    if not 1 <= num_players <= len(CORNERS):
+        raise ValueError(f"Number of players should be from 1 to {len(CORNERS)}")
+    rng = random.Random(seed)
+    if vehicle_counts is None:
+        vehicle_counts = {vehicle_type: 1 for vehicle_type in gb_cf.TURN_ORDER}
+    if content_count is None:
+        content_count = max(1, size // 11)
+
+    center = Cell(*CENTER_POINT)
+    cells = center.in_radius(size - 1)
+    base = center.in_radius(base_radius)
+    used = set(base)
+    spawn_points = []
+    for player in range(num_players):
+        corner = Cell(*(i * (size - 1) for i in CORNERS[player * 6 // num_players]))
+        candidates = iter(
+            sorted(
+                cells - used, key=lambda cell: (corner.cube_distance(cell), *cell)
+            )
+        )
+        player_spawns = {}
+        for vehicle_type in sorted(vehicle_counts, key=gb_cf.TURN_ORDER.get):
+            player_spawns[vehicle_type] = [
+                next(candidates) for _ in range(vehicle_counts[vehicle_type])
+            ]
+            used.update(player_spawns[vehicle_type])
+        spawn_points.append(player_spawns)
+
+    free = sorted(cells - used, key=tuple)
+    content = {"base": base}
+    for content_type in ("light_repair", "hard_repair", "catapult"):
+        content[content_type] = set(rng.sample(free, content_count))
+        used.update(content[content_type])
+        free = [cell for cell in free if cell not in used]
+    obstacles = set(rng.sample(free, int(len(free) * obstacle_density)))
+    clear_passages(cells, obstacles, base, used - base)
+    content["obstacle"] = obstacles
+
+    return {
+        "size": size,
+        "name": f"generated_{size}_{seed}",
+        "spawn_points": [
+            {
+                vehicle_type: [point(cell) for cell in spawns]
+                for vehicle_type, spawns in player_spawns.items()
+            }
+            for player_spawns in spawn_points
+        ],
+        "content": {
+            content_type: [point(cell) for cell in sorted(content_cells, key=tuple)]
+            for content_type, content_cells in content.items()
+        },
+    }
+
+
+def clear_passages(
+    cells: set[Cell], obstacles: set[Cell], base: set[Cell], required: set[Cell]
+) -> None:
+    """
+    Removes obstacles, so every required cell is reachable from base.
+    Path from unreachable cell goes to map center, each step decreases
+    distance to center, obstacles on the path are removed
+    :param cells: all cells of map
+    :param obstacles: set of obstacle cells, changed in place
+    :param base: base cells, base contains map center
+    :param required: cells that should be reachable
+    :return: None
+    """
+    center = Cell(*CENTER_POINT)
+    reachable = set(base)
+    queue = deque(base)
+    while queue:
+        cell = queue.popleft()
+        for neighbour in cell.neighbours():
+            if (
+                neighbour in cells
+                and neighbour not in obstacles
+                and neighbour not in reachable
+            ):
+                reachable.add(neighbour)
+                queue.append(neighbour)
+
+    for cell in sorted(required - reachable, key=tuple):
+        while cell not in reachable:
+            reachable.add(cell)
+            obstacles.discard(cell)
+            cell = min(
+                cell.neighbours(),
+                key=lambda neighbour: (neighbour.cube_distance(center), *neighbour),
+            )
+
+
+def generate_state(
+    map_data: dict,
+    num_turns: int = 45,
+    scatter: bool = False,
+    seed: int = 0,
+) -> dict:
+    """
+    Generates game state in format of GAME_STATE response, first player
+    makes the first turn
+    :param map_data: dict in format of GAME_MAP response
+    :param num_turns: number of turns in game
+    :param scatter: if True, vehicles are placed on random free cells
+    with random health, otherwise vehicles are on their spawn points
+    :param seed: random seed
+    :return: dict in format of GAME_STATE response
+    """
+    data = Simulator.from_map_data(map_data, num_turns).state_data()
+    if not scatter:
+        return data
+    rng = random.Random(seed)
+    obstacles = {
+        Cell(i["x"], i["y"], i["z"])
+        for i in map_data["content"].get("obstacle", [])
+    }
+    cells = Cell(*CENTER_POINT).in_radius(map_data["size"] - 1)
+    free = sorted(cells - obstacles, key=tuple)
+    positions = rng.sample(free, len(data["vehicles"]))
+    for vehicle, position in zip(data["vehicles"].values(), positions):
+        vehicle["position"] = point(position)
+        vehicle["health"] = rng.randint(1, gb_cf.MAX_HP[vehicle["vehicle_type"]])
+    return data
+
+
+def main() -> None:
+    """
+    Command line entry point
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", type=int, default=11)
+    parser.add_argument("--obstacles", type=float, default=0.05)
+    parser.add_argument("--players", type=int, default=3)
+    parser.add_argument(
+        "--vehicles", type=int, default=1, help="vehicles of each type per player"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="json file for GAME_MAP")
+    parser.add_argument("--state", help="json file for GAME_STATE")
+    parser.add_argument("--scatter", action="store_true")
+    args = parser.parse_args()
+    map_data = generate_map(
+        args.size,
+        args.obstacles,
+        args.players,
+        {vehicle_type: args.vehicles for vehicle_type in gb_cf.TURN_ORDER},
+        seed=args.seed,
+    )
+    with open(args.out, "w") as file:
+        json.dump(map_data, file)
+    if args.state:
+        with open(args.state, "w") as file:
+            state = generate_state(map_data, scatter=args.scatter, seed=args.seed)
+            json.dump(state, file)
+
+
+if __name__ == "__main__":
+    main()
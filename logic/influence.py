@@ -0,0 +1,256 @@
+"""
+This module contains influence maps - feature layers of map cells stored
+as NumPy arrays over MapTables cell index, and scoring of candidate cells
+by weight vectors of vehicles
+"""
+from typing import Optional
+
+import numpy as np
+
+from logic.cell import Cell
+from logic.map_tables import MapTables, NO_CELL
+from logic.model import GameMap, GameState, VEHICLE_TYPE_NAMES
+from logic.shared_tables import get_map_tables
+
+# order of feature columns and of items in weight vectors
+FEATURES = (
+    "path",  # 1 for the step of path to priority
+    "priority_distance",
+    "threat",  # number of enemy tanks that can shoot cell
+    "targets",  # number of tanks we may shoot from cell
+    "base_distance",
+    "light_repair_distance",
+    "hard_repair_distance",
+    "catapult_distance",  # distance to the nearest catapult that can be used
+    "occupied",
+)
+
+
+class MapLayers:
+    """
+    Static layers of map: coordinates of cells, distances to base, repairs
+    and catapults, and cell indexes of shooting ranges. Layers are created
+    once per map, distance to cells not connected with content is the
+    number of map cells
+    """
+
+    def __init__(self, map_: GameMap, tables: MapTables):
+        self.map = map_
+        self.tables = tables
+        self.coords = np.frombuffer(tables.coords, dtype=np.intc).reshape(-1, 3)
+        self.base_distance = self.to_distances(tables.base_distance)
+        self.light_repair_distance = self.get_distances(map_.light_repairs)
+        self.hard_repair_distance = self.get_distances(map_.hard_repairs)
+        self.catapult_distances: dict[frozenset[Cell], np.ndarray] = {}
+        self.ranges: dict[tuple[str, int, Cell], np.ndarray] = {}
+
+    def to_distances(self, distances) -> np.ndarray:
+        """
+        :param distances: array of distances, NO_CELL for unreachable cells
+        :return: float array of distances
+        """
+        result = np.array(distances, dtype=float)
+        result[result == NO_CELL] = len(self.tables)
+        return result
+
+    def get_distances(self, cells: set[Cell]) -> np.ndarray:
+        """
+        :param cells: set of map cells
+        :return: float array of distances from the nearest of given cells
+        """
+        return self.to_distances(
+            self.tables.bfs_distances([self.tables.index[cell] for cell in cells])
+        )
+
+    def get_catapult_distance(self, catapults: frozenset[Cell]) -> np.ndarray:
+        """
+        :param catapults: frozenset of catapult cells that can be used
+        :return: float array of distances from the nearest given catapult
+        """
+        distances = self.catapult_distances.get(catapults)
+        if distances is None:
+            distances = self.catapult_distances[catapults] = self.get_distances(
+                catapults
+            )
+        return distances
+
+    def get_indexes(self, cells) -> np.ndarray:
+        """
+        :param cells: collection of map cells
+        :return: array of cell indexes
+        """
+        index = self.tables.index
+        return np.fromiter(
+            (index[cell] for cell in cells), dtype=np.intp, count=len(cells)
+        )
+
+    def get_range(self, vehicle_type: str, bonus: int, cell: Cell) -> np.ndarray:
+        """
+        :param vehicle_type: type of vehicle
+        :param bonus: shoot range bonus of vehicle
+        :param cell: position of vehicle
+        :return: array of indexes of cells vehicle can shoot
+        """
+        key = (vehicle_type, bonus, cell)
+        indexes = self.ranges.get(key)
+        if indexes is None:
+            indexes = self.ranges[key] = self.get_indexes(
+                self.map.attack_index.get_range(vehicle_type, bonus, cell)
+            )
+        return indexes
+
+
+class InfluenceMap:
+    """
+    Layers of game state: threat of enemy tanks, tanks that can be shot
+    from each cell by vehicle type and occupancy of cells. It is created
+    for each state of turn, candidate cells of vehicle are scored with
+    one matrix product
+    """
+
+    def __init__(self, state: GameState, layers: MapLayers):
+        self.state = state
+        self.zobrist = state.zobrist
+        self.layers = layers
+        size = len(layers.tables)
+        columns = state.columns
+        alive = (columns.owner != state.idx) & (columns.health > 0)
+        self.threat = self.count_cells(
+            [
+                layers.get_range(VEHICLE_TYPE_NAMES[code], bonus, cell)
+                for code, bonus, cell in zip(
+                    columns.type_code[alive].tolist(),
+                    columns.range_bonus[alive].tolist(),
+                    columns.get_cells(alive),
+                )
+            ]
+        )
+        self.occupied = np.zeros(size)
+        self.occupied[layers.get_indexes(state.tank_cells)] = 1
+        self.catapult_distance = layers.get_catapult_distance(
+            frozenset(layers.map.catapults.difference(state.inactive_catapults))
+        )
+        self.targets: dict[tuple[str, int], np.ndarray] = {}
+
+    def count_cells(self, indexes: list[np.ndarray]) -> np.ndarray:
+        """
+        :param indexes: list of arrays of cell indexes
+        :return: float array, number of arrays that contain each cell
+        """
+        size = len(self.layers.tables)
+        if not indexes:
+            return np.zeros(size)
+        return np.bincount(np.concatenate(indexes), minlength=size).astype(float)
+
+    def get_targets(self, vehicle_type: str, bonus: int) -> np.ndarray:
+        """
+        Shooting is symmetric, so cells from which vehicle can shoot
+        a tank are range of vehicle placed on the tank cell
+        :param vehicle_type: type of vehicle
+        :param bonus: shoot range bonus of vehicle
+        :return: float array, number of tanks we may shoot from each cell
+        """
+        key = (vehicle_type, bonus)
+        targets = self.targets.get(key)
+        if targets is None:
+            targets = self.targets[key] = self.count_cells(
+                [
+                    self.layers.get_range(vehicle_type, bonus, cell)
+                    for cell in self.state.aggressive_tanks
+                ]
+            )
+        return targets
+
+    def get_features(
+        self,
+        cells: list[Cell],
+        vehicle_type: str,
+        bonus: int,
+        priority: Optional[Cell],
+        step: Optional[Cell],
+    ) -> np.ndarray:
+        """
+        :param cells: list of candidate cells
+        :param vehicle_type: type of vehicle
+        :param bonus: shoot range bonus of vehicle
+        :param priority: priority cell of vehicle or None
+        :param step: step of path to priority or None
+        :return: matrix of features, row per cell in order of FEATURES
+        """
+        layers = self.layers
+        indexes = layers.get_indexes(cells)
+        features = np.zeros((len(cells), len(FEATURES)))
+        if step is not None:
+            features[:, 0] = indexes == layers.tables.index[step]
+        if priority is not None:
+            features[:, 1] = np.abs(layers.coords[indexes] - tuple(priority)).max(1)
+        features[:, 2] = self.threat[indexes]
+        features[:, 3] = self.get_targets(vehicle_type, bonus)[indexes]
+        features[:, 4] = layers.base_distance[indexes]
+        features[:, 5] = layers.light_repair_distance[indexes]
+        features[:, 6] = layers.hard_repair_distance[indexes]
+        features[:, 7] = self.catapult_distance[indexes]
+        features[:, 8] = self.occupied[indexes]
+        return features
+
+    def choose(
+        self,
+        cells: list[Cell],
+        weights: np.ndarray,
+        vehicle_type: str,
+        bonus: int,
+        priority: Optional[Cell] = None,
+        step: Optional[Cell] = None,
+    ) -> Cell:
+        """
+        :param cells: list of candidate cells
+        :param weights: array of weights in order of FEATURES
+        :param vehicle_type: type of vehicle
+        :param bonus: shoot range bonus of vehicle
+        :param priority: priority cell of vehicle or None
+        :param step: step of path to priority or None
+        :return: candidate cell with the highest score
+        """
+        scores = self.get_features(cells, vehicle_type, bonus, priority, step) @ weights
+        return cells[int(np.argmax(scores))]
+
+
+class InfluenceCache:
+    """
+    Keeps MapLayers of each map and InfluenceMap of the last game state,
+    influence map is created again when any tank moved or was damaged
+    """
+
+    def __init__(self):
+        self.layers: dict[str, MapLayers] = {}
+        self.influence: Optional[InfluenceMap] = None
+
+    def get_layers(self, map_: GameMap) -> MapLayers:
+        """
+        :param map_: GameMap obj
+        :return: MapLayers of map, created once per map name from tables
+        of map
+        """
+        layers = self.layers.get(map_.name)
+        if layers is None:
+            layers = MapLayers(map_, get_map_tables(map_))
+            self.layers[map_.name] = layers
+        return layers
+
+    def get_influence(self, state: GameState, map_: GameMap) -> InfluenceMap:
+        """
+        :param state: GameState obj
+        :param map_: GameMap obj
+        :return: InfluenceMap of current state
+        """
+        influence = self.influence
+        if (
+            influence is None
+            or influence.state is not state
+            or influence.zobrist != state.zobrist
+        ):
+            influence = self.influence = InfluenceMap(state, self.get_layers(map_))
+        return influence
+
+
+influence_cache = InfluenceCache()
@@ -0,0 +1,196 @@
+"""
+This module contains on-disk cache of MapTables. Server reuses the same
+maps across games and rounds, so tables built once are saved to
+MAP_CACHE_DIR and loaded by later games and bot processes
+
+Cache file is named by map name, size and hash of map content. File
+starts with HEADER (MAGIC, VERSION, RAY_LENGTH, map size, number of
+cells), then int32 arrays follow: coords, neighbours, rays and
+base_distance, then flags, one byte per cell. File is memory-mapped on
+load and arrays are copied from the map without parsing, the same
+format is used by shared_tables for tables in shared memory. Files of other
+VERSION or RAY_LENGTH are rebuilt, VERSION should be increased when
+geometry of Cell or building of MapTables is changed
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Optional
+
+from logic.map_tables import MapTables, RAY_LENGTH
+from logic.model import GameMap
+
+MAGIC = b"WGMC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+INT_ARRAYS = ("coords", "neighbours", "rays", "base_distance")
+
+
+def content_hash(map_: GameMap) -> str:
+    """
+    :param map_: GameMap obj
+    :return: hex digest of map size and sorted content cells
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(str(map_.size).encode())
+    for content in (
+        map_.obstacles,
+        map_.base,
+        map_.light_repairs,
+        map_.hard_repairs,
+        map_.catapults,
+        map_.spawn_points,
+    ):
+        digest.update(b"|")
+        cells = sorted(content, key=tuple)
+        digest.update(array("i", (i for cell in cells for i in cell)))
+    return digest.hexdigest()
+
+
+def get_path(directory: str, map_: GameMap) -> str:
+    """
+    :param directory: cache directory
+    :param map_: GameMap obj
+    :return: path of cache file of map
+    """
+    name = "".join(i if i.isalnum() or i in "-_" else "_" for i in map_.name)
+    return os.path.join(directory, f"{name}_{map_.size}_{content_hash(map_)}.wgmc")
+
+
+def get_lengths(cells: int) -> tuple[int, ...]:
+    """
+    :param cells: number of cells
+    :return: number of items of each array in INT_ARRAYS
+    """
+    return cells * 3, cells * 6, cells * 6 * RAY_LENGTH, cells
+
+
+def get_size(cells: int) -> int:
+    """
+    :param cells: number of cells
+    :return: number of bytes of tables in binary format
+    """
+    return HEADER.size + sum(get_lengths(cells)) * 4 + cells
+
+
+def dump_tables(tables: MapTables) -> bytes:
+    """
+    :param tables: MapTables obj
+    :return: tables in binary format of cache file
+    """
+    chunks = [HEADER.pack(MAGIC, VERSION, RAY_LENGTH, tables.size, len(tables))]
+    for name in INT_ARRAYS:
+        values = getattr(tables, name)
+        if sys.byteorder == "big":
+            values = array("i", values)
+            values.byteswap()
+        chunks.append(values.tobytes())
+    chunks.append(bytes(tables.flags))
+    return b"".join(chunks)
+
+
+def read_tables(data, map_: GameMap, copy: bool = True) -> Optional[MapTables]:
+    """
+    Creates MapTables from buffer in binary format of cache file
+    :param data: buffer, e.g. mmap or shared memory
+    :param map_: GameMap obj
+    :param copy: if True, tables are copied into arrays, otherwise
+    tables are read-only memoryviews of buffer, so buffer should not be
+    closed while tables are used, cells and index are computed views
+    :return: MapTables obj, None if data is stale or damaged
+    """
+    if len(data) < HEADER.size:
+        return None
+    magic, version, ray_length, size, cells = HEADER.unpack_from(data, 0)
+    if (
+        magic != MAGIC
+        or (version, ray_length, size) != (VERSION, RAY_LENGTH, map_.size)
+        or len(data) < get_size(cells)
+    ):
+        return None
+    if sys.byteorder == "big":
+        copy = True
+    view = memoryview(data).toreadonly() if not copy else None
+    arrays = {}
+    offset = HEADER.size
+    for name, length in zip(INT_ARRAYS, get_lengths(cells)):
+        end = offset + length * 4
+        if copy:
+            values = array("i")
+            values.frombytes(data[offset:end])
+            if sys.byteorder == "big":
+                values.byteswap()
+        else:
+            values = view[offset:end].cast("i")
+        arrays[name] = values
+        offset = end
+    if copy:
+        arrays["flags"] = bytearray(data[offset : offset + cells])
+    else:
+        arrays["flags"] = view[offset : offset + cells]
+    return MapTables.from_arrays(map_, views=not copy, **arrays)
+
+
+def save_tables(tables: MapTables, path: str) -> None:
+    """
+    Writes tables to temporary file and renames it, so concurrent
+    processes never read incomplete file
+    :param tables: MapTables obj
+    :param path: path of cache file
+    :return: None
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(dump_tables(tables))
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def load_tables(path: str, map_: GameMap) -> Optional[MapTables]:
+    """
+    :param path: path of cache file
+    :param map_: GameMap obj
+    :return: MapTables obj, None if file is missing, stale or damaged
+    """
+    try:
+        with open(path, "rb") as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+    with data:
+        if len(data) < HEADER.size or len(data) != get_size(
+            HEADER.unpack_from(data, 0)[-1]
+        ):
+            return None
+        return read_tables(data, map_)
+
+
+def get_tables(map_: GameMap, directory: Optional[str]) -> MapTables:
+    """
+    Loads MapTables of map from cache, tables are built and saved
+    if there is no valid cache file
+    :param map_: GameMap obj
+    :param directory: cache directory, usually MAP_CACHE_DIR of config,
+    None disables cache
+    :return: MapTables obj
+    """
+    if directory is None:
+        return MapTables(map_)
+    path = get_path(directory, map_)
+    tables = load_tables(path, map_)
+    if tables is None:
+        tables = MapTables(map_)
+        try:
+            save_tables(tables, path)
+        except OSError:
+            pass
+    return tables
@@ -0,0 +1,283 @@
+"""
+This module contains MapTables class - compact integer indexed
+representation of static map data. Cells are replaced by their
+indexes, so game rules and strategies can work with flat arrays
+instead of sets of Cell
+"""
+from array import array
+from collections import deque
+from collections.abc import Mapping, Sequence
+from typing import Union
+
+from config import game_balance as gb_cf
+from logic.cell import Cell
+from logic.model import GameMap
+
+NO_CELL = -1
+DIRECTIONS = (  # same order as Cell.normal_directions
+    (1, 0, -1),
+    (-1, 0, 1),
+    (-1, 1, 0),
+    (1, -1, 0),
+    (0, -1, 1),
+    (0, 1, -1),
+)
+RAY_LENGTH = max(gb_cf.MAX_RANGE.values()) + gb_cf.CATAPULT_RANGE_BONUS
+
+OBSTACLE = 1
+BASE = 2
+LIGHT_REPAIR = 4
+HARD_REPAIR = 8
+CATAPULT = 16
+SPAWN = 32
+
+
+class HexCells(Sequence):
+    """
+    Read-only list of cells ordered by index, cells are created from
+    coords on access, so the list does not hold Cell objects
+    """
+
+    def __init__(self, coords: Sequence[int]):
+        self.coords = coords
+
+    def __len__(self) -> int:
+        return len(self.coords) // 3
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[Cell, list[Cell]]:
+        if isinstance(idx, slice):
+            return [self[i] for i in range(len(self))[idx]]
+        start = range(len(self))[idx] * 3
+        coords = self.coords
+        return Cell(coords[start], coords[start + 1], coords[start + 2])
+
+
+class HexIndex(Mapping):
+    """
+    Read-only dict (Cell: index) of hexagonal map with cells sorted by
+    coordinates, index is calculated from coordinates: cells of each
+    x make a row, rows follow in order of x
+    """
+
+    def __init__(self, radius: int):
+        self.radius = radius
+        self.rows = array("i")
+        start = 0
+        for x in range(-radius, radius + 1):
+            self.rows.append(start)
+            start += 2 * radius + 1 - abs(x)
+        self.length = start
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self):
+        radius = self.radius
+        for x in range(-radius, radius + 1):
+            for y in range(max(-radius, -x - radius), min(radius, -x + radius) + 1):
+                yield Cell(x, y, -x - y)
+
+    def __getitem__(self, cell: Cell) -> int:
+        radius = self.radius
+        x, y, z = cell.x, cell.y, cell.z
+        if x + y + z != 0 or max(abs(x), abs(y), abs(z)) > radius:
+            raise KeyError(cell)
+        return self.rows[x + radius] + y - max(-radius, -x - radius)
+
+
+class MapTables:
+    """
+    Precomputed read-only tables of GameMap:
+    - cells - list of Cell ordered by index
+    - index - dict (Cell: index)
+    - coords - flat array of cube coordinates, 3 items per cell
+    - neighbours - flat array of neighbour indexes, 6 items per cell
+    - flags - content flags of each cell
+    - rays - flat array of cells on each normal direction, stopped
+      by obstacles and map border, RAY_LENGTH items per direction
+    - base_distance - number of steps from each cell to base
+    """
+
+    def __init__(self, map_: GameMap):
+        self.size = map_.size
+        self.name = map_.name
+        self.cells: list[Cell] = sorted(map_.cells, key=tuple)
+        self.index: dict[Cell, int] = {
+            cell: idx for idx, cell in enumerate(self.cells)
+        }
+        self.coords = array("i", (i for cell in self.cells for i in cell))
+        self.flags = self.build_flags(map_)
+        self.neighbours = self.build_neighbours()
+        self.rays = self.build_rays()
+        self.base_distance = self.bfs_distances(
+            [self.index[cell] for cell in map_.base]
+        )
+
+    @classmethod
+    def from_arrays(
+        cls,
+        map_: GameMap,
+        coords: array,
+        flags: bytearray,
+        neighbours: array,
+        rays: array,
+        base_distance: array,
+        views: bool = False,
+    ) -> "MapTables":
+        """
+        Creates MapTables from previously built tables, used to load
+        tables from cache without building them again
+        :param map_: GameMap obj
+        :param coords: flat array of cube coordinates
+        :param flags: content flags of each cell
+        :param neighbours: flat array of neighbour indexes
+        :param rays: flat array of rays
+        :param base_distance: array of distances to base
+        :param views: if True, cells and index are HexCells and HexIndex
+        calculated from coordinates instead of list and dict
+        :return: MapTables obj
+        """
+        tables = cls.__new__(cls)
+        tables.size = map_.size
+        tables.name = map_.name
+        if views:
+            tables.cells = HexCells(coords)
+            tables.index = HexIndex(map_.size - 1)
+        else:
+            tables.cells = [
+                Cell(coords[i], coords[i + 1], coords[i + 2])
+                for i in range(0, len(coords), 3)
+            ]
+            tables.index = {cell: idx for idx, cell in enumerate(tables.cells)}
+        tables.coords = coords
+        tables.flags = flags
+        tables.neighbours = neighbours
+        tables.rays = rays
+        tables.base_distance = base_distance
+        return tables
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def build_flags(self, map_: GameMap) -> bytearray:
+        """
+        Creates content flags of each cell
+        :param map_: GameMap obj
+        :return: bytearray of flags
+        """
+        flags = bytearray(len(self.cells))
+        for flag, content in (
+            (OBSTACLE, map_.obstacles),
+            (BASE, map_.base),
+            (LIGHT_REPAIR, map_.light_repairs),
+            (HARD_REPAIR, map_.hard_repairs),
+            (CATAPULT, map_.catapults),
+            (SPAWN, map_.spawn_points),
+        ):
+            for cell in content:
+                flags[self.index[cell]] |= flag
+        return flags
+
+    def build_neighbours(self) -> array:
+        """
+        Creates table of neighbours, NO_CELL is used for cells out of map
+        :return: flat array, 6 items per cell
+        """
+        neighbours = array("i")
+        for cell in self.cells:
+            neighbours.extend(
+                self.index.get(cell.offset(direction), NO_CELL)
+                for direction in DIRECTIONS
+            )
+        return neighbours
+
+    def build_rays(self) -> array:
+        """
+        Creates table of straight lines from each cell in each
+        normal direction, ray is interrupted by obstacle or map border,
+        rest of the ray is filled with NO_CELL
+        :return: flat array, 6 * RAY_LENGTH items per cell
+        """
+        rays = array("i", [NO_CELL]) * (len(self.cells) * 6 * RAY_LENGTH)
+        for idx in range(len(self.cells)):
+            for direction in range(6):
+                start = (idx * 6 + direction) * RAY_LENGTH
+                current = idx
+                for step in range(RAY_LENGTH):
+                    current = self.neighbours[current * 6 + direction]
+                    if current == NO_CELL or self.flags[current] & OBSTACLE:
+                        break
+                    rays[start + step] = current
+        return rays
+
+    def get_neighbours(self, idx: int) -> array:
+        """
+        :param idx: cell index
+        :return: indexes of neighbours, may contain NO_CELL
+        """
+        return self.neighbours[idx * 6 : idx * 6 + 6]
+
+    def get_ray(self, idx: int, direction: int, length: int) -> array:
+        """
+        :param idx: cell index
+        :param direction: index of direction in DIRECTIONS
+        :param length: maximum length of ray
+        :return: indexes of cells on the ray, may contain NO_CELL
+        """
+        start = (idx * 6 + direction) * RAY_LENGTH
+        return self.rays[start : start + length]
+
+    def distance(self, first: int, second: int) -> int:
+        """
+        :param first: cell index
+        :param second: cell index
+        :return: distance between cells
+        """
+        coords = self.coords
+        first *= 3
+        second *= 3
+        return max(
+            abs(coords[first] - coords[second]),
+            abs(coords[first + 1] - coords[second + 1]),
+            abs(coords[first + 2] - coords[second + 2]),
+        )
+
+    def direction_to(self, first: int, second: int) -> int:
+        """
+        :param first: cell index
+        :param second: cell index
+        :return: index of normal direction from first to second cell,
+        or NO_CELL if cells are not on the same line
+        """
+        delta = [
+            self.coords[second * 3 + i] - self.coords[first * 3 + i]
+            for i in range(3)
+        ]
+        length = max(abs(i) for i in delta)
+        if length == 0 or 0 not in delta:
+            return NO_CELL
+        return DIRECTIONS.index(tuple(i // length for i in delta))
+
+    def bfs_distances(self, sources: list[int]) -> array:
+        """
+        Calculates number of steps from the nearest source cell
+        to each cell, paths do not go through obstacles
+        :param sources: list of cell indexes
+        :return: array of distances, NO_CELL for unreachable cells
+        """
+        distances = array("i", [NO_CELL]) * len(self.cells)
+        queue = deque()
+        for source in sources:
+            distances[source] = 0
+            queue.append(source)
+        while queue:
+            cell = queue.popleft()
+            for neighbour in self.get_neighbours(cell):
+                if (
+                    neighbour != NO_CELL
+                    and distances[neighbour] == NO_CELL
+                    and not self.flags[neighbour] & OBSTACLE
+                ):
+                    distances[neighbour] = distances[cell] + 1
+                    queue.append(neighbour)
+        return distances
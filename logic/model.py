@@ -3,13 +3,26 @@ This module contains classes to parse and store game data
 also provided contained minimum of game logic, such as
 rule of neutrality and finding inactive catapults
 """
+import copy
 import dataclasses
+from collections import Counter
+from collections.abc import Mapping
+from functools import cached_property
+from typing import Iterator, Optional
+
+import numpy as np
 
 from config import game_balance as gb_cf
-from config.config import Actions
+from config.config import Actions, CLUSTER_MAP_SIZE
+from logic.attack_index import AttackIndex
 from logic.cell import Cell
+from logic.clusters import ClusterGraph
+from logic.spatial import HexBuckets
+from logic.transposition import zobrist_key
 
 CENTER_POINT = (0, 0, 0)
+VEHICLE_TYPE_NAMES = tuple(gb_cf.MAX_HP)  # vehicle type by its code in columns
+VEHICLE_TYPE_CODES = {name: code for code, name in enumerate(VEHICLE_TYPE_NAMES)}
 
 
 class GameMap:
@@ -29,6 +42,7 @@ class GameMap:
         self.light_repairs = self.parse_content(data["content"], "light_repair")
         self.hard_repairs = self.parse_content(data["content"], "hard_repair")
         self.catapults = self.parse_content(data["content"], "catapult")
+        self.tables = None  # MapTables, kept by shared_tables.get_map_tables
 
     @staticmethod
     def parse_content(content: dict, content_type: str) -> set[Cell]:
@@ -71,11 +85,42 @@ class GameMap:
             self.spawn_points,
         )
 
-    def get_available_cells(self) -> set[Cell]:
+    @cached_property
+    def attack_index(self) -> AttackIndex:
+        """
+        :return: AttackIndex of map, created on the first access
+        """
+        return AttackIndex(self.cells, self.obstacles)
+
+    @cached_property
+    def cluster_graph(self) -> ClusterGraph:
+        """
+        :return: ClusterGraph of available cells, created on the first access
+        """
+        return ClusterGraph(self.get_available_cells())
+
+    def build_cluster_graph(self) -> Optional[ClusterGraph]:
         """
-        :return: set of cells allowed to vehicle move
+        Builds cluster graph before the first turn if vehicles use it on
+        map of this size, on the largest maps it takes more than a second
+        :return: ClusterGraph obj, None if map is too small for it
         """
-        return self.cells.difference(self.obstacles.union(self.spawn_points))
+        if self.size < CLUSTER_MAP_SIZE:
+            return None
+        return self.cluster_graph
+
+    def get_available_cells(self) -> frozenset[Cell]:
+        """
+        :return: set of cells allowed to vehicle move, created once
+        """
+        return self.available_cells
+
+    @cached_property
+    def available_cells(self) -> frozenset[Cell]:
+        """
+        :return: frozenset of cells allowed to vehicle move
+        """
+        return frozenset(self.cells.difference(self.obstacles, self.spawn_points))
 
 
 class GameState:
@@ -83,13 +128,17 @@ class GameState:
     Data class to parse and store dynamic game data from GAME_STATE response
     In part of game logic handle only neutrality rule, and finding inactive
     catapults. Also updates during players turn to avoid move collisions,
-    and shooting units destroyed by previous tank
+    and shooting units destroyed by previous tank.
+    Vehicles are parsed once into VehicleColumns. Spatial index of
+    vehicles keeps rows of columns, TankModel of enemy tank is created
+    from its row only when the tank is looked up
     """
 
     def __init__(self, data: dict, idx: int):
         self.idx = idx
         self.winner = data["winner"]
         self.current_turn = data["current_turn"]
+        self.num_turns = data["num_turns"]
         self.num_players = data["num_players"]
         self.players = [i for i in data["players"] if not i["is_observer"]]
         self.is_finished = data["finished"]
@@ -100,46 +149,65 @@ class GameState:
         self.attack_matrix = data["attack_matrix"]
         self.attack_matrix.pop(str(self.idx))
 
-        self.enemy_tanks: dict[Cell, TankModel] = {}
-        self.our_tanks: dict[int, TankModel] = {}
-        self.parse_tanks(data["vehicles"])
-
-        self.tank_cells = self.parse_tank_cells(data["vehicles"])
-        self.aggressive_tanks = self.parse_aggressive_tanks(data["vehicles"])
+        self.columns = VehicleColumns(data["vehicles"])
         self.inactive_catapults = self.parse_inactive_catapults(data["catapult_usage"])
+        self.catapult_usage = self.parse_catapult_usage(data["catapult_usage"])
+        self.zobrist = self.hash_state()
 
-    def parse_tanks(self, vehicles: dict) -> None:
+    @cached_property
+    def our_tanks(self) -> dict[int, "TankModel"]:
         """
-        Handles parsing of tanks from "vehicles" part of
-        GAME_STATE response, sets enemy and our tanks attributes
-        :param vehicles: dict with vehicles from response
-        :return: None
+        :return: dict (tank_id: TankModel) of our tanks, created from
+        vehicle columns on first use
         """
+        columns = self.columns
+        return {
+            tank.t_id: tank for tank in columns.get_tanks(columns.owner == self.idx)
+        }
 
-        for tank_id, i in vehicles.items():
-            tank_id = int(tank_id)
-            position = Cell(i["position"]["x"], i["position"]["y"], i["position"]["z"])
-            health = i["health"]
-            model = i["vehicle_type"]
-            shoot_range_bonus = i["shoot_range_bonus"]
-            capture_points = i["capture_points"]
-            spawn_point = Cell(
-                i["spawn_position"]["x"],
-                i["spawn_position"]["y"],
-                i["spawn_position"]["z"],
-            )
-            tank = TankModel(
-                health,
-                model,
-                position,
-                shoot_range_bonus,
-                capture_points,
-                spawn_point,
-            )
-            if i["player_id"] == self.idx:
-                self.our_tanks[tank_id] = tank
-            else:
-                self.enemy_tanks[position] = tank
+    @cached_property
+    def enemy_tanks(self) -> "TankView":
+        """
+        :return: mapping (Cell: TankModel) of tanks of other players,
+        TankModel is created from vehicle columns on lookup
+        """
+        owner = self.columns.owner.tolist()
+        rows = {
+            cell: row for cell, row in self.vehicles.items() if owner[row] != self.idx
+        }
+        return TankView(self.columns, rows)
+
+    @cached_property
+    def tank_cells(self) -> set[Cell]:
+        """
+        :return: set of Cell with tanks
+        """
+        return {cell for cell, _ in self.vehicles.items()}
+
+    @cached_property
+    def aggressive_tanks(self) -> dict[Cell, int]:
+        """
+        Tanks of players we allowed to shoot
+        :return: dict (cell: health)
+        """
+        non_neutral = self.get_non_neutral_players()
+        owner = self.columns.owner.tolist()
+        health = self.columns.health.tolist()
+        return {
+            cell: health[row]
+            for cell, row in self.vehicles.items()
+            if owner[row] in non_neutral and health[row] > 0
+        }
+
+    @cached_property
+    def vehicles(self) -> HexBuckets:
+        """
+        :return: spatial index (Cell: row of columns) of all tanks
+        """
+        vehicles = HexBuckets()
+        for row, cell in enumerate(self.columns.get_cells()):
+            vehicles.add(cell, row)
+        return vehicles
 
     def get_ordered_tanks(self) -> list[tuple[int, "TankModel"]]:
         """
@@ -154,32 +222,6 @@ class GameState:
             key=lambda x: gb_cf.TURN_ORDER[x[1].vehicle_type],
         )
 
-    @staticmethod
-    def parse_tank_cells(vehicles: dict) -> set[Cell]:
-        """
-        Handle parsing of tank cells from "vehicles" part of GAME_STATE response
-        :param vehicles: dict with "vehicles" part of GAME_STATE response
-        :return: set of tank Cell
-        """
-        return {
-            Cell(i["position"]["x"], i["position"]["y"], i["position"]["z"])
-            for i in vehicles.values()
-        }
-
-    def parse_aggressive_tanks(self, vehicles: dict) -> dict[Cell, int]:
-        """
-        Parses tanks we allowed of players we allowed to shoot
-        :param vehicles: dict with "vehicles" part of GAME_STATE response
-        :return: dict (cell: health)
-        """
-        aggressive_tanks = {}
-        for i in vehicles.values():
-            if i["player_id"] in self.get_non_neutral_players():
-                position = (i["position"]["x"], i["position"]["y"], i["position"]["z"])
-                health = i["health"]
-                aggressive_tanks[Cell(*position)] = health
-        return aggressive_tanks
-
     def get_our_tank_id(self, cell) -> int:
         """
         Returns id of our tank in given cell
@@ -224,13 +266,58 @@ class GameState:
             )
             position = Cell(*cell)
             if action == Actions.SHOOT:
+                # views are created from columns, so they are changed
+                # before columns to not count the shot twice
+                enemy = self.enemy_tanks[position]
+                self.zobrist ^= enemy.zobrist()
+                enemy.health -= gb_cf.DAMAGE[vehicle_type]
+                self.zobrist ^= enemy.zobrist()
                 self.aggressive_tanks[position] -= gb_cf.DAMAGE[vehicle_type]
                 if self.aggressive_tanks[position] <= 0:
                     self.aggressive_tanks.pop(position)
+                self.columns.update(enemy)
             else:
-                self.tank_cells.remove(self.our_tanks[vehicle_id].coordinates)
+                tank = self.our_tanks[vehicle_id]
+                self.zobrist ^= tank.zobrist()
+                self.tank_cells.remove(tank.coordinates)
                 self.tank_cells.add(position)
-                self.our_tanks[vehicle_id].coordinates = position
+                self.vehicles.move(tank.coordinates, position)
+                tank.coordinates = position
+                self.zobrist ^= tank.zobrist()
+                self.columns.update(tank)
+
+    def get_vehicles_within(
+        self,
+        cell: Cell,
+        radius: int,
+        player_id: Optional[int] = None,
+        enemy: bool = False,
+        aggressive: bool = False,
+    ) -> list["TankModel"]:
+        """
+        Finds tanks in given distance from cell using spatial index,
+        time is proportional to number of tanks near the cell
+        :param cell: center of search
+        :param radius: maximum distance from cell
+        :param player_id: if given, only tanks of this player are returned
+        :param enemy: if True, only tanks of other players are returned
+        :param aggressive: if True, only tanks we may shoot are returned
+        :return: list of TankModel
+        """
+        columns = self.columns
+        tanks = []
+        for tank_cell, row in self.vehicles.within(cell, radius):
+            owner = int(columns.owner[row])
+            if (
+                (player_id is None or owner == player_id)
+                and not (enemy and owner == self.idx)
+                and not (aggressive and tank_cell not in self.aggressive_tanks)
+            ):
+                if owner == self.idx:
+                    tanks.append(self.our_tanks[int(columns.ids[row])])
+                else:
+                    tanks.append(self.enemy_tanks[tank_cell])
+        return tanks
 
     def get_aggressive_cells(self) -> set[Cell]:
         """
@@ -263,11 +350,53 @@ class GameState:
             i for i in list_usage if list_usage.count(i) == gb_cf.MAX_CATAPULT_USAGE
         }
 
+    @staticmethod
+    def parse_catapult_usage(catapult_usage: list) -> Counter[Cell]:
+        """
+        Parse number of usages of each catapult
+        :param catapult_usage: "catapult_usage" part of GAME_STATE response
+        :return: Counter (cell: usages)
+        """
+        return Counter(Cell(i["x"], i["y"], i["z"]) for i in catapult_usage)
+
+    def hash_state(self) -> int:
+        """
+        Calculates Zobrist hash of vehicles and catapult usage,
+        hash is updated incrementally by update_data
+        :return: int hash
+        """
+        result = self.columns.get_zobrist()
+        for cell, count in self.catapult_usage.items():
+            result ^= zobrist_key("catapult", *cell, count)
+        return result
+
+    def get_decision_key(self) -> tuple:
+        """
+        Returns key of situation used to cache vehicle decisions,
+        it includes neutrality state and capture points that are not
+        covered by zobrist hash: our total capture points and cells of
+        tanks we may shoot that have capture points
+        :return: tuple key
+        """
+        non_neutral = frozenset(self.get_non_neutral_players())
+        columns = self.columns
+        capturing = np.isin(columns.owner, list(non_neutral)) & (
+            columns.capture_points > 0
+        )
+        return (
+            self.zobrist,
+            self.idx,
+            non_neutral,
+            self.get_total_cp(),
+            frozenset(columns.get_cells(capturing)),
+        )
+
     def get_total_cp(self) -> int:
         """
         :return: total amount of our capture points
         """
-        return sum(i.capture_points for i in self.our_tanks.values())
+        columns = self.columns
+        return int(columns.capture_points[columns.owner == self.idx].sum())
 
     def is_last_round(self) -> bool:
         """
@@ -292,6 +421,199 @@ class GameActions:
         self.data = data
 
 
+class VehicleColumns:
+    """
+    Struct of arrays with vehicles from "vehicles" part of GAME_STATE
+    response, parsed in one pass. Row of each array is one vehicle in order
+    of response, views of vehicles select rows by NumPy masks. Arrays are
+    columns of one table, so rows of vehicles are read at once
+    """
+
+    FIELDS = (
+        "ids",
+        "owner",
+        "type_code",  # index in VEHICLE_TYPE_NAMES
+        "x",
+        "y",
+        "z",
+        "health",
+        "capture_points",
+        "range_bonus",
+        "spawn_x",
+        "spawn_y",
+        "spawn_z",
+    )
+
+    def __init__(self, vehicles: dict):
+        """
+        :param vehicles: dict with "vehicles" part of GAME_STATE response
+        """
+        codes = VEHICLE_TYPE_CODES
+        values = []
+        for tank_id, i in vehicles.items():
+            position, spawn = i["position"], i["spawn_position"]
+            values += (
+                int(tank_id),
+                i["player_id"],
+                codes[i["vehicle_type"]],
+                position["x"],
+                position["y"],
+                position["z"],
+                i["health"],
+                i["capture_points"],
+                i["shoot_range_bonus"],
+                spawn["x"],
+                spawn["y"],
+                spawn["z"],
+            )
+        self.set_table(
+            np.array(values, dtype=np.intc).reshape(-1, len(self.FIELDS))
+        )
+        self.rows = {t_id: row for row, t_id in enumerate(self.ids.tolist())}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def set_table(self, table: np.ndarray) -> None:
+        """
+        Sets table of vehicles, arrays of FIELDS are views of its columns
+        :param table: int array, row per vehicle and column per field
+        :return: None
+        """
+        self.table = table
+        (
+            self.ids,
+            self.owner,
+            self.type_code,
+            self.x,
+            self.y,
+            self.z,
+            self.health,
+            self.capture_points,
+            self.range_bonus,
+            self.spawn_x,
+            self.spawn_y,
+            self.spawn_z,
+        ) = table.T
+
+    def copy(self) -> "VehicleColumns":
+        """
+        :return: VehicleColumns with copy of table
+        """
+        result = copy.copy(self)
+        result.set_table(self.table.copy())
+        return result
+
+    def get_cells(self, mask: Optional[np.ndarray] = None) -> list[Cell]:
+        """
+        :param mask: bool array of selected rows, all rows by default
+        :return: list of positions of selected vehicles
+        """
+        x, y, z = self.x, self.y, self.z
+        if mask is not None:
+            x, y, z = x[mask], y[mask], z[mask]
+        return list(map(Cell, x.tolist(), y.tolist(), z.tolist()))
+
+    def get_tank(self, row: int) -> "TankModel":
+        """
+        :param row: row of vehicle
+        :return: TankModel of vehicle
+        """
+        return self.get_tanks(slice(row, row + 1))[0]
+
+    def get_tanks(self, mask: np.ndarray) -> list["TankModel"]:
+        """
+        :param mask: bool array or slice of selected rows
+        :return: list of TankModel of selected vehicles
+        """
+        names = VEHICLE_TYPE_NAMES
+        return [
+            TankModel(
+                health,
+                names[code],
+                Cell(x, y, z),
+                bonus,
+                capture_points,
+                Cell(spawn_x, spawn_y, spawn_z),
+                owner,
+                t_id,
+            )
+            for (
+                t_id,
+                owner,
+                code,
+                x,
+                y,
+                z,
+                health,
+                capture_points,
+                bonus,
+                spawn_x,
+                spawn_y,
+                spawn_z,
+            ) in self.table[mask].tolist()
+        ]
+
+    def get_zobrist(self) -> int:
+        """
+        :return: Zobrist hash of all vehicles, equal to xor of
+        TankModel.zobrist of each vehicle
+        """
+        names = VEHICLE_TYPE_NAMES
+        result = 0
+        for code, owner, x, y, z, health, bonus in zip(
+            self.type_code.tolist(),
+            self.owner.tolist(),
+            self.x.tolist(),
+            self.y.tolist(),
+            self.z.tolist(),
+            self.health.tolist(),
+            self.range_bonus.tolist(),
+        ):
+            result ^= zobrist_key("vehicle", names[code], owner, x, y, z, health, bonus)
+        return result
+
+    def update(self, tank: "TankModel") -> None:
+        """
+        Writes position and health of changed tank to its row
+        :param tank: TankModel obj of vehicle
+        :return: None
+        """
+        row = self.rows[tank.t_id]
+        self.x[row], self.y[row], self.z[row] = tank.coordinates
+        self.health[row] = tank.health
+
+
+class TankView(Mapping):
+    """
+    Read-only mapping (Cell: TankModel) of vehicles by rows of
+    VehicleColumns. TankModel of row is created on the first lookup
+    and kept, so its changes made by GameState.update_data are seen
+    by later lookups. Tanks of view should not move
+    """
+
+    def __init__(self, columns: VehicleColumns, rows: dict[Cell, int]):
+        """
+        :param columns: VehicleColumns obj
+        :param rows: dict (Cell: row of columns) of vehicles of view
+        """
+        self.columns = columns
+        self.rows = rows
+        self.tanks: dict[Cell, TankModel] = {}
+
+    def __getitem__(self, cell: Cell) -> "TankModel":
+        tank = self.tanks.get(cell)
+        if tank is None:
+            tank = self.tanks[cell] = self.columns.get_tank(self.rows[cell])
+        return tank
+
+    def __iter__(self) -> Iterator[Cell]:
+        return iter(self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
 @dataclasses.dataclass
 class TankModel:
     """
@@ -304,3 +626,18 @@ class TankModel:
     shoot_range_bonus: int
     capture_points: int
     spawn_point: Cell
+    player_id: Optional[int] = None
+    t_id: Optional[int] = None
+
+    def zobrist(self) -> int:
+        """
+        :return: Zobrist key of tank in its current state
+        """
+        return zobrist_key(
+            "vehicle",
+            self.vehicle_type,
+            self.player_id,
+            *self.coordinates,
+            self.health,
+            self.shoot_range_bonus,
+        )
@@ -0,0 +1,212 @@
+"""
+This module contains ParallelEvaluator - pool of worker processes
+that score candidate joint actions by lookahead rollouts. Each worker
+keeps map precompute loaded once per map name, and receives only
+changes of compact game state every turn
+"""
+import multiprocessing
+import os
+from multiprocessing.connection import Connection as Pipe
+from typing import Optional
+
+from config.config import Actions, SEARCH_DEPTH, SEARCH_WORKERS
+from logic.model import GameMap
+from logic.search import BeamSearch
+from logic.simulator import Simulator
+
+Candidate = list[tuple[Actions, int, int]]
+
+
+def diff_state(old: Optional[dict], new: dict) -> dict:
+    """
+    Creates delta between two states created by Simulator.encode,
+    changed vehicles are stored by their numbers
+    :param old: previous state or None
+    :param new: current state
+    :return: delta dict
+    """
+    if old is None or len(old["vehicles"]) != len(new["vehicles"]):
+        return new
+    delta = {
+        key: value
+        for key, value in new.items()
+        if key != "vehicles" and old[key] != value
+    }
+    delta["changed_vehicles"] = {
+        number: vehicle
+        for number, (vehicle, previous) in enumerate(
+            zip(new["vehicles"], old["vehicles"])
+        )
+        if vehicle != previous
+    }
+    return delta
+
+
+def apply_delta(state: Optional[dict], delta: dict) -> dict:
+    """
+    Applies delta created by diff_state
+    :param state: previous state or None
+    :param delta: delta dict
+    :return: current state
+    """
+    if "changed_vehicles" not in delta:
+        return delta
+    state = dict(state)
+    vehicles = list(state["vehicles"])
+    for number, vehicle in delta["changed_vehicles"].items():
+        vehicles[number] = vehicle
+    state.update(delta)
+    del state["changed_vehicles"]
+    state["vehicles"] = tuple(vehicles)
+    return state
+
+
+def worker_loop(pipe: Pipe, depth: int) -> None:
+    """
+    Worker process main loop, handles messages:
+    ("map", GameMap) - stores map and its precompute,
+    ("state", map name, delta) - updates game state,
+    ("score", candidates, player id) - replies with list of scores,
+    ("stop",) - exits loop
+    :param pipe: worker end of pipe
+    :param depth: number of opponent turns in rollouts
+    :return: None
+    """
+    engine = BeamSearch(depth=depth)
+    maps: dict[str, GameMap] = {}
+    states: dict[str, dict] = {}
+    root: Optional[Simulator] = None
+    distances = None
+    while True:
+        message = pipe.recv()
+        if message[0] == "map":
+            map_ = message[1]
+            maps[map_.name] = map_
+            engine.get_tables(map_)
+        elif message[0] == "state":
+            _, name, delta = message
+            states[name] = apply_delta(states.get(name), delta)
+            root = Simulator.decode(maps[name], states[name], engine.tables[name])
+            distances = engine.base_distance[name]
+        elif message[0] == "score":
+            _, candidates, idx = message
+            scores = []
+            for candidate in candidates:
+                sim = root.fork()
+                for action in candidate:
+                    sim.act(*action)
+                scores.append(engine.look_ahead(sim, idx, distances))
+            pipe.send(scores)
+        else:
+            break
+
+
+class ParallelEvaluator:
+    """
+    Scores candidate joint actions in worker processes, candidates
+    are split between workers in equal chunks. Map is sent to worker
+    once per map name, game state is sent as delta from previous state
+    """
+
+    def __init__(self, processes: Optional[int] = None, depth: int = SEARCH_DEPTH):
+        self.processes = processes or os.cpu_count()
+        self.depth = depth
+        self.pipes: list[Pipe] = []
+        self.workers: list[multiprocessing.Process] = []
+        self.maps: set[str] = set()
+        self.states: dict[str, dict] = {}
+
+    def __enter__(self) -> "ParallelEvaluator":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """
+        Starts worker processes
+        :return: None
+        """
+        for _ in range(self.processes):
+            parent_end, worker_end = multiprocessing.Pipe()
+            worker = multiprocessing.Process(
+                target=worker_loop, args=(worker_end, self.depth), daemon=True
+            )
+            worker.start()
+            self.pipes.append(parent_end)
+            self.workers.append(worker)
+
+    def close(self) -> None:
+        """
+        Stops worker processes
+        :return: None
+        """
+        for pipe in self.pipes:
+            pipe.send(("stop",))
+        for worker in self.workers:
+            worker.join()
+        self.pipes = []
+        self.workers = []
+        self.maps = set()
+        self.states = {}
+
+    def broadcast(self, message: tuple) -> None:
+        """
+        Sends message to every worker
+        :param message: tuple message
+        :return: None
+        """
+        for pipe in self.pipes:
+            pipe.send(message)
+
+    def sync(self, root: Simulator) -> None:
+        """
+        Sends map if workers do not have it yet, and state delta
+        :param root: Simulator obj in current game state
+        :return: None
+        """
+        name = root.map.name
+        if name not in self.maps:
+            self.broadcast(("map", root.map))
+            self.maps.add(name)
+        state = root.encode()
+        self.broadcast(("state", name, diff_state(self.states.get(name), state)))
+        self.states[name] = state
+
+    def score(
+        self, root: Simulator, candidates: list[Candidate], idx: int
+    ) -> list[float]:
+        """
+        Scores candidates by lookahead rollouts in worker processes
+        :param root: Simulator obj in current game state
+        :param candidates: list of joint actions (command, vehicle, cell)
+        :param idx: our player id
+        :return: list of scores in order of candidates
+        """
+        if not self.pipes:
+            self.start()
+        self.sync(root)
+        chunk = -(-len(candidates) // len(self.pipes))
+        busy = []
+        for number, pipe in enumerate(self.pipes):
+            part = candidates[number * chunk : (number + 1) * chunk]
+            if part:
+                pipe.send(("score", part, idx))
+                busy.append(pipe)
+        scores = []
+        for pipe in busy:
+            scores.extend(pipe.recv())
+        return scores
+
+
+def create_search(workers: int = SEARCH_WORKERS) -> BeamSearch:
+    """
+    Creates lookahead search engine of the bot
+    :param workers: number of worker processes for rollouts,
+    rollouts are played in the calling thread if 0
+    :return: BeamSearch obj, ParallelEvaluator of engine starts
+    workers on the first turn
+    """
+    evaluator = ParallelEvaluator(workers) if workers else None
+    return BeamSearch(evaluator=evaluator)
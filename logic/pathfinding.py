@@ -0,0 +1,305 @@
+"""
+This module contains pathfinding on sets of map cells used by vehicles:
+cells reachable in one turn, search of the nearest cell of a set and
+incremental path repair between turns
+"""
+import heapq
+from collections import deque
+from itertools import count
+from typing import Optional
+
+from logic.cell import Cell
+
+INFINITY = float("inf")
+
+
+def build_path(previous: dict[Cell, Optional[Cell]], cell: Cell) -> list[Cell]:
+    """
+    :param previous: dict (cell: previous cell on path), None for start
+    :param cell: last cell of path
+    :return: list with path Cell excluding start
+    """
+    path = []
+    while previous[cell] is not None:
+        path.append(cell)
+        cell = previous[cell]
+    return path[::-1]
+
+
+def find_nearest(
+    start: Cell, passable: set[Cell], goals: set[Cell]
+) -> tuple[Optional[Cell], list[Cell]]:
+    """
+    A* search from start toward all goals at once, estimate of cell is
+    distance to the closest goal. Every move costs one speed point and
+    estimate never exceeds path length, so the first goal taken from the
+    queue is the nearest by path
+    :param start: start cell
+    :param passable: set of cells path may go through
+    :param goals: set of goal cells, goals out of passable are not reached
+    :return: tuple (nearest goal, path to it excluding start),
+    (None, []) if no goal is reachable
+    """
+    if start in goals:
+        return start, []
+    targets = [tuple(goal) for goal in goals if goal in passable]
+    if not targets:
+        return None, []
+
+    def estimate(cell: Cell) -> int:
+        x, y, z = cell.x, cell.y, cell.z
+        return min(
+            max(abs(x - t_x), abs(y - t_y), abs(z - t_z)) for t_x, t_y, t_z in targets
+        )
+
+    previous: dict[Cell, Optional[Cell]] = {start: None}
+    steps = {start: 0}
+    order = count()
+    queue = [(estimate(start), 0, next(order), start)]
+    while queue:
+        _, depth, _, cell = heapq.heappop(queue)
+        if cell in goals:
+            return cell, build_path(previous, cell)
+        if -depth > steps[cell]:
+            continue
+        next_steps = steps[cell] + 1
+        for neighbour in cell.neighbours():
+            known = steps.get(neighbour)
+            if neighbour in passable and (known is None or next_steps < known):
+                previous[neighbour] = cell
+                steps[neighbour] = next_steps
+                # deeper cells go first among cells with equal estimate
+                item = (next_steps + estimate(neighbour), -next_steps, next(order))
+                heapq.heappush(queue, (*item, neighbour))
+    return None, []
+
+
+class Reachability:
+    """
+    Cells reachable by vehicle in one turn, found by breadth-first search
+    bounded by speed points. Vehicle moves only through passable cells,
+    it can pass blocked cells (occupied by other tanks) but can not stop
+    on them. Predecessors of visited cells give the shortest path to any
+    reachable cell
+    """
+
+    def __init__(
+        self, start: Cell, speed: int, passable: set[Cell], blocked: set[Cell]
+    ):
+        """
+        :param start: position of vehicle
+        :param speed: speed points of vehicle
+        :param passable: set of cells vehicle may move through
+        :param blocked: set of cells vehicle may not stop on
+        """
+        self.start = start
+        self.previous: dict[Cell, Optional[Cell]] = {start: None}
+        self.distance: dict[Cell, int] = {start: 0}
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            steps = self.distance[cell] + 1
+            if steps > speed:
+                continue
+            for neighbour in cell.neighbours():
+                if neighbour in self.previous or neighbour not in passable:
+                    continue
+                self.previous[neighbour] = cell
+                self.distance[neighbour] = steps
+                queue.append(neighbour)
+        self.cells = {
+            cell for cell in self.previous if cell != start and cell not in blocked
+        }
+
+    def __contains__(self, cell: Cell) -> bool:
+        return cell in self.cells
+
+    def get_path(self, cell: Cell) -> list[Cell]:
+        """
+        :param cell: visited cell
+        :return: list with path Cell excluding start, as Cell.a_star
+        """
+        return build_path(self.previous, cell)
+
+    def nearest(self, target: Cell, cells: Optional[set[Cell]] = None) -> Cell:
+        """
+        :param target: any cell
+        :param cells: set of cells to choose from, reachable cells by default
+        :return: reachable cell closest to target, None if there are no cells
+        """
+        if cells is None:
+            cells = self.cells
+        else:
+            cells = self.cells.intersection(cells)
+        return min(cells, key=target.cube_distance, default=None)
+
+
+class DStarLite:
+    """
+    Incremental shortest path search toward fixed goal (D* Lite). Search
+    goes backward from goal, so when vehicle moves or a few cells become
+    blocked or free, only affected part of the search is repaired. Full
+    search is needed only for a new goal. Path goes through passable
+    cells that are not blocked, every move costs one speed point
+    """
+
+    def __init__(self, goal: Cell, passable: set[Cell]):
+        """
+        :param goal: target cell
+        :param passable: set of cells path may go through, it must not change
+        """
+        self.goal = goal
+        self.passable = passable
+        self.blocked: set[Cell] = set()
+        self.start: Optional[Cell] = None
+        self.last: Optional[Cell] = None
+        self.km = 0
+        self.g: dict[Cell, float] = {}
+        self.rhs: dict[Cell, float] = {goal: 0}
+        self.queue: list[tuple[tuple[float, float], int, Cell]] = []
+        self.queued: dict[Cell, tuple[float, float]] = {}
+        self.order = count()
+        self.adjacent: dict[Cell, tuple[Cell, ...]] = {}
+        # neighbours of start that is out of passable cells, e.g. spawn point
+        self.start_adjacent: set[Cell] = set()
+        self.expanded = 0
+
+    def get_adjacent(self, cell: Cell) -> tuple[Cell, ...]:
+        """
+        :param cell: any cell
+        :return: tuple of passable neighbours of cell, created once per cell
+        """
+        adjacent = self.adjacent.get(cell)
+        if adjacent is None:
+            adjacent = self.adjacent[cell] = tuple(
+                self.passable.intersection(cell.neighbours())
+            )
+        return adjacent
+
+    def get_key(self, cell: Cell) -> tuple[float, float]:
+        """
+        :param cell: any cell
+        :return: priority of cell in queue
+        """
+        value = min(self.g.get(cell, INFINITY), self.rhs.get(cell, INFINITY))
+        start = self.start
+        distance = max(
+            abs(cell.x - start.x), abs(cell.y - start.y), abs(cell.z - start.z)
+        )
+        return value + distance + self.km, value
+
+    def update_cell(self, cell: Cell) -> None:
+        """
+        Recalculates distance of cell by its neighbours
+        and puts cell in queue if it is inconsistent
+        :param cell: any cell
+        :return: None
+        """
+        if cell != self.goal:
+            g, blocked = self.g, self.blocked
+            rhs = INFINITY
+            for neighbour in self.get_adjacent(cell):
+                if neighbour not in blocked:
+                    rhs = min(rhs, g.get(neighbour, INFINITY) + 1)
+            self.rhs[cell] = rhs
+        self.queued.pop(cell, None)
+        if self.g.get(cell, INFINITY) != self.rhs[cell]:
+            key = self.queued[cell] = self.get_key(cell)
+            heapq.heappush(self.queue, (key, next(self.order), cell))
+
+    def update_predecessors(self, cell: Cell) -> None:
+        """
+        Updates cells that can move to given cell
+        :param cell: any cell
+        :return: None
+        """
+        for neighbour in self.get_adjacent(cell):
+            self.update_cell(neighbour)
+        if self.start_adjacent and cell in self.start_adjacent:
+            self.update_cell(self.start)
+
+    def compute(self) -> None:
+        """
+        Expands inconsistent cells until distance of start is known
+        :return: None
+        """
+        start = self.start
+        while self.queue:
+            key, _, cell = self.queue[0]
+            if self.queued.get(cell) != key:
+                heapq.heappop(self.queue)
+                continue
+            if key >= self.get_key(start) and self.rhs.get(
+                start, INFINITY
+            ) == self.g.get(start, INFINITY):
+                break
+            heapq.heappop(self.queue)
+            self.expanded += 1
+            new_key = self.get_key(cell)
+            if key < new_key:
+                self.queued[cell] = new_key
+                heapq.heappush(self.queue, (new_key, next(self.order), cell))
+            elif self.g.get(cell, INFINITY) > self.rhs[cell]:
+                del self.queued[cell]
+                self.g[cell] = self.rhs[cell]
+                self.update_predecessors(cell)
+            else:
+                self.g[cell] = INFINITY
+                self.update_cell(cell)
+                self.update_predecessors(cell)
+
+    def update(self, start: Cell, blocked: set[Cell]) -> None:
+        """
+        Moves start and changes blocked cells, then repairs search
+        :param start: current position of vehicle
+        :param blocked: set of cells path may not go through
+        :return: None
+        """
+        if self.start is None:
+            self.start = self.last = start
+            self.update_cell(self.goal)
+        self.start = start
+        self.km += self.last.cube_distance(start)
+        self.last = start
+        changed = self.blocked.symmetric_difference(blocked)
+        self.blocked = set(blocked)
+        for cell in changed:
+            self.update_predecessors(cell)
+        if start in self.passable:
+            self.start_adjacent = set()
+        else:
+            self.start_adjacent = start.neighbours()
+            self.update_cell(start)
+        if not self.is_enclosed(start):
+            self.compute()
+
+    def is_enclosed(self, cell: Cell) -> bool:
+        """
+        Checks if path can not leave cell, search is not done in this
+        case as it would visit all cells connected to goal
+        :param cell: any cell
+        :return: bool
+        """
+        return cell != self.goal and all(
+            neighbour in self.blocked for neighbour in self.get_adjacent(cell)
+        )
+
+    def get_path(self, length: Optional[int] = None) -> Optional[list[Cell]]:
+        """
+        :param length: maximum number of cells, whole path by default
+        :return: list with path Cell from start to goal excluding start,
+        as Cell.a_star, None if goal is not reachable
+        """
+        cell = self.start
+        if self.is_enclosed(cell) or (
+            self.g.get(cell, INFINITY) == INFINITY and cell != self.goal
+        ):
+            return None
+        path = []
+        while cell != self.goal and len(path) != length:
+            cell = min(
+                (i for i in self.get_adjacent(cell) if i not in self.blocked),
+                key=lambda i: self.g.get(i, INFINITY),
+            )
+            path.append(cell)
+        return path
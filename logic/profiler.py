@@ -0,0 +1,205 @@
+"""
+This module contains TurnProfiler that collects latency of turn phases
+into HDR-style histograms. Histogram keeps counts in log-linear buckets,
+so recording is O(1) and memory does not depend on number of values
+"""
+import json
+import time
+from typing import Callable, Optional
+
+SUB_BUCKET_BITS = 5  # relative error of values is not greater than 1/16
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+HALF_SUB_BUCKETS = SUB_BUCKETS // 2
+MAX_VALUE_BITS = 40  # about 12 days in microseconds
+
+
+class Histogram:
+    """
+    Histogram of integer values, e.g. microseconds or bytes. Values less
+    than SUB_BUCKETS are counted exactly, bigger values are counted in
+    HALF_SUB_BUCKETS buckets per power of two
+    """
+
+    def __init__(self):
+        self.counts = [0] * (
+            SUB_BUCKETS + (MAX_VALUE_BITS - SUB_BUCKET_BITS) * HALF_SUB_BUCKETS
+        )
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max = 0
+
+    @staticmethod
+    def get_index(value: int) -> int:
+        """
+        :param value: non-negative int value
+        :return: index of value bucket
+        """
+        if value < SUB_BUCKETS:
+            return value
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        sub_bucket = (value >> shift) - HALF_SUB_BUCKETS
+        return SUB_BUCKETS + (shift - 1) * HALF_SUB_BUCKETS + sub_bucket
+
+    @staticmethod
+    def get_value(index: int) -> int:
+        """
+        :param index: index of bucket
+        :return: the lowest value of bucket
+        """
+        if index < SUB_BUCKETS:
+            return index
+        shift, sub_bucket = divmod(index - SUB_BUCKETS, HALF_SUB_BUCKETS)
+        return (sub_bucket + HALF_SUB_BUCKETS) << (shift + 1)
+
+    def record(self, value: int) -> None:
+        """
+        :param value: non-negative int value
+        :return: None
+        """
+        value = min(max(value, 0), (1 << MAX_VALUE_BITS) - 1)
+        self.counts[self.get_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, rank: float) -> int:
+        """
+        :param rank: percentile rank from 0 to 100
+        :return: the highest value of percentile bucket, 0 for empty histogram
+        """
+        if not self.count:
+            return 0
+        target = max(1, round(self.count * rank / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return max(min(self.get_value(index + 1) - 1, self.max), self.min)
+        return self.max
+
+    def merge(self, other: "Histogram") -> None:
+        """
+        Adds values of other histogram
+        :param other: Histogram obj
+        :return: None
+        """
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> dict:
+        """
+        :return: dict with statistic and not empty buckets
+        """
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0,
+            "min": self.min or 0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+            "buckets": {
+                self.get_value(index): count
+                for index, count in enumerate(self.counts)
+                if count
+            },
+        }
+
+
+class TurnProfiler:
+    """
+    Collects durations of named phases into histograms, phases
+    are recorded in order of their first appearance
+    """
+
+    def __init__(self):
+        self.histograms: dict[str, Histogram] = {}
+        self.started = time.time()
+
+    def record(self, phase: str, start: float) -> None:
+        """
+        Records duration of phase from start till now
+        :param phase: name of phase
+        :param start: time.perf_counter value at the beginning of phase
+        :return: None
+        """
+        histogram = self.histograms.get(phase)
+        if histogram is None:
+            histogram = self.histograms[phase] = Histogram()
+        histogram.record(int((time.perf_counter() - start) * 1_000_000))
+
+    def wrap(self, phase: str, function: Callable) -> Callable:
+        """
+        Creates timed wrapper of function
+        :param phase: name of phase
+        :param function: any callable
+        :return: callable that records duration of every call
+        """
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(phase, start)
+
+        return timed
+
+    def instrument(self, obj: object, methods: tuple[str, ...], prefix: str) -> None:
+        """
+        Replaces methods of object by timed wrappers, phase of
+        method is "prefix.method"
+        :param obj: any obj
+        :param methods: names of methods
+        :param prefix: prefix of phase names
+        :return: None
+        """
+        for name in methods:
+            setattr(obj, name, self.wrap(f"{prefix}.{name}", getattr(obj, name)))
+
+    def summary(self) -> str:
+        """
+        :return: table of phases with count and percentiles in ms
+        """
+        lines = [
+            f"{'phase':<34}{'count':>7}{'p50 ms':>9}{'p90 ms':>9}"
+            f"{'p99 ms':>9}{'max ms':>9}"
+        ]
+        for phase, histogram in self.histograms.items():
+            lines.append(
+                f"{phase:<34}{histogram.count:>7}"
+                f"{histogram.percentile(50) / 1000:>9.2f}"
+                f"{histogram.percentile(90) / 1000:>9.2f}"
+                f"{histogram.percentile(99) / 1000:>9.2f}"
+                f"{histogram.max / 1000:>9.2f}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path: str) -> None:
+        """
+        Writes histograms in json file, values are in microseconds
+        :param path: path to file
+        :return: None
+        """
+        with open(path, "w") as file:
+            json.dump(
+                {
+                    "started": self.started,
+                    "finished": time.time(),
+                    "phases": {
+                        phase: histogram.to_dict()
+                        for phase, histogram in self.histograms.items()
+                    },
+                },
+                file,
+                indent=2,
+            )
@@ -0,0 +1,268 @@
+"""
+This module contains BeamSearch strategy engine, alternative to
+turn-by-turn vehicle strategies. It searches joint actions of our
+vehicles in Simulator and looks ahead on opponents turns
+"""
+import heapq
+import time
+from array import array
+from operator import itemgetter
+from typing import Optional
+
+from config import config as cf
+from config import game_balance as gb_cf
+from config.config import Actions
+from logic.map_tables import MapTables, NO_CELL, LIGHT_REPAIR, HARD_REPAIR, CATAPULT
+from logic.model import GameMap, GameState
+from logic.shared_tables import get_map_tables
+from logic.simulator import Simulator
+from logic.transposition import TranspositionTable
+from logic.vehicle import Vehicle
+
+WIN_SCORE = 1000.0
+CAPTURE_WEIGHT = 10.0
+KILL_WEIGHT = 2.0
+HEALTH_WEIGHT = 3.0
+RANGE_BONUS_WEIGHT = 1.0
+BASE_DISTANCE_WEIGHT = 0.5
+
+Node = tuple[float, Simulator, list[tuple[Actions, int, int]]]
+
+
+class BeamSearch:
+    """
+    Strategy engine that keeps beam of best joint actions while our
+    vehicles act one by one, then compares beam nodes by greedy
+    rollout of opponents turns. Search is limited by time budget,
+    plans are cached by decision key of game state, it covers capture
+    points that are not in game state hash. If ParallelEvaluator is given,
+    rollouts of beam nodes are played in its worker processes
+    """
+
+    def __init__(
+        self,
+        beam_width: int = cf.SEARCH_BEAM_WIDTH,
+        move_candidates: int = cf.SEARCH_MOVE_CANDIDATES,
+        depth: int = cf.SEARCH_DEPTH,
+        time_budget: float = cf.SEARCH_TIME_BUDGET,
+        evaluator=None,
+    ):
+        self.beam_width = beam_width
+        self.move_candidates = move_candidates
+        self.depth = depth
+        self.time_budget = time_budget
+        self.evaluator = evaluator
+        self.results = TranspositionTable(cf.TRANSPOSITION_TABLE_SIZE)
+        self.tables: dict[str, MapTables] = {}
+        self.base_distance: dict[str, array] = {}
+
+    def get_tables(self, map_: GameMap) -> MapTables:
+        """
+        Returns MapTables of map, tables of map are taken once per map name
+        :param map_: GameMap obj
+        :return: MapTables obj
+        """
+        if map_.name not in self.tables:
+            tables = get_map_tables(map_)
+            self.tables[map_.name] = tables
+            self.base_distance[map_.name] = tables.base_distance
+        return self.tables[map_.name]
+
+    def plan(
+        self, state: GameState, map_: GameMap, vehicles: list[Vehicle]
+    ) -> list[tuple[Actions, dict]]:
+        """
+        Searches the best joint action of our vehicles
+        :param state: GameState obj
+        :param map_: GameMap obj
+        :param vehicles: our vehicles in the order of their turn
+        :return: list of MOVE and SHOOT actions
+        """
+        key = (state.get_decision_key(), map_.name)
+        cached = self.results.get(key)
+        if cached is not None:
+            return cached
+
+        deadline = time.perf_counter() + self.time_budget
+        root = Simulator.from_game_state(map_, state, self.get_tables(map_))
+        distances = self.base_distance[map_.name]
+        order = [root.id_index[vehicle.t_id] for vehicle in vehicles]
+        beam: list[Node] = [(self.evaluate(root, state.idx, distances), root, [])]
+
+        for number, vehicle in enumerate(order):
+            if time.perf_counter() > deadline:
+                beam = [self.complete(beam[0], order[number:], state.idx, distances)]
+                break
+            expanded = []
+            for score, sim, actions in beam:
+                for command, target in self.candidates(sim, vehicle, distances):
+                    if command is None:
+                        expanded.append((score, sim, actions))
+                        continue
+                    child = sim.fork()
+                    if child.act(command, vehicle, target):
+                        expanded.append(
+                            (
+                                self.evaluate(child, state.idx, distances),
+                                child,
+                                actions + [(command, vehicle, target)],
+                            )
+                        )
+            beam = heapq.nlargest(self.beam_width, expanded, key=itemgetter(0))
+
+        if len(beam) > 1 and time.perf_counter() < deadline:
+            if self.evaluator is not None:
+                scores = self.evaluator.score(
+                    root, [node[2] for node in beam], state.idx
+                )
+                best = beam[scores.index(max(scores))]
+            else:
+                best = max(
+                    beam,
+                    key=lambda node: self.look_ahead(node[1], state.idx, distances),
+                )
+        else:
+            best = beam[0]
+        result = [root.to_action(*action) for action in best[2]]
+        self.results.put(key, result)
+        return result
+
+    def candidates(
+        self, sim: Simulator, vehicle: int, distances: array
+    ) -> list[tuple[Optional[Actions], Optional[int]]]:
+        """
+        Returns actions worth to try for vehicle: all shots, moves closest
+        to base, moves to repairs and catapults, and no action
+        :param sim: Simulator obj
+        :param vehicle: vehicle number
+        :param distances: distances to base
+        :return: list of (command, target cell), command is None for no action
+        """
+        result = [(Actions.SHOOT, cell) for cell in sim.shoot_targets(vehicle)]
+        moves = sim.reachable_cells(vehicle)
+        moves.sort(key=lambda cell: self.base_steps(distances, cell))
+        flags = sim.tables.flags
+        result.extend((Actions.MOVE, cell) for cell in moves[: self.move_candidates])
+        result.extend(
+            (Actions.MOVE, cell)
+            for cell in moves[self.move_candidates :]
+            if flags[cell] & (LIGHT_REPAIR | HARD_REPAIR | CATAPULT)
+        )
+        result.append((None, None))
+        return result
+
+    def complete(
+        self, node: Node, vehicles: list[int], idx: int, distances: array
+    ) -> Node:
+        """
+        Finishes joint action greedily when time budget is exceeded,
+        each vehicle takes the first valid candidate action
+        :param node: beam node
+        :param vehicles: vehicle numbers without action
+        :param idx: our player id
+        :param distances: distances to base
+        :return: beam node
+        """
+        sim = node[1].fork()
+        actions = list(node[2])
+        for vehicle in vehicles:
+            for command, target in self.candidates(sim, vehicle, distances):
+                if command is None:
+                    break
+                if sim.act(command, vehicle, target):
+                    actions.append((command, vehicle, target))
+                    break
+        return self.evaluate(sim, idx, distances), sim, actions
+
+    def look_ahead(self, sim: Simulator, idx: int, distances: array) -> float:
+        """
+        Ends our turn and plays opponents turns by greedy policy
+        :param sim: Simulator obj after our actions
+        :param idx: our player id
+        :param distances: distances to base
+        :return: score of resulting state
+        """
+        rollout = sim.fork()
+        rollout.end_turn()
+        for _ in range(self.depth):
+            if rollout.is_finished:
+                break
+            self.greedy_turn(rollout, distances)
+        return self.evaluate(rollout, idx, distances)
+
+    def greedy_turn(self, sim: Simulator, distances: array) -> None:
+        """
+        Plays turn of current player: vehicle shoots the weakest target
+        in range, otherwise moves closer to base
+        :param sim: Simulator obj
+        :param distances: distances to base
+        :return: None
+        """
+        player = sim.current_player
+        vehicles = sorted(
+            (i for i, owner in enumerate(sim.owner) if owner == player),
+            key=lambda i: gb_cf.TURN_ORDER[sim.vehicle_type[i]],
+        )
+        for vehicle in vehicles:
+            targets = sim.shoot_targets(vehicle)
+            if targets:
+                target = min(
+                    targets,
+                    key=lambda cell: sim.health[sim.occupied[cell]]
+                    if sim.occupied[cell] != NO_CELL
+                    else 0,
+                )
+                sim.act(Actions.SHOOT, vehicle, target)
+                continue
+            moves = sim.reachable_cells(vehicle)
+            if not moves:
+                continue
+            step = min(moves, key=lambda cell: self.base_steps(distances, cell))
+            if self.base_steps(distances, step) < self.base_steps(
+                distances, sim.position[vehicle]
+            ):
+                sim.act(Actions.MOVE, vehicle, step)
+        sim.end_turn()
+
+    @staticmethod
+    def base_steps(distances: array, cell: int) -> int:
+        """
+        :param distances: distances to base
+        :param cell: cell index
+        :return: steps to base, big number for unreachable cells
+        """
+        steps = distances[cell]
+        return len(distances) if steps == NO_CELL else steps
+
+    def evaluate(self, sim: Simulator, idx: int, distances: array) -> float:
+        """
+        Scores state from point of view of given player
+        :param sim: Simulator obj
+        :param idx: player id
+        :param distances: distances to base
+        :return: score, greater is better
+        """
+        if sim.is_finished:
+            if sim.winner is None:
+                return 0.0
+            return WIN_SCORE if sim.winner == idx else -WIN_SCORE
+        score = 0.0
+        enemy_capture = 0
+        enemy_kill = 0
+        for player in sim.players:
+            if player != idx:
+                enemy_capture = max(enemy_capture, sim.get_capture(player))
+                enemy_kill = max(enemy_kill, sim.kill_points[player])
+        score += CAPTURE_WEIGHT * (sim.get_capture(idx) - enemy_capture)
+        score += KILL_WEIGHT * (sim.kill_points[idx] - enemy_kill)
+        for vehicle, owner in enumerate(sim.owner):
+            health = sim.health[vehicle] / gb_cf.MAX_HP[sim.vehicle_type[vehicle]]
+            if owner == idx:
+                score += HEALTH_WEIGHT * health
+                score += RANGE_BONUS_WEIGHT * sim.shoot_range_bonus[vehicle]
+                score -= BASE_DISTANCE_WEIGHT * self.base_steps(
+                    distances, sim.position[vehicle]
+                )
+            else:
+                score -= HEALTH_WEIGHT * health / (len(sim.players) - 1)
+        return score
@@ -0,0 +1,159 @@
+"""
+This module contains SharedMapTables - owner of MapTables published in
+multiprocessing.shared_memory blocks, attach_tables - zero-copy
+read-only view of published tables, and get_map_tables that gives tables
+of map to lookahead search and influence layers. When many bots play the
+same map in separate processes, arrays of MapTables (coordinates,
+neighbours, rays, flags and distances to base) are stored once per host
+instead of once per process. Other structures of map, such as sets of
+GameMap, AttackIndex, ClusterGraph and distance layers of MapLayers, are
+still built by each process
+
+Block is named by content hash of map and has the binary format of
+map_cache files, so any process can find tables of its map by GameMap
+"""
+import atexit
+import os
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional
+
+from config import config as cf
+from logic.map_cache import content_hash, dump_tables, get_tables, read_tables
+from logic.map_tables import MapTables
+from logic.model import GameMap
+
+BLOCK_PREFIX = "wgmt_"
+
+_published_blocks: set[str] = set()
+
+
+def get_block_name(map_: GameMap) -> str:
+    """
+    :param map_: GameMap obj
+    :return: name of shared memory block of map tables
+    """
+    return f"{BLOCK_PREFIX}{content_hash(map_)}"
+
+
+def open_block(name: str) -> shared_memory.SharedMemory:
+    """
+    Opens existing block, attached block is owned by publisher, so it
+    should not be unlinked by resource tracker when this process exits
+    :param name: name of block
+    :return: SharedMemory obj
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    block = shared_memory.SharedMemory(name)
+    if os.name == "posix" and name not in _published_blocks:
+        # SharedMemory has no public way to skip tracking before 3.13,
+        # _name is the name registered in resource tracker
+        resource_tracker.unregister(block._name, "shared_memory")
+    return block
+
+
+def attach_tables(map_: GameMap) -> Optional[MapTables]:
+    """
+    Attaches to shared memory block of map tables, arrays of tables are
+    read-only views of the block, cells and index are calculated from
+    coordinates, so process does not hold its own copy of tables.
+    Block is kept open while tables exist
+    :param map_: GameMap obj
+    :return: MapTables obj, None if tables of map are not published
+    """
+    try:
+        block = open_block(get_block_name(map_))
+    except FileNotFoundError:
+        return None
+    tables = read_tables(block.buf, map_, copy=False)
+    if tables is None:
+        block.close()
+        return None
+    tables.block = block
+    return tables
+
+
+class SharedMapTables:
+    """
+    Publishes MapTables in shared memory, blocks live until close,
+    so publisher should outlive processes that attached to them
+    """
+
+    def __init__(self):
+        self.blocks: dict[str, shared_memory.SharedMemory] = {}
+
+    def __enter__(self) -> "SharedMapTables":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def publish(self, map_: GameMap, tables: MapTables) -> str:
+        """
+        Copies tables to shared memory block, does nothing if tables of
+        the same map are already published
+        :param map_: GameMap obj
+        :param tables: MapTables obj of map
+        :return: name of block
+        """
+        name = get_block_name(map_)
+        if name in self.blocks:
+            return name
+        data = dump_tables(tables)
+        try:
+            block = shared_memory.SharedMemory(name, create=True, size=len(data))
+        except FileExistsError:
+            return name
+        block.buf[: len(data)] = data
+        self.blocks[name] = block
+        _published_blocks.add(name)
+        return name
+
+    def close(self) -> None:
+        """
+        Closes and removes published blocks
+        :return: None
+        """
+        for name, block in self.blocks.items():
+            block.close()
+            block.unlink()
+            _published_blocks.discard(name)
+        self.blocks = {}
+
+
+publisher = SharedMapTables()  # blocks published by bots of this process
+atexit.register(publisher.close)
+
+
+def share_tables(map_: GameMap) -> Optional[MapTables]:
+    """
+    Attaches tables of map published by any bot of the host, or publishes
+    them if there are none yet, so separately launched bots playing
+    the same map keep one copy of MapTables arrays. Blocks of this process
+    are removed at exit, bots that attached to them keep working
+    :param map_: GameMap obj
+    :return: MapTables obj attached from shared memory, None if tables
+    can not be attached
+    """
+    tables = attach_tables(map_)
+    if tables is None:
+        publisher.publish(map_, get_tables(map_, cf.MAP_CACHE_DIR))
+        tables = attach_tables(map_)
+    return tables
+
+
+def get_map_tables(map_: GameMap) -> MapTables:
+    """
+    Returns tables kept by map. On the first call tables are attached
+    from shared memory if they are published by any process of the host,
+    otherwise they are loaded from map cache or built
+    :param map_: GameMap obj
+    :return: MapTables obj
+    """
+    if map_.tables is None:
+        tables = attach_tables(map_)
+        if tables is None:
+            tables = get_tables(map_, cf.MAP_CACHE_DIR)
+        map_.tables = tables
+    return map_.tables
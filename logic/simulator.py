@@ -0,0 +1,760 @@
+"""
+This module contains in-process game simulator, it runs game rules
+on compact mutable state without server, so vehicle strategies
+could be evaluated offline. Each player turn can be undone,
+and state can be forked for rollouts without copying.
+"""
+from collections import deque
+from typing import Optional
+
+from config import game_balance as gb_cf
+from config.config import Actions, TRANSPOSITION_TABLE_SIZE
+from logic.cell import Cell
+from logic.map_tables import (
+    MapTables,
+    NO_CELL,
+    OBSTACLE,
+    BASE,
+    LIGHT_REPAIR,
+    HARD_REPAIR,
+    CATAPULT,
+    SPAWN,
+)
+from logic.model import GameMap, GameState, TankModel
+from logic.transposition import TranspositionTable
+from logic.vehicle import Vehicle
+
+COPY_ON_WRITE = (
+    "position",
+    "health",
+    "capture_points",
+    "shoot_range_bonus",
+    "occupied",
+    "catapult_usage",
+    "kill_points",
+    "attacked",
+)
+
+
+class Simulator:
+    """
+    Implements game rules: movement, shooting including at_spg rays,
+    neutrality, capture points, repairs, catapults and respawns.
+    Vehicle attributes are stored in lists indexed by vehicle number,
+    cells are represented by MapTables indexes. Every change of state
+    is journaled, so step could be reverted by undo. Forked simulators
+    share containers until one of them writes to it.
+    """
+
+    def __init__(
+        self,
+        map_: GameMap,
+        players: list[int],
+        num_turns: int = 45,
+        tables: Optional[MapTables] = None,
+    ):
+        self.map = map_
+        self.tables = MapTables(map_) if tables is None else tables
+        self.num_turns = num_turns
+        self.players = players
+
+        self.vehicle_ids: list[int] = []
+        self.id_index: dict[int, int] = {}
+        self.owner: list[int] = []
+        self.vehicle_type: list[str] = []
+        self.spawn: list[int] = []
+        self.position: list[int] = []
+        self.health: list[int] = []
+        self.capture_points: list[int] = []
+        self.shoot_range_bonus: list[int] = []
+        self.occupied = [NO_CELL] * len(self.tables)
+        self.catapult_usage = [0] * len(self.tables)
+        self.kill_points = {player: 0 for player in self.players}
+        self.attacked = {player: frozenset() for player in self.players}
+
+        self.current_turn = 0
+        self.current_player = self.players[0]
+        self.acted = frozenset()
+        self.winner: Optional[int] = None
+        self.is_finished = False
+
+        self.shared: set[str] = set()
+        self.journal: list[tuple] = []
+        self.steps: list[int] = []
+
+    @classmethod
+    def from_map_data(
+        cls,
+        map_data: dict,
+        num_turns: int = 45,
+        tables: Optional[MapTables] = None,
+    ) -> "Simulator":
+        """
+        Creates new game, vehicles are placed on their spawn points
+        :param map_data: dict in format of GAME_MAP response
+        :param num_turns: number of turns in game
+        :param tables: MapTables obj of this map, created if not given
+        :return: Simulator obj
+        """
+        players = list(range(1, len(map_data["spawn_points"]) + 1))
+        sim = cls(GameMap(map_data), players, num_turns, tables)
+        for player, player_vehicles in zip(players, map_data["spawn_points"]):
+            for vehicle_type, points in player_vehicles.items():
+                for point in points:
+                    cell = sim.tables.index[sim.map_cell(point)]
+                    sim.add_vehicle(
+                        len(sim.owner) + 1, player, vehicle_type, cell, cell
+                    )
+        return sim
+
+    @classmethod
+    def from_game_state(
+        cls, map_: GameMap, state: GameState, tables: Optional[MapTables] = None
+    ) -> "Simulator":
+        """
+        Creates simulator in situation of given game state,
+        enemy vehicles receive negative ids
+        :param map_: GameMap obj
+        :param state: GameState obj
+        :param tables: MapTables obj of this map, created if not given
+        :return: Simulator obj
+        """
+        players = sorted(i["idx"] for i in state.players)
+        sim = cls(map_, players, state.num_turns, tables)
+        index = sim.tables.index
+        tanks = list(state.our_tanks.items()) + [
+            (-number, tank)
+            for number, tank in enumerate(state.enemy_tanks.values(), start=1)
+        ]
+        for t_id, tank in tanks:
+            sim.add_vehicle(
+                t_id,
+                state.idx if t_id > 0 else tank.player_id,
+                tank.vehicle_type,
+                index[tank.spawn_point],
+                index[tank.coordinates],
+                tank,
+            )
+        for player, attacked in state.attack_matrix.items():
+            sim.attacked[int(player)] = frozenset(attacked)
+        for cell, count in state.catapult_usage.items():
+            sim.catapult_usage[index[cell]] = count
+        sim.current_turn = state.current_turn
+        sim.current_player = state.current_player
+        return sim
+
+    @classmethod
+    def decode(
+        cls, map_: GameMap, data: dict, tables: Optional[MapTables] = None
+    ) -> "Simulator":
+        """
+        Creates simulator from compact state created by encode
+        :param map_: GameMap obj
+        :param data: dict created by encode
+        :param tables: MapTables obj of this map, created if not given
+        :return: Simulator obj
+        """
+        sim = cls(map_, list(data["players"]), data["num_turns"], tables)
+        for t_id, owner, vehicle_type, spawn, position, *values in data["vehicles"]:
+            sim.add_vehicle(t_id, owner, vehicle_type, spawn, position)
+            vehicle = sim.id_index[t_id]
+            (
+                sim.health[vehicle],
+                sim.capture_points[vehicle],
+                sim.shoot_range_bonus[vehicle],
+            ) = values
+        sim.kill_points.update(data["kill_points"])
+        sim.attacked.update((i, frozenset(j)) for i, j in data["attacked"])
+        for cell, count in data["catapult_usage"]:
+            sim.catapult_usage[cell] = count
+        sim.current_turn = data["current_turn"]
+        sim.current_player = data["current_player"]
+        sim.winner = data["winner"]
+        sim.is_finished = data["is_finished"]
+        return sim
+
+    def encode(self) -> dict:
+        """
+        Creates compact picklable state, vehicles are
+        stored as tuples in order of vehicle numbers
+        :return: dict
+        """
+        return {
+            "players": tuple(self.players),
+            "num_turns": self.num_turns,
+            "current_turn": self.current_turn,
+            "current_player": self.current_player,
+            "winner": self.winner,
+            "is_finished": self.is_finished,
+            "vehicles": tuple(
+                zip(
+                    self.vehicle_ids,
+                    self.owner,
+                    self.vehicle_type,
+                    self.spawn,
+                    self.position,
+                    self.health,
+                    self.capture_points,
+                    self.shoot_range_bonus,
+                )
+            ),
+            "kill_points": tuple(sorted(self.kill_points.items())),
+            "attacked": tuple(
+                (i, tuple(sorted(j))) for i, j in sorted(self.attacked.items())
+            ),
+            "catapult_usage": tuple(
+                (cell, count)
+                for cell, count in enumerate(self.catapult_usage)
+                if count
+            ),
+        }
+
+    def add_vehicle(
+        self,
+        t_id: int,
+        player: int,
+        vehicle_type: str,
+        spawn: int,
+        position: int,
+        tank: Optional[TankModel] = None,
+    ) -> None:
+        """
+        Places vehicle on the map, vehicle has full health
+        if tank model is not given
+        :param t_id: vehicle id
+        :param player: owner id
+        :param vehicle_type: vehicle type name
+        :param spawn: spawn cell index
+        :param position: current cell index
+        :param tank: TankModel obj with current vehicle state
+        :return: None
+        """
+        self.id_index[t_id] = len(self.owner)
+        self.occupied[position] = len(self.owner)
+        self.vehicle_ids.append(t_id)
+        self.owner.append(player)
+        self.vehicle_type.append(vehicle_type)
+        self.spawn.append(spawn)
+        self.position.append(position)
+        if tank is None:
+            self.health.append(gb_cf.MAX_HP[vehicle_type])
+            self.capture_points.append(0)
+            self.shoot_range_bonus.append(0)
+        else:
+            self.health.append(tank.health)
+            self.capture_points.append(tank.capture_points)
+            self.shoot_range_bonus.append(tank.shoot_range_bonus)
+
+    @staticmethod
+    def map_cell(point: dict) -> Cell:
+        """
+        :param point: dict with x, y, z keys
+        :return: Cell obj
+        """
+        return Cell(point["x"], point["y"], point["z"])
+
+    # <------------------------- journal ---------------------------
+
+    def get_container(self, name: str):
+        """
+        Returns container owned by this simulator, shared
+        container is copied before the first write
+        :param name: attribute name
+        :return: list or dict
+        """
+        if name in self.shared:
+            self.shared.discard(name)
+            self.__dict__[name] = self.__dict__[name].copy()
+        return self.__dict__[name]
+
+    def set(self, name: str, key, value) -> None:
+        """
+        Sets value to container attribute and stores previous value in journal
+        :param name: attribute name of list or dict
+        :param key: index or key
+        :param value: new value
+        :return: None
+        """
+        container = self.get_container(name)
+        self.journal.append((name, key, container[key]))
+        container[key] = value
+
+    def set_attr(self, name: str, value) -> None:
+        """
+        Sets scalar attribute and stores previous value in journal
+        :param name: attribute name
+        :param value: new value
+        :return: None
+        """
+        self.journal.append((None, name, self.__dict__[name]))
+        self.__dict__[name] = value
+
+    def fork(self) -> "Simulator":
+        """
+        Creates copy of simulator, that shares state containers with
+        this simulator until one of them writes to container.
+        Forked simulator has empty journal
+        :return: Simulator obj
+        """
+        child = object.__new__(Simulator)
+        child.__dict__.update(self.__dict__)
+        self.shared = set(COPY_ON_WRITE)
+        child.shared = set(COPY_ON_WRITE)
+        child.journal = []
+        child.steps = []
+        return child
+
+    def step(self, actions: list[tuple[Actions, dict]]) -> None:
+        """
+        Applies actions of current player and ends its turn,
+        may be reverted by undo
+        :param actions: list of MOVE, SHOOT actions
+        :return: None
+        """
+        self.steps.append(len(self.journal))
+        for action in actions:
+            self.apply(action)
+        self.end_turn()
+
+    def undo(self) -> None:
+        """
+        Reverts last step
+        :return: None
+        """
+        mark = self.steps.pop()
+        journal = self.journal
+        while len(journal) > mark:
+            name, key, value = journal.pop()
+            if name is None:
+                self.__dict__[key] = value
+            else:
+                self.get_container(name)[key] = value
+
+    # <-------------------------- rules ----------------------------
+
+    def can_attack(self, player: int, other: int) -> bool:
+        """
+        Neutrality rule: player may attack other player if other
+        attacked him on previous turn, or other was not attacked
+        by third player
+        :param player: attacking player id
+        :param other: attacked player id
+        :return: bool
+        """
+        if player == other:
+            return False
+        if player in self.attacked[other]:
+            return True
+        return not any(
+            other in attacked
+            for third, attacked in self.attacked.items()
+            if third != player and third != other
+        )
+
+    def apply(self, action: tuple[Actions, dict]) -> bool:
+        """
+        Validates and applies action of current player vehicle
+        :param action: MOVE or SHOOT action, as produced by Vehicle
+        :return: True if action is applied
+        """
+        command, data = action
+        vehicle = self.id_index.get(data["vehicle_id"], NO_CELL)
+        target = self.tables.index.get(self.map_cell(data["target"]), NO_CELL)
+        if target == NO_CELL or vehicle == NO_CELL:
+            return False
+        return self.act(command, vehicle, target)
+
+    def act(self, command: Actions, vehicle: int, target: int) -> bool:
+        """
+        Validates and applies action of current player vehicle
+        :param command: Actions.MOVE or Actions.SHOOT
+        :param vehicle: vehicle number
+        :param target: cell index
+        :return: True if action is applied
+        """
+        if (
+            self.owner[vehicle] != self.current_player
+            or vehicle in self.acted
+            or self.is_finished
+        ):
+            return False
+        if command == Actions.MOVE:
+            applied = self.move(vehicle, target)
+        elif command == Actions.SHOOT:
+            applied = self.shoot(vehicle, target)
+        else:
+            return False
+        if applied:
+            self.set_attr("acted", self.acted | {vehicle})
+        return applied
+
+    def to_action(
+        self, command: Actions, vehicle: int, target: int
+    ) -> tuple[Actions, dict]:
+        """
+        :param command: Actions.MOVE or Actions.SHOOT
+        :param vehicle: vehicle number
+        :param target: cell index
+        :return: Python obj action in format produced by Vehicle
+        """
+        return command, {
+            "vehicle_id": self.vehicle_ids[vehicle],
+            "target": self.point(target),
+        }
+
+    def reachable_cells(self, vehicle: int) -> list[int]:
+        """
+        Returns cells where vehicle can move by its speed points,
+        vehicles may pass through other vehicles but not through obstacles,
+        and may not stop on occupied cells and spawn points of other vehicles
+        :param vehicle: vehicle number
+        :return: list of cell indexes
+        """
+        tables = self.tables
+        flags = tables.flags
+        start = self.position[vehicle]
+        speed = gb_cf.SPEED_POINTS[self.vehicle_type[vehicle]]
+        visited = {start}
+        result = []
+        queue = deque([(start, 0)])
+        while queue:
+            cell, steps = queue.popleft()
+            for neighbour in tables.get_neighbours(cell):
+                if (
+                    neighbour == NO_CELL
+                    or neighbour in visited
+                    or flags[neighbour] & OBSTACLE
+                ):
+                    continue
+                visited.add(neighbour)
+                if self.occupied[neighbour] == NO_CELL and (
+                    not flags[neighbour] & SPAWN or neighbour == self.spawn[vehicle]
+                ):
+                    result.append(neighbour)
+                if steps + 1 < speed:
+                    queue.append((neighbour, steps + 1))
+        return result
+
+    def is_reachable(self, vehicle: int, target: int) -> bool:
+        """
+        Checks if vehicle can move to target cell
+        :param vehicle: vehicle number
+        :param target: cell index
+        :return: bool
+        """
+        speed = gb_cf.SPEED_POINTS[self.vehicle_type[vehicle]]
+        if self.tables.distance(self.position[vehicle], target) > speed:
+            return False
+        return target in self.reachable_cells(vehicle)
+
+    def shoot_targets(self, vehicle: int) -> list[int]:
+        """
+        Returns cells vehicle may shoot to damage attackable vehicles,
+        for at_spg - one cell in each direction with targets
+        :param vehicle: vehicle number
+        :return: list of cell indexes
+        """
+        tables = self.tables
+        vehicle_type = self.vehicle_type[vehicle]
+        player = self.owner[vehicle]
+        start = self.position[vehicle]
+        min_range = gb_cf.MIN_RANGE[vehicle_type]
+        max_range = gb_cf.MAX_RANGE[vehicle_type] + self.shoot_range_bonus[vehicle]
+        result = []
+        if vehicle_type == "at_spg":
+            for direction in range(6):
+                ray = tables.get_ray(start, direction, max_range)
+                for cell in ray:
+                    if cell == NO_CELL:
+                        break
+                    victim = self.occupied[cell]
+                    if victim != NO_CELL and self.can_attack(
+                        player, self.owner[victim]
+                    ):
+                        result.append(ray[0])
+                        break
+            return result
+        for victim, cell in enumerate(self.position):
+            if min_range < tables.distance(
+                start, cell
+            ) <= max_range and self.can_attack(player, self.owner[victim]):
+                result.append(cell)
+        return result
+
+    def move(self, vehicle: int, target: int) -> bool:
+        """
+        Moves vehicle to empty reachable cell, applies effects of
+        repairs, catapults and leaving base
+        :param vehicle: vehicle number
+        :param target: cell index
+        :return: True if vehicle moved
+        """
+        if not self.is_reachable(vehicle, target):
+            return False
+        flags = self.tables.flags[target]
+        start = self.position[vehicle]
+        vehicle_type = self.vehicle_type[vehicle]
+        self.set("occupied", start, NO_CELL)
+        self.set("occupied", target, vehicle)
+        self.set("position", vehicle, target)
+        if self.tables.flags[start] & BASE and not flags & BASE:
+            self.set("capture_points", vehicle, 0)
+        if (flags & LIGHT_REPAIR and vehicle_type in gb_cf.LIGHT_REPAIR_TYPES) or (
+            flags & HARD_REPAIR and vehicle_type in gb_cf.HARD_REPAIR_TYPES
+        ):
+            self.set("health", vehicle, gb_cf.MAX_HP[vehicle_type])
+        if (
+            flags & CATAPULT
+            and not self.shoot_range_bonus[vehicle]
+            and self.catapult_usage[target] < gb_cf.MAX_CATAPULT_USAGE
+        ):
+            self.set("catapult_usage", target, self.catapult_usage[target] + 1)
+            self.set("shoot_range_bonus", vehicle, gb_cf.CATAPULT_RANGE_BONUS)
+        return True
+
+    def shoot(self, vehicle: int, target: int) -> bool:
+        """
+        Shoots target cell, at_spg damages every attackable vehicle
+        on the ray in direction of target, other vehicles damage
+        single vehicle in target cell
+        :param vehicle: vehicle number
+        :param target: cell index
+        :return: True if shot is valid
+        """
+        tables = self.tables
+        vehicle_type = self.vehicle_type[vehicle]
+        player = self.owner[vehicle]
+        start = self.position[vehicle]
+        max_range = gb_cf.MAX_RANGE[vehicle_type] + self.shoot_range_bonus[vehicle]
+        distance = tables.distance(start, target)
+        if not gb_cf.MIN_RANGE[vehicle_type] < distance <= max_range:
+            return False
+
+        if vehicle_type == "at_spg":
+            direction = tables.direction_to(start, target)
+            if direction == NO_CELL:
+                return False
+            for cell in tables.get_ray(start, direction, max_range):
+                if cell == NO_CELL:
+                    break
+                victim = self.occupied[cell]
+                if victim != NO_CELL and self.can_attack(player, self.owner[victim]):
+                    self.damage(vehicle, victim)
+            return True
+
+        victim = self.occupied[target]
+        if victim == NO_CELL or not self.can_attack(player, self.owner[victim]):
+            return False
+        self.damage(vehicle, victim)
+        return True
+
+    def damage(self, vehicle: int, victim: int) -> None:
+        """
+        Damages victim, destroyed vehicles are respawned
+        :param vehicle: attacking vehicle number
+        :param victim: attacked vehicle number
+        :return: None
+        """
+        player = self.owner[vehicle]
+        other = self.owner[victim]
+        if other not in self.attacked[player]:
+            self.set("attacked", player, self.attacked[player] | {other})
+        health = self.health[victim] - gb_cf.DAMAGE[self.vehicle_type[vehicle]]
+        self.set("capture_points", victim, 0)
+        if health > 0:
+            self.set("health", victim, health)
+            return
+        victim_type = self.vehicle_type[victim]
+        self.set(
+            "kill_points", player, self.kill_points[player] + gb_cf.MAX_HP[victim_type]
+        )
+        self.set("health", victim, gb_cf.MAX_HP[victim_type])
+        self.set("shoot_range_bonus", victim, 0)
+        self.set("occupied", self.position[victim], NO_CELL)
+        self.set("occupied", self.spawn[victim], victim)
+        self.set("position", victim, self.spawn[victim])
+
+    def get_capture(self, player: int) -> int:
+        """
+        :param player: player id
+        :return: total capture points of player vehicles
+        """
+        return sum(
+            points
+            for owner, points in zip(self.owner, self.capture_points)
+            if owner == player
+        )
+
+    def end_turn(self) -> None:
+        """
+        Gives capture points to current player vehicles on base, if base
+        is not occupied by too many players, checks win conditions,
+        passes turn to next player
+        :return: None
+        """
+        flags = self.tables.flags
+        player = self.current_player
+        on_base = [
+            vehicle
+            for vehicle, cell in enumerate(self.position)
+            if flags[cell] & BASE
+        ]
+        if len({self.owner[i] for i in on_base}) <= gb_cf.MAX_PLAYERS_ON_BASE:
+            for vehicle in on_base:
+                if self.owner[vehicle] == player:
+                    self.set(
+                        "capture_points", vehicle, self.capture_points[vehicle] + 1
+                    )
+
+        if self.get_capture(player) >= gb_cf.MAX_CAPTURE_POINTS:
+            self.set_attr("winner", player)
+            self.set_attr("is_finished", True)
+        elif self.current_turn + 1 >= self.num_turns:
+            self.set_attr("winner", self.get_leader())
+            self.set_attr("is_finished", True)
+
+        next_player = self.players[
+            (self.players.index(player) + 1) % len(self.players)
+        ]
+        self.set_attr("current_turn", self.current_turn + 1)
+        self.set_attr("current_player", next_player)
+        self.set_attr("acted", frozenset())
+        self.set("attacked", next_player, frozenset())
+
+    def get_leader(self) -> Optional[int]:
+        """
+        Defines winner at the end of the game by capture points,
+        then by kill points
+        :return: player id or None in case of draw
+        """
+        results = sorted(
+            ((self.get_capture(i), self.kill_points[i], i) for i in self.players),
+            reverse=True,
+        )
+        if len(results) > 1 and results[0][:2] == results[1][:2]:
+            return None
+        return results[0][2]
+
+    # <----------------------- server views --------------------------
+
+    def point(self, cell: int) -> dict:
+        """
+        :param cell: cell index
+        :return: dict with x, y, z keys
+        """
+        x, y, z = self.tables.coords[cell * 3 : cell * 3 + 3]
+        return {"x": x, "y": y, "z": z}
+
+    def state_data(self) -> dict:
+        """
+        Creates dict in format of GAME_STATE response
+        :return: dict
+        """
+        return {
+            "num_players": len(self.players),
+            "num_turns": self.num_turns,
+            "num_rounds": 1,
+            "current_round": 1,
+            "current_turn": self.current_turn,
+            "players": [
+                {"idx": i, "name": f"player_{i}", "is_observer": False}
+                for i in self.players
+            ],
+            "observers": [],
+            "current_player_idx": self.current_player,
+            "finished": self.is_finished,
+            "vehicles": {
+                str(t_id): {
+                    "player_id": self.owner[vehicle],
+                    "vehicle_type": self.vehicle_type[vehicle],
+                    "health": self.health[vehicle],
+                    "spawn_position": self.point(self.spawn[vehicle]),
+                    "position": self.point(self.position[vehicle]),
+                    "capture_points": self.capture_points[vehicle],
+                    "shoot_range_bonus": self.shoot_range_bonus[vehicle],
+                }
+                for vehicle, t_id in enumerate(self.vehicle_ids)
+            },
+            "win_points": {
+                str(i): {"capture": self.get_capture(i), "kill": self.kill_points[i]}
+                for i in self.players
+            },
+            "winner": self.winner,
+            "attack_matrix": {
+                str(i): sorted(attacked) for i, attacked in self.attacked.items()
+            },
+            "catapult_usage": [
+                self.point(cell)
+                for cell, usage in enumerate(self.catapult_usage)
+                for _ in range(usage)
+            ],
+        }
+
+    def get_state(self, idx: int) -> GameState:
+        """
+        :param idx: player id
+        :return: GameState obj as it is seen by given player
+        """
+        return GameState(self.state_data(), idx)
+
+    def play(self, players: dict[int, "SimulatedPlayer"]) -> Optional[int]:
+        """
+        Plays game until the end
+        :param players: dict (player id: SimulatedPlayer)
+        :return: winner id or None in case of draw
+        """
+        while not self.is_finished:
+            idx = self.current_player
+            self.step(players[idx].make_turn(self.get_state(idx), self.map))
+        return self.winner
+
+
+class SimulatedPlayer:
+    """
+    Bot that plays in Simulator, makes turns
+    same way as Game thread does
+    """
+
+    def __init__(
+        self,
+        idx: int,
+        vehicle_types: Optional[dict[str, type[Vehicle]]] = None,
+        engine=None,
+    ):
+        self.idx = idx
+        self.vehicle_types = vehicle_types
+        self.engine = engine
+        self.vehicles_list: list[Vehicle] = []
+        self.decisions = TranspositionTable(TRANSPOSITION_TABLE_SIZE)
+
+    def init_vehicles(self, state: GameState) -> None:
+        """
+        Instantiates vehicles in the order of their turn
+        :param state: GameState obj
+        :return: None
+        """
+        for t_id, spec in state.get_ordered_tanks():
+            vehicle = Vehicle.build(t_id, spec, self.vehicle_types)
+            vehicle.decisions = self.decisions
+            self.vehicles_list.append(vehicle)
+
+    def make_turn(
+        self, state: GameState, map_: GameMap
+    ) -> list[tuple[Actions, dict]]:
+        """
+        Asks vehicles or strategy engine to make turn
+        :param state: GameState obj
+        :param map_: GameMap obj
+        :return: list of actions
+        """
+        if not self.vehicles_list:
+            self.init_vehicles(state)
+        if self.engine is not None:
+            return self.engine.plan(state, map_, self.vehicles_list)
+        actions = []
+        for vehicle in self.vehicles_list:
+            vehicle_turn = vehicle.make_turn(state, map_)
+            if vehicle_turn:
+                state.update_data(vehicle_turn)
+                actions.append(vehicle_turn)
+        return actions
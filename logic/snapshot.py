@@ -0,0 +1,412 @@
+"""
+This module contains GameSnapshot - compact immutable copy of
+GameState data that is displayed in GUI, StateDiff - list of changes
+between two snapshots, and ViewModel - persistent state of observer
+that is updated by diffs. Snapshots and diffs are safe to pass between
+game thread and main window, because they are never changed.
+ColumnsSnapshot keeps copy of vehicle columns of published state, its
+diff visits in Python only vehicles that changed
+"""
+import dataclasses
+from functools import cached_property
+from typing import Optional, Union
+
+import numpy as np
+
+from logic.cell import Cell
+from logic.model import GameState, VehicleColumns, VEHICLE_TYPE_NAMES
+
+
+@dataclasses.dataclass(frozen=True)
+class VehicleSnapshot:
+    """
+    Immutable state of one vehicle
+    """
+
+    t_id: int
+    player_id: int
+    vehicle_type: str
+    position: Cell
+    health: int
+    capture_points: int
+
+
+@dataclasses.dataclass(frozen=True)
+class GameSnapshot:
+    """
+    Immutable state of game, vehicles are ordered by id
+    """
+
+    idx: int
+    current_turn: int
+    vehicles: tuple[VehicleSnapshot, ...]
+    catapult_usage: tuple[tuple[Cell, int], ...] = ()
+
+    @classmethod
+    def from_state(cls, state: GameState) -> "GameSnapshot":
+        """
+        Creates snapshot of current GameState
+        :param state: GameState obj
+        :return: GameSnapshot obj
+        """
+        return cls.from_columns(
+            state.idx, state.current_turn, state.columns, state.catapult_usage
+        )
+
+    @classmethod
+    def from_columns(
+        cls,
+        idx: int,
+        current_turn: int,
+        columns: VehicleColumns,
+        catapult_usage: dict[Cell, int],
+    ) -> "GameSnapshot":
+        """
+        :param idx: our player id
+        :param current_turn: number of turn
+        :param columns: VehicleColumns of game state
+        :param catapult_usage: dict (cell: usages) of catapults
+        :return: GameSnapshot obj
+        """
+        order = np.argsort(columns.ids, kind="stable")
+        names = VEHICLE_TYPE_NAMES
+        vehicles = tuple(
+            VehicleSnapshot(t_id, owner, names[code], Cell(x, y, z), health, points)
+            for t_id, owner, code, x, y, z, health, points in zip(
+                *(
+                    column[order].tolist()
+                    for column in (
+                        columns.ids,
+                        columns.owner,
+                        columns.type_code,
+                        columns.x,
+                        columns.y,
+                        columns.z,
+                        columns.health,
+                        columns.capture_points,
+                    )
+                )
+            )
+        )
+        usage = tuple(sorted(catapult_usage.items(), key=lambda x: tuple(x[0])))
+        return cls(idx, current_turn, vehicles, usage)
+
+    @cached_property
+    def vehicle_cells(self) -> dict[Cell, VehicleSnapshot]:
+        """
+        :return: dict (Cell: VehicleSnapshot) of all vehicles
+        """
+        return {vehicle.position: vehicle for vehicle in self.vehicles}
+
+    def diff(self, previous: Optional["GameSnapshot"]) -> "StateDiff":
+        """
+        Creates list of changes from previous snapshot to this one
+        :param previous: previous GameSnapshot obj, or None to get diff
+        that adds all vehicles
+        :return: StateDiff obj
+        """
+        changes: list[Change] = []
+        old_vehicles = {}
+        old_usage = {}
+        if previous is not None:
+            old_vehicles = {vehicle.t_id: vehicle for vehicle in previous.vehicles}
+            old_usage = dict(previous.catapult_usage)
+        new_ids = {vehicle.t_id for vehicle in self.vehicles}
+        changes.extend(
+            VehicleRemoved(t_id) for t_id in old_vehicles if t_id not in new_ids
+        )
+        for vehicle in self.vehicles:
+            old = old_vehicles.get(vehicle.t_id)
+            if old is None or old.player_id != vehicle.player_id:
+                changes.append(VehicleAdded(vehicle))
+                continue
+            if old.position != vehicle.position:
+                changes.append(VehicleMoved(vehicle.t_id, vehicle.position))
+            if old.health != vehicle.health:
+                changes.append(HealthChanged(vehicle.t_id, vehicle.health))
+            if old.capture_points != vehicle.capture_points:
+                changes.append(
+                    CapturePointsChanged(vehicle.t_id, vehicle.capture_points)
+                )
+        changes.extend(
+            CatapultUsed(cell, count)
+            for cell, count in self.catapult_usage
+            if old_usage.get(cell) != count
+        )
+        return StateDiff(self.idx, self.current_turn, tuple(changes))
+
+
+@dataclasses.dataclass(frozen=True)
+class ColumnsSnapshot:
+    """
+    State of game published to GUI, stored as copy of vehicle columns.
+    Diff with previous ColumnsSnapshot compares columns by NumPy, so
+    Python objects are created only for changed vehicles
+    """
+
+    idx: int
+    current_turn: int
+    columns: VehicleColumns
+    catapult_usage: tuple[tuple[Cell, int], ...] = ()
+
+    @classmethod
+    def from_state(cls, state: GameState) -> "ColumnsSnapshot":
+        """
+        Creates snapshot of current GameState
+        :param state: GameState obj
+        :return: ColumnsSnapshot obj
+        """
+        usage = tuple(sorted(state.catapult_usage.items(), key=lambda x: tuple(x[0])))
+        return cls(state.idx, state.current_turn, state.columns.copy(), usage)
+
+    def to_game_snapshot(self) -> GameSnapshot:
+        """
+        :return: GameSnapshot with the same data
+        """
+        return GameSnapshot.from_columns(
+            self.idx, self.current_turn, self.columns, dict(self.catapult_usage)
+        )
+
+    def diff(self, previous: Optional["ColumnsSnapshot"]) -> "StateDiff":
+        """
+        Creates list of changes from previous snapshot to this one, equal
+        to diff of GameSnapshot. If vehicles or their owners changed,
+        diff of full GameSnapshot is created
+        :param previous: previous ColumnsSnapshot obj, or None to get
+        diff that adds all vehicles
+        :return: StateDiff obj
+        """
+        new, old = self.columns, None if previous is None else previous.columns
+        if (
+            old is None
+            or not np.array_equal(old.ids, new.ids)
+            or not np.array_equal(old.owner, new.owner)
+        ):
+            return self.to_game_snapshot().diff(
+                None if previous is None else previous.to_game_snapshot()
+            )
+        moved = (old.x != new.x) | (old.y != new.y) | (old.z != new.z)
+        health = old.health != new.health
+        points = old.capture_points != new.capture_points
+        rows = np.flatnonzero(moved | health | points)
+        rows = rows[np.argsort(new.ids[rows], kind="stable")]
+        changes: list[Change] = []
+        for row in rows.tolist():
+            t_id = int(new.ids[row])
+            if moved[row]:
+                position = Cell(int(new.x[row]), int(new.y[row]), int(new.z[row]))
+                changes.append(VehicleMoved(t_id, position))
+            if health[row]:
+                changes.append(HealthChanged(t_id, int(new.health[row])))
+            if points[row]:
+                changes.append(
+                    CapturePointsChanged(t_id, int(new.capture_points[row]))
+                )
+        old_usage = dict(previous.catapult_usage)
+        changes.extend(
+            CatapultUsed(cell, count)
+            for cell, count in self.catapult_usage
+            if old_usage.get(cell) != count
+        )
+        return StateDiff(self.idx, self.current_turn, tuple(changes))
+
+
+@dataclasses.dataclass(frozen=True)
+class VehicleAdded:
+    """
+    Vehicle appeared, or replaced with vehicle of another player
+    """
+
+    vehicle: VehicleSnapshot
+
+    @property
+    def key(self) -> tuple:
+        """
+        :return: key of changed entity, used to merge changes
+        """
+        return "vehicle", self.vehicle.t_id
+
+
+@dataclasses.dataclass(frozen=True)
+class VehicleRemoved:
+    """
+    Vehicle disappeared from game state
+    """
+
+    t_id: int
+
+    @property
+    def key(self) -> tuple:
+        """
+        :return: key of changed entity, used to merge changes
+        """
+        return "vehicle", self.t_id
+
+
+@dataclasses.dataclass(frozen=True)
+class VehicleMoved:
+    """
+    Vehicle changed position
+    """
+
+    t_id: int
+    position: Cell
+
+    @property
+    def key(self) -> tuple:
+        """
+        :return: key of changed entity, used to merge changes
+        """
+        return "position", self.t_id
+
+
+@dataclasses.dataclass(frozen=True)
+class HealthChanged:
+    """
+    Vehicle health changed by shot, repair or respawn
+    """
+
+    t_id: int
+    health: int
+
+    @property
+    def key(self) -> tuple:
+        """
+        :return: key of changed entity, used to merge changes
+        """
+        return "health", self.t_id
+
+
+@dataclasses.dataclass(frozen=True)
+class CapturePointsChanged:
+    """
+    Vehicle capture points changed
+    """
+
+    t_id: int
+    capture_points: int
+
+    @property
+    def key(self) -> tuple:
+        """
+        :return: key of changed entity, used to merge changes
+        """
+        return "capture_points", self.t_id
+
+
+@dataclasses.dataclass(frozen=True)
+class CatapultUsed:
+    """
+    Catapult usage count changed
+    """
+
+    cell: Cell
+    count: int
+
+    @property
+    def key(self) -> tuple:
+        """
+        :return: key of changed entity, used to merge changes
+        """
+        return "catapult", self.cell
+
+
+Change = Union[
+    VehicleAdded,
+    VehicleRemoved,
+    VehicleMoved,
+    HealthChanged,
+    CapturePointsChanged,
+    CatapultUsed,
+]
+
+
+@dataclasses.dataclass(frozen=True)
+class StateDiff:
+    """
+    Immutable list of changes between two game snapshots,
+    changes should be applied in order
+    """
+
+    idx: int
+    current_turn: int
+    changes: tuple[Change, ...]
+
+    def merge(self, later: "StateDiff") -> "StateDiff":
+        """
+        Combines this diff and later one into single diff, only the last
+        change of each vehicle attribute or catapult is kept. Adding or
+        removing of vehicle replaces all its previous changes
+        :param later: diff created after this one
+        :return: StateDiff obj
+        """
+        merged: dict[tuple, Change] = {}
+        for change in self.changes + later.changes:
+            if change.key[0] == "vehicle":
+                t_id = change.key[1]
+                outdated = [
+                    key
+                    for key in merged
+                    if key[0] != "catapult" and key[1] == t_id
+                ]
+                for key in outdated:
+                    del merged[key]
+            merged.pop(change.key, None)
+            merged[change.key] = change
+        return StateDiff(later.idx, later.current_turn, tuple(merged.values()))
+
+
+class ViewModel:
+    """
+    Persistent game state of observer, such as main window,
+    updated by diffs received from game thread
+    """
+
+    def __init__(self):
+        self.idx: Optional[int] = None
+        self.current_turn: Optional[int] = None
+        self.vehicles: dict[int, VehicleSnapshot] = {}
+        self.catapult_usage: dict[Cell, int] = {}
+        self.vehicle_cells: dict[Cell, VehicleSnapshot] = {}
+
+    def apply(self, diff: StateDiff) -> set[Cell]:
+        """
+        Applies changes of diff, vehicle_cells is updated only for
+        vehicles of changes
+        :param diff: StateDiff obj
+        :return: set of cells which content is changed
+        """
+        self.idx = diff.idx
+        self.current_turn = diff.current_turn
+        dirty = set()
+        for change in diff.changes:
+            if isinstance(change, CatapultUsed):
+                self.catapult_usage[change.cell] = change.count
+                dirty.add(change.cell)
+                continue
+            if isinstance(change, VehicleAdded):
+                old = self.vehicles.get(change.vehicle.t_id)
+                vehicle = change.vehicle
+            elif isinstance(change, VehicleRemoved):
+                old = self.vehicles.pop(change.t_id, None)
+                vehicle = None
+            else:
+                old = self.vehicles[change.t_id]
+                if isinstance(change, VehicleMoved):
+                    vehicle = dataclasses.replace(old, position=change.position)
+                elif isinstance(change, HealthChanged):
+                    vehicle = dataclasses.replace(old, health=change.health)
+                else:
+                    vehicle = dataclasses.replace(
+                        old, capture_points=change.capture_points
+                    )
+            if old is not None:
+                dirty.add(old.position)
+                # other vehicle may have already moved to this cell
+                if self.vehicle_cells.get(old.position) is old:
+                    del self.vehicle_cells[old.position]
+            if vehicle is not None:
+                self.vehicles[vehicle.t_id] = vehicle
+                self.vehicle_cells[vehicle.position] = vehicle
+                dirty.add(vehicle.position)
+        return dirty
@@ -0,0 +1,100 @@
+"""
+This module contains HexBuckets - coarse spatial index of items placed
+on map cells, used to find vehicles near a cell without scanning all
+vehicles of the game
+"""
+from typing import Any, Iterator
+
+from logic.cell import Cell
+
+BUCKET_SIZE = 4  # number of cells on side of bucket
+
+
+class HexBuckets:
+    """
+    Spatial index that splits map into parallelogram buckets of
+    bucket_size x bucket_size cells by x and y cube coordinates.
+    One item can be placed on a cell. Query by distance scans only
+    buckets that overlap the query hexagon
+    """
+
+    def __init__(self, bucket_size: int = BUCKET_SIZE):
+        self.bucket_size = bucket_size
+        self.buckets: dict[tuple[int, int], dict[Cell, Any]] = {}
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, cell: Cell) -> bool:
+        return cell in self.buckets.get(self.get_key(cell), ())
+
+    def get_key(self, cell: Cell) -> tuple[int, int]:
+        """
+        :param cell: Cell obj
+        :return: key of bucket that contains cell
+        """
+        return cell.x // self.bucket_size, cell.y // self.bucket_size
+
+    def add(self, cell: Cell, item: Any) -> None:
+        """
+        Places item on cell, item already placed on this cell is replaced
+        :param cell: Cell obj
+        :param item: any obj
+        :return: None
+        """
+        bucket = self.buckets.setdefault(self.get_key(cell), {})
+        if cell not in bucket:
+            self.size += 1
+        bucket[cell] = item
+
+    def remove(self, cell: Cell) -> Any:
+        """
+        :param cell: Cell obj
+        :return: item removed from cell
+        """
+        key = self.get_key(cell)
+        bucket = self.buckets[key]
+        item = bucket.pop(cell)
+        if not bucket:
+            del self.buckets[key]
+        self.size -= 1
+        return item
+
+    def items(self) -> Iterator[tuple[Cell, Any]]:
+        """
+        :return: iterator of (Cell, item) of all placed items
+        """
+        for bucket in self.buckets.values():
+            yield from bucket.items()
+
+    def move(self, cell: Cell, target: Cell) -> None:
+        """
+        Moves item from cell to target cell
+        :param cell: Cell obj with item
+        :param target: Cell obj
+        :return: None
+        """
+        self.add(target, self.remove(cell))
+
+    def within(self, cell: Cell, radius: int) -> Iterator[tuple[Cell, Any]]:
+        """
+        :param cell: center of query
+        :param radius: maximum distance from center
+        :return: iterator of (Cell, item) in given distance from cell
+        """
+        size = self.bucket_size
+        x_keys = range((cell.x - radius) // size, (cell.x + radius) // size + 1)
+        y_keys = range((cell.y - radius) // size, (cell.y + radius) // size + 1)
+        if len(x_keys) * len(y_keys) > len(self.buckets):
+            buckets = self.buckets.values()
+        else:
+            buckets = (
+                self.buckets[key]
+                for key in ((x, y) for x in x_keys for y in y_keys)
+                if key in self.buckets
+            )
+        for bucket in buckets:
+            for item_cell, item in bucket.items():
+                if cell.cube_distance(item_cell) <= radius:
+                    yield item_cell, item
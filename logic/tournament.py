@@ -0,0 +1,251 @@
+"""
+This module contains tournament runner, that plays many simulated
+games in parallel processes, each game seats three bots built from
+vehicle strategy variants. Results are collected into report with
+win rate, capture points and per turn latency of each variant.
+
+Usage: python -m logic.tournament --map map.json --games 1000
+"""
+import argparse
+import dataclasses
+import json
+import os
+import random
+import time
+from multiprocessing import Pool
+from typing import Optional
+
+from config import config as cf
+from logic.map_cache import get_tables
+from logic.model import GameMap
+from logic.shared_tables import SharedMapTables, get_map_tables
+from logic.simulator import Simulator, SimulatedPlayer
+from logic.vehicle import Vehicle, VEHICLE_TYPES
+
+VARIANTS: dict[str, dict[str, type[Vehicle]]] = {
+    "default": VEHICLE_TYPES,
+}
+
+_worker_context: dict = {}
+
+
+@dataclasses.dataclass
+class GameResult:
+    """
+    Dataclass to store result of one simulated game,
+    lists are ordered by seats
+    """
+
+    seed: int
+    seating: tuple[str, ...]
+    winner: Optional[int]
+    capture_points: list[int]
+    kill_points: list[int]
+    latencies: list[list[float]]
+
+
+@dataclasses.dataclass
+class VariantStatistic:
+    """
+    Dataclass to store accumulated results of strategy variant
+    """
+
+    games: int = 0
+    wins: int = 0
+    draws: int = 0
+    capture_points: int = 0
+    kill_points: int = 0
+    latencies: list[float] = dataclasses.field(default_factory=list)
+
+
+class TournamentReport:
+    """
+    Collects results of games into statistic of each variant
+    """
+
+    def __init__(self):
+        self.statistic: dict[str, VariantStatistic] = {}
+        self.games = 0
+        self.duration = 0.0
+
+    def add(self, result: GameResult) -> None:
+        """
+        Adds game result to statistic of seated variants
+        :param result: GameResult obj
+        :return: None
+        """
+        self.games += 1
+        for seat, variant in enumerate(result.seating):
+            stat = self.statistic.setdefault(variant, VariantStatistic())
+            stat.games += 1
+            stat.wins += result.winner == seat
+            stat.draws += result.winner is None
+            stat.capture_points += result.capture_points[seat]
+            stat.kill_points += result.kill_points[seat]
+            stat.latencies.extend(result.latencies[seat])
+
+    def win_rate(self, variant: str) -> float:
+        """
+        :param variant: variant name
+        :return: share of won games from games variant was seated in
+        """
+        stat = self.statistic[variant]
+        return stat.wins / stat.games if stat.games else 0.0
+
+    def __str__(self) -> str:
+        lines = [
+            f"Games: {self.games}, {self.games / max(self.duration, 1e-9) * 60:.0f}"
+            f" games per minute",
+            f"{'variant':<16}{'games':>8}{'win rate':>10}{'draws':>8}"
+            f"{'avg cp':>8}{'avg kill':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}",
+        ]
+        for variant, stat in sorted(self.statistic.items()):
+            latencies = sorted(stat.latencies)
+            lines.append(
+                f"{variant:<16}{stat.games:>8}{self.win_rate(variant):>10.3f}"
+                f"{stat.draws:>8}{stat.capture_points / stat.games:>8.2f}"
+                f"{stat.kill_points / stat.games:>10.2f}"
+                f"{percentile(latencies, 50) * 1000:>9.2f}"
+                f"{percentile(latencies, 95) * 1000:>9.2f}"
+                f"{percentile(latencies, 99) * 1000:>9.2f}"
+            )
+        return "\n".join(lines)
+
+
+def percentile(ordered: list[float], rank: float) -> float:
+    """
+    :param ordered: sorted list of values
+    :param rank: percentile rank from 0 to 100
+    :return: nearest-rank percentile, 0 for empty list
+    """
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * rank / 100))]
+
+
+def init_worker(
+    map_data: dict, num_turns: int, variants: dict[str, dict[str, type[Vehicle]]]
+) -> None:
+    """
+    Process pool initializer, stores map and variants once per worker,
+    map tables are attached from shared memory if they are published
+    :param map_data: dict in format of GAME_MAP response
+    :param num_turns: number of turns in game
+    :param variants: dict (variant name: vehicle types)
+    :return: None
+    """
+    _worker_context["map_data"] = map_data
+    map_ = GameMap(map_data)
+    _worker_context["tables"] = get_map_tables(map_)
+    _worker_context["num_turns"] = num_turns
+    _worker_context["variants"] = variants
+
+
+def play_game(task: tuple[int, tuple[str, ...]]) -> GameResult:
+    """
+    Plays one game in worker process, random is seeded
+    so game result is reproducible
+    :param task: tuple (seed, seating variant names)
+    :return: GameResult obj
+    """
+    seed, seating = task
+    random.seed(seed)
+    sim = Simulator.from_map_data(
+        _worker_context["map_data"],
+        _worker_context["num_turns"],
+        _worker_context["tables"],
+    )
+    variants = _worker_context["variants"]
+    players = {
+        idx: SimulatedPlayer(idx, variants[name])
+        for idx, name in zip(sim.players, seating)
+    }
+    latencies = {idx: [] for idx in sim.players}
+    while not sim.is_finished:
+        idx = sim.current_player
+        start = time.perf_counter()
+        actions = players[idx].make_turn(sim.get_state(idx), sim.map)
+        latencies[idx].append(time.perf_counter() - start)
+        sim.step(actions)
+    return GameResult(
+        seed,
+        seating,
+        sim.players.index(sim.winner) if sim.winner is not None else None,
+        [sim.get_capture(idx) for idx in sim.players],
+        [sim.kill_points[idx] for idx in sim.players],
+        [latencies[idx] for idx in sim.players],
+    )
+
+
+def run_tournament(
+    map_data: dict,
+    seating: list[str],
+    games: int,
+    processes: Optional[int] = None,
+    seed: int = 0,
+    num_turns: int = 45,
+    variants: Optional[dict[str, dict[str, type[Vehicle]]]] = None,
+) -> TournamentReport:
+    """
+    Plays games in process pool, seats are rotated between games
+    so every variant plays on each position in turn order
+    :param map_data: dict in format of GAME_MAP response
+    :param seating: variant names for each seat
+    :param games: number of games
+    :param processes: number of worker processes, all cores by default,
+    1 - play in current process
+    :param seed: seed of first game, following games use next seeds
+    :param num_turns: number of turns in game
+    :param variants: dict (variant name: vehicle types), VARIANTS by default
+    :return: TournamentReport obj
+    """
+    variants = {name: (variants or VARIANTS)[name] for name in set(seating)}
+    tasks = [
+        (seed + i, tuple(seating[i % len(seating) :] + seating[: i % len(seating)]))
+        for i in range(games)
+    ]
+    report = TournamentReport()
+    start = time.perf_counter()
+    processes = processes or os.cpu_count()
+    if processes == 1:
+        init_worker(map_data, num_turns, variants)
+        for result in map(play_game, tasks):
+            report.add(result)
+    else:
+        map_ = GameMap(map_data)
+        with SharedMapTables() as shared:
+            shared.publish(map_, get_tables(map_, cf.MAP_CACHE_DIR))
+            with Pool(processes, init_worker, (map_data, num_turns, variants)) as pool:
+                chunksize = max(1, games // (4 * processes))
+                for result in pool.imap_unordered(play_game, tasks, chunksize):
+                    report.add(result)
+    report.duration = time.perf_counter() - start
+    return report
+
+
+def main() -> None:
+    """
+    Command line entry point
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--map", required=True, help="json file with GAME_MAP response")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--turns", type=int, default=45)
+    parser.add_argument(
+        "--seating", nargs=3, default=["default"] * 3, choices=list(VARIANTS)
+    )
+    args = parser.parse_args()
+    with open(args.map) as file:
+        map_data = json.load(file)
+    print(
+        run_tournament(
+            map_data, args.seating, args.games, args.processes, args.seed, args.turns
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+This module contains Zobrist keys used to hash game state,
+and LRU transposition table used to cache decisions by state hash
+"""
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Hashable, Optional
+
+
+@lru_cache(maxsize=None)
+def zobrist_key(*feature: Hashable) -> int:
+    """
+    Returns pseudo random 64-bit key of feature, keys are derived
+    from feature repr, so they are equal in all processes and do not
+    affect random module state
+    :param feature: tuple of hashable feature values
+    :return: int key
+    """
+    digest = hashlib.blake2b(repr(feature).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, byteorder="little")
+
+
+class TranspositionTable:
+    """
+    Least recently used cache of values by hashable key,
+    oldest entries are dropped when max_size is reached
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Optional[Any]:
+        """
+        :param key: hashable key
+        :param default: value returned if key is not cached
+        :return: cached value or default
+        """
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Stores value, drops least recently used entry if table is full
+        :param key: hashable key
+        :param value: cached value
+        :return: None
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Drops all entries and statistic
+        :return: None
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -4,24 +4,41 @@ This Module contents game logic only, it does not store any data.
 import random
 from typing import Optional, Union
 
+import numpy as np
+
 from config import game_balance as gb_cf
-from config.config import Actions
+from config.config import Actions, CLUSTER_MAP_SIZE
 from logic.cell import Cell
+from logic.influence import FEATURES, influence_cache
 from logic.model import TankModel, GameState, GameMap
+from logic.pathfinding import DStarLite, Reachability, find_nearest
+from logic.transposition import TranspositionTable
 
 
 class Vehicle:
     """
     Superclass for all vehicle types implements most
-    common vehicle strategy, and vehicle actions
+    common vehicle strategy, and vehicle actions.
+    Move is chosen by scoring reachable cells with weights of vehicle
+    type, names of weights are influence.FEATURES
     """
 
+    WEIGHTS = {"path": 10.0, "priority_distance": -1.0, "targets": 0.5}
+    REPAIR_WEIGHT = -0.5  # weight of distance to repair for damaged tank
+
     def __init__(self, t_id: int, spec: TankModel):
         self.t_id = t_id
         self.model = spec
         self.speed = gb_cf.SPEED_POINTS[self.model.vehicle_type]
         self.damage = gb_cf.DAMAGE[self.model.vehicle_type]
         self.priority: Optional[Cell] = None
+        self.decisions: Optional[TranspositionTable] = None
+        self.reachable: Optional[Reachability] = None
+        self.reachable_key: Optional[tuple] = None
+        self.path: list[Cell] = []
+        self.path_key: Optional[tuple] = None
+        self.planner: Optional[DStarLite] = None
+        self.route: list[Cell] = []
 
     def refresh_model(self, state: GameState) -> None:
         """
@@ -31,19 +48,6 @@ class Vehicle:
         """
         self.model = state.our_tanks[self.t_id]
 
-    @staticmethod
-    def cells_in_range(model: TankModel) -> set[Cell]:
-        """
-        Returns cells in shooting range of tank
-        :param model: TankModel obj or EnemyTankModel obj
-        :return: set of Cell
-        """
-
-        max_radius = gb_cf.MAX_RANGE[model.vehicle_type] + model.shoot_range_bonus
-        return model.coordinates.in_radius_excl(
-            gb_cf.MIN_RANGE[model.vehicle_type], max_radius
-        )
-
     def targets_in_range(
         self, state: GameState, map_: GameMap
     ) -> Union[set, set[Cell]]:
@@ -54,9 +58,129 @@ class Vehicle:
         :param map_: GameMap obj
         :return: set of cells
         """
-        return self.cells_in_range(self.model).intersection(
-            state.get_aggressive_cells()
+        cells_in_range = map_.attack_index.get_range(
+            self.model.vehicle_type,
+            self.model.shoot_range_bonus,
+            self.model.coordinates,
+        )
+        return {
+            tank.coordinates
+            for tank in state.get_vehicles_within(
+                self.model.coordinates, self.get_max_range(), aggressive=True
+            )
+            if tank.coordinates in cells_in_range
+        }
+
+    def get_turn_key(self, state: GameState, map_: GameMap) -> tuple:
+        """
+        :param state: GameState obj
+        :param map_: GameMap obj
+        :return: key of tank situation, it changes when any tank moves
+        """
+        return state.zobrist, map_.name, self.model.coordinates
+
+    def get_reachable(self, state: GameState, map_: GameMap) -> Reachability:
+        """
+        Returns cells where tank can move in current turn. Search is done
+        once per turn and repeated only if any tank moved since
+        :param state: GameState obj
+        :param map_: GameMap obj
+        :return: Reachability obj
+        """
+        key = self.get_turn_key(state, map_)
+        if self.reachable_key != key:
+            self.reachable = Reachability(
+                self.model.coordinates,
+                self.speed,
+                map_.get_available_cells(),
+                state.tank_cells,
+            )
+            self.reachable_key = key
+        return self.reachable
+
+    def get_nearest(
+        self, cells: set[Cell], state: GameState, map_: GameMap
+    ) -> Cell:
+        """
+        Chooses the nearest by path of given cells, cells without tanks
+        are preferred. All cells are searched at once, path to the chosen
+        cell is kept to move to it in current turn
+        :param cells: set of Cell
+        :param state: GameState obj
+        :param map_: GameMap obj
+        :return: Cell
+        """
+        if self.model.coordinates in cells:
+            return self.model.coordinates
+        goals = cells.difference(state.tank_cells) or cells
+        goal, path = find_nearest(
+            self.model.coordinates, self.get_passable(state, map_), goals
         )
+        if goal is None:
+            return min(cells, key=self.model.coordinates.cube_distance)
+        self.path, self.path_key = path, self.get_turn_key(state, map_)
+        return goal
+
+    def get_passable(self, state: GameState, map_: GameMap) -> set[Cell]:
+        """
+        Returns cells that path of tank may go through, tank with one
+        speed point goes around tanks next to it
+        :param state: GameState obj
+        :param map_: GameMap obj
+        :return: set of Cell
+        """
+        return map_.get_available_cells().difference(self.get_blocked(state))
+
+    def get_blocked(self, state: GameState) -> set[Cell]:
+        """
+        Returns cells that path of tank may not go through, tank with one
+        speed point goes around tanks next to it as it can not pass them
+        :param state: GameState obj
+        :return: set of Cell
+        """
+        if self.speed == 1:
+            return state.tank_cells.intersection(self.model.coordinates.neighbours())
+        return set()
+
+    def get_path(self, state: GameState, map_: GameMap) -> Optional[list[Cell]]:
+        """
+        Returns the first steps of path to priority that tank can make
+        in current turn. Path found while choosing priority in current
+        turn is reused, otherwise path planner of priority is repaired
+        for current position and tanks nearby, it is created again
+        only when its goal changes. On large maps the goal is the next
+        waypoint of route to priority
+        :param state: GameState obj
+        :param map_: GameMap obj
+        :return: list with path Cell excluding tank position, None if
+        priority is not reachable
+        """
+        if (
+            self.path
+            and self.path_key == self.get_turn_key(state, map_)
+            and self.path[-1] == self.priority
+        ):
+            return self.path[: self.speed]
+        goal = self.priority
+        if map_.size >= CLUSTER_MAP_SIZE:
+            goal = self.get_waypoint(state, map_)
+            if goal is None:
+                return None
+        available_cells = map_.get_available_cells()
+        if (
+            self.planner is None
+            or self.planner.goal != goal
+            or self.planner.passable is not available_cells
+        ):
+            self.planner = DStarLite(goal, available_cells)
+        self.planner.update(self.model.coordinates, self.get_blocked(state))
+        return self.planner.get_path(self.speed)
+
+    def get_max_range(self) -> int:
+        """
+        :return: maximum shooting distance of tank including range bonus
+        """
+        return gb_cf.MAX_RANGE[self.model.vehicle_type] + self.model.shoot_range_bonus
 
     def shoot(self, target: Cell) -> tuple[Actions, dict]:
         """
@@ -108,13 +232,35 @@ class Vehicle:
     ) -> Optional[tuple[Actions, dict]]:
         """
         Main method to provide vehicle action, returns
-        Python obj with SHOOT or MOVE action | None
+        Python obj with SHOOT or MOVE action | None.
+        If decisions table is set, decision is reused when
+        the same situation is repeated
         :param state: GameState obj
         :param map_: MapState obj
         :return: Python obj action
         """
 
         self.refresh_model(state)
+        if self.decisions is None:
+            return self.decide(state, map_)
+        key = (state.get_decision_key(), map_.name, self.t_id, self.priority)
+        cached = self.decisions.get(key)
+        if cached is not None:
+            self.priority, turn = cached
+            return turn
+        turn = self.decide(state, map_)
+        self.decisions.put(key, (self.priority, turn))
+        return turn
+
+    def decide(
+        self, state: GameState, map_: GameMap
+    ) -> Optional[tuple[Actions, dict]]:
+        """
+        Defines vehicle action from scratch
+        :param state: GameState obj
+        :param map_: MapState obj
+        :return: Python obj action
+        """
         self.set_priority(state, map_)
         targets = self.targets_in_range(state, map_)
         step_cell = None
@@ -153,38 +299,84 @@ class Vehicle:
 
     def move_to_priority(self, map_: GameMap, state: GameState) -> Optional[Cell]:
         """
-        Method finds path to priority, and return
-        reachable empty cell on the path to priority,
-        according to current game situation
+        Method finds path to priority, and return the best scored
+        reachable cell, the furthest reachable empty cell on the path
+        to priority is preferred by weights of all vehicles
         :param map_: GameMap obj
         :param state: GameState obj
         :return: Cell
         """
-        step_cell = None
-        speed_points = self.speed
-        if speed_points == 1:
-            available_cells = map_.get_available_cells().difference(
-                state.tank_cells.intersection(self.model.coordinates.neighbours())
-            )
-        else:
-            available_cells = map_.get_available_cells()
-        path_to_priority = self.model.coordinates.a_star(available_cells, self.priority)
+        reachable = self.get_reachable(state, map_)
+        if self.priority in reachable:
+            return self.choose_step(self.priority, state, map_)
+        path_to_priority = self.get_path(state, map_)
         if not path_to_priority:
             return None
-
-        if speed_points >= len(path_to_priority):
-            step_cell = path_to_priority[-1]
-        else:
-            while speed_points:
-                if path_to_priority[speed_points - 1] in state.tank_cells:
-                    speed_points -= 1
-                else:
-                    step_cell = path_to_priority[speed_points - 1]
-                    break
-        if step_cell and step_cell not in state.tank_cells:
-            return step_cell
+        for step_cell in reversed(path_to_priority):
+            if step_cell in reachable:
+                return self.choose_step(step_cell, state, map_)
         return None
 
+    def choose_step(self, step_cell: Cell, state: GameState, map_: GameMap) -> Cell:
+        """
+        Scores all cells reachable in current turn by weight vector of tank
+        with influence map of state
+        :param step_cell: step of path to priority
+        :param state: GameState obj
+        :param map_: GameMap obj
+        :return: Cell
+        """
+        return influence_cache.get_influence(state, map_).choose(
+            list(self.get_reachable(state, map_).cells),
+            self.get_weights(),
+            self.model.vehicle_type,
+            self.model.shoot_range_bonus,
+            self.priority,
+            step_cell,
+        )
+
+    def get_weights(self) -> np.ndarray:
+        """
+        Returns weights of tank type, damaged tank is also drawn to repairs
+        and tank with shoot range bonus ignores catapults
+        :return: array of weights in order of influence.FEATURES
+        """
+        weights = dict(self.WEIGHTS)
+        vehicle_type = self.model.vehicle_type
+        if self.model.health < gb_cf.MAX_HP[vehicle_type]:
+            if vehicle_type in gb_cf.LIGHT_REPAIR_TYPES:
+                weights.setdefault("light_repair_distance", self.REPAIR_WEIGHT)
+            if vehicle_type in gb_cf.HARD_REPAIR_TYPES:
+                weights.setdefault("hard_repair_distance", self.REPAIR_WEIGHT)
+        if self.model.shoot_range_bonus:
+            weights.pop("catapult_distance", None)
+        return np.array([weights.get(name, 0.0) for name in FEATURES])
+
+    def get_waypoint(self, state: GameState, map_: GameMap) -> Optional[Cell]:
+        """
+        Returns the first cell of route to priority that is out of reach
+        in current turn, waypoints are passed only when they are reachable
+        by path. Route goes through cluster entrances of map ClusterGraph,
+        it is planned again when priority changes
+        :param state: GameState obj
+        :param map_: GameMap obj
+        :return: Cell, None if priority is not reachable
+        """
+        position = self.model.coordinates
+        if not self.route or self.route[-1] != self.priority:
+            self.route = (
+                map_.cluster_graph.find_route(
+                    position, self.priority, self.get_passable(state, map_)
+                )
+                or []
+            )
+        reachable = self.get_reachable(state, map_)
+        while len(self.route) > 1 and (
+            self.route[0] == position or self.route[0] in reachable
+        ):
+            self.route.pop(0)
+        return self.route[0] if self.route else None
+
     def is_capturing_base(self, state: GameState, map_: GameMap) -> bool:
         """
         Check if at the end of our turn we can have max capture points
@@ -203,40 +395,23 @@ class Vehicle:
         )
 
     @staticmethod
-    def build(t_id: int, spec: TankModel) -> "Vehicle":
+    def build(
+        t_id: int,
+        spec: TankModel,
+        vehicle_types: Optional[dict[str, type["Vehicle"]]] = None,
+    ) -> "Vehicle":
         """
         fabric method instantiates vehicles of given spec
         :param t_id: tanks id
         :param spec: TankModel obj
+        :param vehicle_types: dict (vehicle type: Vehicle class) used to
+        build strategy variants, VEHICLE_TYPES by default
         :return: Vehicle of proper type
         """
-        vehicle_types = {
-            "medium_tank": MediumTank,
-            "light_tank": LightTank,
-            "heavy_tank": HeavyTank,
-            "at_spg": AtSpg,
-            "spg": Spg,
-        }
+        if vehicle_types is None:
+            vehicle_types = VEHICLE_TYPES
         return vehicle_types[spec.vehicle_type](t_id, spec)
 
-    @staticmethod
-    def get_hot_spots(state: GameState, map_: GameMap) -> set[Cell]:
-        """
-        Returns set of Cells which enemies can shoot
-        :param state: GameState obj
-        :param map_: GameMap obj
-        :return: set of Cells
-        """
-        hot_spots = set()
-        for cell, tank in state.enemy_tanks.items():
-            if tank.vehicle_type != "at_spg":
-                hot_spots.update(Vehicle.cells_in_range(tank))
-            else:
-                hot_spots.update(
-                    *AtSpg.range_exclude_walls(cell, map_, AtSpg.cells_in_range(tank))
-                )
-        return hot_spots
-
     def can_kill(self, target: Cell, state: GameState) -> bool:
         """
         Returns true if our tank can kill enemy by its shot
@@ -266,10 +441,7 @@ class MediumTank(Vehicle):
         :return:
         """
         if self.model.health == 1 and not self.is_capturing_base(state, map_):
-            self.priority = min(
-                map_.light_repairs,
-                key=self.model.coordinates.cube_distance,
-            )
+            self.priority = self.get_nearest(map_.light_repairs, state, map_)
         else:
             super().set_priority(state, map_)
 
@@ -277,9 +449,12 @@ class MediumTank(Vehicle):
 class LightTank(Vehicle):
     """
     Light tanks class that implements
-    specific strategy for light tanks
+    specific strategy for light tanks,
+    it avoids cells that enemies can shoot
     """
 
+    WEIGHTS = {**Vehicle.WEIGHTS, "threat": -100.0, "catapult_distance": -0.5}
+
     def set_priority(self, state: GameState, map_: GameMap) -> None:
         """
         Sets active catapult cell as a priority for
@@ -290,48 +465,11 @@ class LightTank(Vehicle):
         """
         active_catapults = map_.catapults.difference(state.inactive_catapults)
         if not self.model.shoot_range_bonus and active_catapults:
-            self.priority = min(
-                active_catapults, key=self.model.spawn_point.cube_distance
-            )
+            self.priority = self.get_nearest(active_catapults, state, map_)
 
         else:
             super().set_priority(state, map_)
 
-    def move_to_priority(self, map_: GameMap, state: GameState) -> Optional[Cell]:
-        """
-        Overloads Vehicle move_to priority. Light Tank
-        will try to avoid receiving damage
-        :param map_: GameMap obj
-        :param state: GameState obj
-        :return: Cell
-        """
-        step_cell = super().move_to_priority(map_, state)
-        if step_cell in self.get_hot_spots(state, map_):
-            self.speed = gb_cf.SPEED_POINTS[self.model.vehicle_type]
-            safe_cells = map_.get_available_cells().difference(
-                state.tank_cells.union(self.get_hot_spots(state, map_))
-            )
-            reachable_safe_cells = safe_cells.intersection(
-                self.model.coordinates.in_radius(self.speed)
-            )
-            if reachable_safe_cells:
-                self.priority = min(
-                    reachable_safe_cells, key=self.priority.cube_distance
-                )
-                step_cell = super().move_to_priority(map_, state)
-            if step_cell in self.get_hot_spots(state, map_):
-                available_neighbours = (
-                    map_.get_available_cells()
-                    .intersection(self.model.coordinates.neighbours())
-                    .difference(state.tank_cells)
-                )
-                safe_neighbours = available_neighbours.difference(
-                    self.get_hot_spots(state, map_)
-                )
-                if safe_neighbours:
-                    step_cell = min(safe_neighbours, key=self.priority.cube_distance)
-        return step_cell
-
 
 class HeavyTank(Vehicle):
     """
@@ -352,9 +490,7 @@ class HeavyTank(Vehicle):
             not self.is_capturing_base(state, map_)
             and self.model.health != gb_cf.MAX_HP[self.model.vehicle_type]
         ):
-            self.priority = min(
-                map_.hard_repairs, key=self.model.coordinates.cube_distance
-            )
+            self.priority = self.get_nearest(map_.hard_repairs, state, map_)
         else:
             super().set_priority(state, map_)
 
@@ -375,10 +511,20 @@ class AtSpg(Vehicle):
         :return: set of cells, or empty set
         """
         targets = set()
-        for direction in self.range_exclude_walls(
-            self.model.coordinates, map_, self.cells_in_range(self.model)
+        aggressive_cells = {
+            tank.coordinates
+            for tank in state.get_vehicles_within(
+                self.model.coordinates, self.get_max_range(), aggressive=True
+            )
+        }
+        if not aggressive_cells:
+            return targets
+        for direction in map_.attack_index.get_directions(
+            self.model.vehicle_type,
+            self.model.shoot_range_bonus,
+            self.model.coordinates,
         ):
-            if direction.intersection(state.get_aggressive_cells()):
+            if not direction.isdisjoint(aggressive_cells):
                 targets.update(direction)
         return targets
 
@@ -400,33 +546,6 @@ class AtSpg(Vehicle):
             self.model.coordinates.neighbours()
         ).pop()
 
-    @staticmethod
-    def range_exclude_walls(
-        cell: Cell, map_: GameMap, directions: list[set[Cell]]
-    ) -> list[set[Cell]]:
-        """
-        Exclude cells that are behind the obstacles from atSPG shoot directions
-        :param cell: tank Cell
-        :param map_: GameMap obj
-        :param directions: list with sets of cells in directions which atSPG can shoot
-        :return: list that contains sets of Cell, each set
-        - direction which atSPG can shoot, depending on obstacles
-        """
-        new_directions = []
-        for direction in directions:
-            if direction.intersection(map_.obstacles):
-                list_direction = list(direction)
-                list_direction.sort(key=cell.cube_distance)
-                current_direction = set()
-                for cell in list_direction:
-                    if cell in map_.obstacles:
-                        break
-                    current_direction.add(cell)
-                new_directions.append(current_direction)
-            else:
-                new_directions.append(direction)
-        return new_directions
-
     @staticmethod
     def cells_in_range(model: TankModel) -> list[set[Cell]]:
         """
@@ -447,9 +566,7 @@ class AtSpg(Vehicle):
         """
 
         if self.model.health == 1 and not self.is_capturing_base(state, map_):
-            self.priority = min(
-                map_.hard_repairs, key=self.model.coordinates.cube_distance
-            )
+            self.priority = self.get_nearest(map_.hard_repairs, state, map_)
         else:
             super().set_priority(state, map_)
 
@@ -457,28 +574,17 @@ class AtSpg(Vehicle):
 class Spg(Vehicle):
     """
     Spg class that implements
-    specific strategy for spg
+    specific strategy for spg,
+    it avoids cells that enemies can shoot
     """
 
-    def move_to_priority(self, map_: GameMap, state: GameState) -> Optional[Cell]:
-        """
-        Overloads Vehicle move_to_priority to
-        avoid dangerous cells if it is possible
-        :param map_: GameMap obj
-        :param state: GameState obj
-        :return: Cell
-        """
-        step_cell = super().move_to_priority(map_, state)
-        if step_cell in self.get_hot_spots(state, map_):
-            free_cells = map_.get_available_cells().difference(state.tank_cells)
-            free_neighbour_cells = free_cells.intersection(
-                self.model.coordinates.neighbours()
-            )
-            safe_neighbour_cells = free_neighbour_cells.difference(
-                self.get_hot_spots(state, map_)
-            )
-            if safe_neighbour_cells:
-                return min(
-                    safe_neighbour_cells, key=lambda x: x.cube_distance(self.priority)
-                )
-        return step_cell
+    WEIGHTS = {**Vehicle.WEIGHTS, "threat": -100.0}
+
+
+VEHICLE_TYPES = {
+    "medium_tank": MediumTank,
+    "light_tank": LightTank,
+    "heavy_tank": HeavyTank,
+    "at_spg": AtSpg,
+    "spg": Spg,
+}
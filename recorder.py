@@ -0,0 +1,261 @@
+"""
+This module contains WireRecorder - append-only binary log of
+client-server frames, and ReplayReader - memory-mapped reader of this
+log with index of turns, used for offline debugging and benchmarks
+
+File starts with header (MAGIC, version), then records follow:
+record header RECORD_HEADER (action, status code, round, turn, request
+time, response time, request length, response length), then request
+and response payloads in JSON. Round and turn are set for successful
+GAME_STATE responses only, NO_TURN is used for other records
+"""
+import dataclasses
+import json
+import mmap
+import struct
+import time
+from typing import Optional
+
+from config import config as cf
+from logic.model import GameMap, GameState
+
+MAGIC = b"WGRP"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sH")
+RECORD_HEADER = struct.Struct("<HHHHddII")
+NO_TURN = 0xFFFF
+NO_STATUS = 0xFFFF
+
+
+@dataclasses.dataclass(frozen=True)
+class WireRecord:
+    """
+    One request to server and its response
+    """
+
+    action: cf.Actions
+    status: Optional[int]
+    sent: float
+    received: float
+    request: bytes
+    response: bytes
+
+    def get_response(self) -> Optional[dict]:
+        """
+        :return: decoded response, None if response is empty
+        """
+        return json.loads(self.response) if self.response else None
+
+
+class WireRecorder:
+    """
+    Appends frames of client-server interact to binary log,
+    file is flushed not more often than once per flush_interval seconds
+    """
+
+    def __init__(self, path: str, flush_interval: float = cf.RECORDER_FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(FILE_HEADER.pack(MAGIC, VERSION))
+        self.last_flush = time.monotonic()
+
+    def record(
+        self,
+        action: cf.Actions,
+        data: Optional[dict],
+        status: Optional[int],
+        response: bytes,
+        sent: float,
+        received: float,
+        message: Optional[dict] = None,
+    ) -> None:
+        """
+        Appends request and response to log, password is not recorded
+        :param action: action from enum type Actions
+        :param data: request data dict | None
+        :param status: status code of response, None if there is no response
+        :param response: raw response payload
+        :param sent: request time
+        :param received: response time
+        :param message: decoded response, decoded from payload if not given
+        :return: None
+        """
+        if data is not None and "password" in data:
+            data = {key: value for key, value in data.items() if key != "password"}
+        request = b"" if data is None else json.dumps(data).encode("UTF-8")
+        game_round, turn = NO_TURN, NO_TURN
+        if (
+            action == cf.Actions.GAME_STATE
+            and status == cf.StatusCode.OKEY
+            and response
+        ):
+            if message is None:
+                message = json.loads(response)
+            if "current_round" in message and "current_turn" in message:
+                game_round, turn = message["current_round"], message["current_turn"]
+        self.file.write(
+            RECORD_HEADER.pack(
+                action,
+                NO_STATUS if status is None else status,
+                game_round,
+                turn,
+                sent,
+                received,
+                len(request),
+                len(response),
+            )
+        )
+        self.file.write(request)
+        self.file.write(response)
+        if time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes buffered records to file
+        :return: None
+        """
+        self.file.flush()
+        self.last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """
+        Flushes and closes file
+        :return: None
+        """
+        self.file.close()
+
+
+class ReplayReader:
+    """
+    Reads log created by WireRecorder. File is memory-mapped, offsets of
+    records and GAME_STATE records of each (round, turn) are indexed
+    once on open, so any record or turn is accessed in O(1)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = FILE_HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a game record of version {VERSION}")
+        self.offsets: list[int] = []
+        self.turns: dict[tuple[int, int], int] = {}
+        self.maps: list[tuple[int, int]] = []
+        self.logins: list[tuple[int, int]] = []
+        self.index()
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __enter__(self) -> "ReplayReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def index(self) -> None:
+        """
+        Scans record headers, payloads are skipped. Incomplete record at
+        the end of file is ignored. Each turn is indexed by its first
+        GAME_STATE record, MAP and LOGIN records are indexed by round of
+        the next GAME_STATE record
+        :return: None
+        """
+        offset = FILE_HEADER.size
+        pending = {}
+        while offset + RECORD_HEADER.size <= len(self.data):
+            action, _, game_round, turn, _, _, request, response = (
+                RECORD_HEADER.unpack_from(self.data, offset)
+            )
+            end = offset + RECORD_HEADER.size + request + response
+            if end > len(self.data):
+                break
+            number = len(self.offsets)
+            self.offsets.append(offset)
+            if action in (cf.Actions.MAP, cf.Actions.LOGIN) and response:
+                pending[action] = number
+            elif turn != NO_TURN:
+                self.turns.setdefault((game_round, turn), number)
+                if cf.Actions.MAP in pending:
+                    self.maps.append((game_round, pending.pop(cf.Actions.MAP)))
+                if cf.Actions.LOGIN in pending:
+                    self.logins.append((game_round, pending.pop(cf.Actions.LOGIN)))
+            offset = end
+
+    def get_record(self, number: int) -> WireRecord:
+        """
+        :param number: number of record
+        :return: WireRecord obj
+        """
+        offset = self.offsets[number]
+        action, status, _, _, sent, received, request, response = (
+            RECORD_HEADER.unpack_from(self.data, offset)
+        )
+        start = offset + RECORD_HEADER.size
+        return WireRecord(
+            cf.Actions(action),
+            None if status == NO_STATUS else status,
+            sent,
+            received,
+            self.data[start : start + request],
+            self.data[start + request : start + request + response],
+        )
+
+    def get_turns(self) -> list[tuple[int, int]]:
+        """
+        :return: sorted list of recorded (round, turn)
+        """
+        return sorted(self.turns)
+
+    @staticmethod
+    def find_round(records: list[tuple[int, int]], game_round: int) -> int:
+        """
+        :param records: list of (round, record number) in order of rounds
+        :param game_round: number of round
+        :return: number of the last record received before end of round
+        """
+        for record_round, number in reversed(records):
+            if record_round <= game_round:
+                return number
+        raise KeyError(f"No record for round {game_round}")
+
+    def get_idx(self, game_round: int) -> int:
+        """
+        :param game_round: number of round
+        :return: player id from LOGIN response of given round
+        """
+        record = self.get_record(self.find_round(self.logins, game_round))
+        return record.get_response()["idx"]
+
+    def get_map(self, game_round: int) -> GameMap:
+        """
+        :param game_round: number of round
+        :return: GameMap obj of given round
+        """
+        record = self.get_record(self.find_round(self.maps, game_round))
+        return GameMap(record.get_response())
+
+    def get_state(
+        self, game_round: int, turn: int, idx: Optional[int] = None
+    ) -> GameState:
+        """
+        :param game_round: number of round
+        :param turn: number of turn
+        :param idx: id of player, player from LOGIN response by default
+        :return: GameState obj at the beginning of given turn
+        """
+        if idx is None:
+            idx = self.get_idx(game_round)
+        record = self.get_record(self.turns[(game_round, turn)])
+        return GameState(record.get_response(), idx)
+
+    def close(self) -> None:
+        """
+        Closes memory map
+        :return: None
+        """
+        self.data.close()
@@ -0,0 +1,74 @@
+import unittest
+
+from config import game_balance as gb_cf
+from logic.cell import Cell
+from logic.map_tables import MapTables, NO_CELL
+from logic.model import GameMap, TankModel
+from tests.test_simulator import MAP_DATA
+
+
+class TestAttackIndex(unittest.TestCase):
+    def setUp(self):
+        self.map = GameMap(MAP_DATA)
+        self.index = self.map.attack_index
+
+    def test_range(self):
+        cell = Cell(-9, 0, 9)
+        for vehicle_type in gb_cf.MAX_RANGE:
+            if vehicle_type == "at_spg":
+                continue
+            for bonus in (0, 1):
+                expected = cell.in_radius_excl(
+                    gb_cf.MIN_RANGE[vehicle_type],
+                    gb_cf.MAX_RANGE[vehicle_type] + bonus,
+                ).intersection(self.map.cells)
+                actual = self.index.get_range(vehicle_type, bonus, cell)
+                self.assertEqual(expected, actual)
+        self.assertIs(self.map.attack_index, self.index)
+
+    def test_at_spg_walls(self):
+        cell = Cell(4, -1, -3)
+        directions = self.index.get_directions("at_spg", 0, cell)
+        self.assertEqual({Cell(3, -1, -2)}, directions[1])
+        self.assertEqual(3, len(directions[0]))
+        self.assertNotIn(Cell(1, -1, 0), self.index.get_range("at_spg", 1, cell))
+        obstacle = Cell(2, -1, -1)
+        self.assertFalse(self.index.get_attackers("at_spg", 0, obstacle))
+
+        tables = MapTables(self.map)
+        for cell in self.map.cells - self.map.obstacles:
+            for bonus in (0, 1):
+                length = gb_cf.MAX_RANGE["at_spg"] + bonus
+                rays = {
+                    tables.cells[i]
+                    for direction in range(6)
+                    for i in tables.get_ray(tables.index[cell], direction, length)
+                    if i != NO_CELL
+                }
+                self.assertEqual(rays, self.index.get_range("at_spg", bonus, cell))
+
+    def test_symmetry(self):
+        cells = sorted(self.map.cells, key=tuple)[::7]
+        for vehicle_type in gb_cf.MAX_RANGE:
+            for cell in cells:
+                attackers = self.index.get_attackers(vehicle_type, 1, cell)
+                for other in cells:
+                    self.assertEqual(
+                        other in attackers,
+                        self.index.can_shoot(vehicle_type, 1, other, cell),
+                    )
+
+    def test_hot_spots(self):
+        tanks = {
+            cell: TankModel(1, vehicle_type, cell, 0, 0, cell)
+            for cell, vehicle_type in (
+                (Cell(4, -1, -3), "at_spg"),
+                (Cell(-5, 5, 0), "spg"),
+                (Cell(0, 3, -3), "medium_tank"),
+            )
+        }
+        hot_spots = self.index.get_hot_spots(tanks)
+        self.assertIn(Cell(3, -1, -2), hot_spots)
+        self.assertNotIn(Cell(1, -1, 0), hot_spots)
+        for cell in self.map.cells - self.map.obstacles:
+            self.assertEqual(cell in hot_spots, self.index.is_hot_spot(cell, tanks))
@@ -0,0 +1,46 @@
+import threading
+import unittest
+
+from logic.channel import LatestChannel
+
+
+class TestChannel(unittest.TestCase):
+    def test_latest_wins(self):
+        channel = LatestChannel()
+        self.assertIsNone(channel.take())
+        for i in range(5):
+            channel.put(i)
+        self.assertEqual(4, channel.take())
+        self.assertIsNone(channel.take())
+        self.assertEqual((5, 4), (channel.sent, channel.dropped))
+
+    def test_threads(self):
+        channel = LatestChannel()
+        writer = threading.Thread(
+            target=lambda: [channel.put(i) for i in range(1000)]
+        )
+        writer.start()
+        taken = []
+        while writer.is_alive():
+            item = channel.take()
+            if item is not None:
+                taken.append(item)
+        writer.join()
+        item = channel.take()
+        if item is not None:
+            taken.append(item)
+        self.assertEqual(999, taken[-1])
+        self.assertEqual(sorted(taken), taken)
+        self.assertEqual(1000, len(taken) + channel.dropped)
+
+    def test_merge(self):
+        channel = LatestChannel(lambda pending, item: pending + item)
+        channel.put([1])
+        channel.put([2])
+        channel.put([3])
+        self.assertEqual([1, 2, 3], channel.take())
+        self.assertEqual(2, channel.dropped)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import random
+import unittest
+
+from logic.clusters import ClusterGraph
+from logic.generator import generate_map
+from logic.model import GameMap
+from logic.pathfinding import Reachability
+from logic.simulator import Simulator
+from logic.vehicle import Vehicle
+
+
+class TestClusterGraph(unittest.TestCase):
+    def setUp(self):
+        self.map = GameMap(generate_map(20, obstacle_density=0.2, seed=3))
+        self.passable = self.map.get_available_cells()
+        self.graph = ClusterGraph(self.passable, 5)
+
+    def test_entrances(self):
+        for key, entrances in self.graph.entrances.items():
+            self.assertTrue(entrances.issubset(self.graph.clusters[key]))
+            for entrance in entrances:
+                self.assertEqual(key, self.graph.get_key(entrance))
+        for cell, edges in self.graph.edges.items():
+            for other, steps in edges.items():
+                self.assertEqual(steps, self.graph.edges[other][cell])
+                self.assertLessEqual(cell.cube_distance(other), steps)
+
+    def test_find_path(self):
+        rng = random.Random(0)
+        cells = sorted(self.passable, key=tuple)
+        for _ in range(40):
+            start, goal = rng.sample(cells, 2)
+            distance = Reachability(start, 1000, self.passable, set()).distance
+            path = self.graph.find_path(start, goal, self.passable)
+            if goal not in distance:
+                self.assertIsNone(path)
+                continue
+            self.assertEqual(goal, path[-1])
+            self.assertLessEqual(distance[goal], len(path))
+            for previous, step in zip([start] + path, path):
+                self.assertEqual(1, previous.cube_distance(step))
+                self.assertIn(step, self.passable)
+
+    def test_spawn_start(self):
+        spawn = next(
+            cell
+            for cell in sorted(self.map.spawn_points, key=tuple)
+            if self.passable.intersection(cell.neighbours())
+        )
+        route = self.graph.find_route(spawn, next(iter(self.map.base)), self.passable)
+        self.assertIn(route[-1], self.map.base)
+        closed = self.passable - spawn.neighbours()
+        self.assertIsNone(self.graph.find_route(spawn, route[-1], closed))
+
+    def test_build_cluster_graph(self):
+        self.assertIsNone(self.map.build_cluster_graph())
+        self.assertNotIn("cluster_graph", self.map.__dict__)
+        large_map = GameMap(generate_map(40, seed=1))
+        graph = large_map.build_cluster_graph()
+        self.assertIs(graph, large_map.cluster_graph)
+
+
+class TestVehicleWaypoint(unittest.TestCase):
+    def test_waypoint(self):
+        sim = Simulator.from_map_data(generate_map(40, seed=1))
+        state = sim.get_state(1)
+        t_id, tank = next(
+            (t_id, tank)
+            for t_id, tank in state.our_tanks.items()
+            if tank.vehicle_type == "light_tank"
+        )
+        vehicle = Vehicle.build(t_id, tank)
+        vehicle.priority = max(sim.map.base, key=tank.coordinates.cube_distance)
+        waypoint = vehicle.get_waypoint(state, sim.map)
+        self.assertEqual(vehicle.priority, vehicle.route[-1])
+        self.assertEqual(waypoint, vehicle.route[0])
+        self.assertGreater(tank.coordinates.cube_distance(waypoint), vehicle.speed)
+        self.assertIs(sim.map.cluster_graph, sim.map.cluster_graph)
+        path = vehicle.get_path(state, sim.map)
+        self.assertEqual(vehicle.speed, len(path))
+        self.assertEqual(waypoint, vehicle.planner.goal)
+
+    def test_waypoint_behind_obstacle(self):
+        sim = Simulator.from_map_data(generate_map(40, seed=1))
+        state = sim.get_state(1)
+        t_id, tank = next(
+            (t_id, tank)
+            for t_id, tank in state.our_tanks.items()
+            if tank.vehicle_type == "light_tank"
+        )
+        vehicle = Vehicle.build(t_id, tank)
+        vehicle.priority = max(sim.map.base, key=tank.coordinates.cube_distance)
+        reachable = vehicle.get_reachable(state, sim.map)
+        hidden = next(
+            cell
+            for cell in sorted(sim.map.get_available_cells(), key=tuple)
+            if 0 < tank.coordinates.cube_distance(cell) <= vehicle.speed
+            and cell not in reachable
+            and cell not in state.tank_cells
+        )
+        near = min(reachable.cells, key=tuple)
+        vehicle.route = [tank.coordinates, near, hidden, vehicle.priority]
+        self.assertEqual(hidden, vehicle.get_waypoint(state, sim.map))
+        self.assertEqual([hidden, vehicle.priority], vehicle.route)
@@ -1,7 +1,12 @@
+import socket
+import threading
 import unittest
 
 from connection import Connection
-from config.config import Actions
+from config.config import Actions, RESPONSE_HEADER_SIZE
+from logic.simulator import Simulator
+from tests.test_recorder import serve
+from tests.test_simulator import MAP_DATA
 
 
 class TestConnection(unittest.TestCase):
@@ -18,6 +23,36 @@ class TestConnection(unittest.TestCase):
         self.assertIsNone(actual)
         connection.close_connection()
 
+    def test_stats(self):
+        client, server = socket.socketpair()
+        thread = threading.Thread(
+            target=serve, args=(server, Simulator.from_map_data(MAP_DATA))
+        )
+        thread.start()
+        connection = Connection()
+        connection.sock.close()
+        connection.sock = client
+        connection.send(Actions.LOGIN, {"name": "bot"})
+        for _ in range(3):
+            connection.send(Actions.GAME_STATE)
+        connection.send(Actions.TURN)
+        connection.close_connection()
+        thread.join()
+        server.close()
+
+        stats = connection.stats
+        self.assertEqual(3, stats.requests[Actions.GAME_STATE])
+        self.assertEqual(3 * 8, stats.bytes_sent[Actions.GAME_STATE])
+        self.assertEqual(RESPONSE_HEADER_SIZE, stats.bytes_received[Actions.TURN])
+        self.assertGreater(stats.bytes_received[Actions.GAME_STATE], 3 * 100)
+        self.assertEqual(5, stats.get_round_trip().count)
+        self.assertEqual(5, stats.response_size.count)
+        data = stats.to_dict()
+        self.assertEqual({"OKEY": 5}, data["status_codes"])
+        self.assertEqual(5, data["requests"])
+        self.assertEqual(3, data["actions"]["GAME_STATE"]["round_trip"]["count"])
+        self.assertIn("GAME_STATE", stats.summary())
+
 
 if __name__ == "__main__":
     unittest.main()
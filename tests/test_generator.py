@@ -0,0 +1,54 @@
+import unittest
+
+from logic.cell import Cell
+from logic.generator import generate_map, generate_state
+from logic.map_tables import MapTables, NO_CELL
+from logic.model import GameMap, GameState
+from logic.simulator import Simulator, SimulatedPlayer
+from tests.test_simulator import TempMapCache
+
+
+map_cache_dir = TempMapCache()
+setUpModule = map_cache_dir.start
+tearDownModule = map_cache_dir.stop
+
+
+class TestGenerator(unittest.TestCase):
+    def test_map(self):
+        vehicles = {"spg": 2, "heavy_tank": 3}
+        data = generate_map(25, 0.2, 2, vehicles, seed=1)
+        map_ = GameMap(data)
+        self.assertEqual(25, map_.size)
+        self.assertEqual(2 * 5, len(map_.spawn_points))
+        self.assertEqual(2, len(map_.light_repairs))
+        self.assertIn(Cell(0, 0, 0), map_.base)
+        self.assertGreater(len(map_.obstacles), 0.15 * len(map_.cells))
+        self.assertFalse(map_.obstacles & (map_.get_content_cells() - map_.obstacles))
+        self.assertEqual(data, generate_map(25, 0.2, 2, vehicles, seed=1))
+        self.assertNotEqual(data, generate_map(25, 0.2, 2, vehicles, seed=2))
+
+    def test_reachable(self):
+        map_ = GameMap(generate_map(30, 0.6, 6, seed=3))
+        tables = MapTables(map_)
+        distances = tables.bfs_distances([tables.index[cell] for cell in map_.base])
+        for cell in map_.get_content_cells() - map_.obstacles:
+            self.assertNotEqual(NO_CELL, distances[tables.index[cell]])
+
+    def test_state(self):
+        map_data = generate_map(40, 0.1, 3, seed=4)
+        state = GameState(generate_state(map_data), 1)
+        self.assertEqual(5, len(state.our_tanks))
+        self.assertEqual(15, len(state.tank_cells))
+        scattered = GameState(generate_state(map_data, scatter=True, seed=4), 2)
+        self.assertEqual(15, len(scattered.tank_cells))
+        self.assertFalse(scattered.tank_cells & GameMap(map_data).obstacles)
+
+    def test_play(self):
+        sim = Simulator.from_map_data(generate_map(20, 0.1, 3, seed=5), 10)
+        winner = sim.play({idx: SimulatedPlayer(idx) for idx in sim.players})
+        self.assertTrue(sim.is_finished)
+        self.assertIn(winner, sim.players + [None])
+
+
+if __name__ == "__main__":
+    unittest.main()
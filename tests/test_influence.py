@@ -0,0 +1,97 @@
+import unittest
+
+from logic.cell import Cell
+from logic.influence import FEATURES, InfluenceCache
+from logic.model import TankModel
+from logic.simulator import Simulator
+from logic.vehicle import LightTank, MediumTank, Vehicle
+from tests.test_simulator import MAP_DATA, TempMapCache, move
+
+
+map_cache_dir = TempMapCache()
+setUpModule = map_cache_dir.start
+tearDownModule = map_cache_dir.stop
+
+
+class TestInfluenceMap(unittest.TestCase):
+    def setUp(self):
+        self.sim = Simulator.from_map_data(MAP_DATA)
+        self.state = self.sim.get_state(1)
+        self.cache = InfluenceCache()
+        self.influence = self.cache.get_influence(self.state, self.sim.map)
+        self.index = self.influence.layers.tables.index
+
+    def test_threat(self):
+        attack_index = self.sim.map.attack_index
+        for cell in self.sim.map.get_available_cells():
+            threat = self.influence.threat[self.index[cell]]
+            self.assertEqual(
+                attack_index.is_hot_spot(cell, self.state.enemy_tanks), threat > 0
+            )
+
+    def test_targets(self):
+        attack_index = self.sim.map.attack_index
+        targets = self.influence.get_targets("spg", 1)
+        for cell in self.sim.map.get_available_cells():
+            expected = sum(
+                attack_index.can_shoot("spg", 1, cell, target)
+                for target in self.state.aggressive_tanks
+            )
+            self.assertEqual(expected, targets[self.index[cell]])
+        self.assertIs(targets, self.influence.get_targets("spg", 1))
+
+    def test_cache(self):
+        influence = self.cache.get_influence(self.state, self.sim.map)
+        self.assertIs(self.influence, influence)
+        t_id, tank = next(iter(self.state.our_tanks.items()))
+        reachable = Vehicle.build(t_id, tank).get_reachable(self.state, self.sim.map)
+        self.state.update_data(move(t_id, reachable.nearest(Cell(0, 0, 0))))
+        self.assertIsNot(
+            self.influence, self.cache.get_influence(self.state, self.sim.map)
+        )
+
+    def test_flee(self):
+        attack_index = self.sim.map.attack_index
+        enemies = self.state.enemy_tanks
+        cells = sorted(self.sim.map.get_available_cells(), key=tuple)
+        hot = next(cell for cell in cells if attack_index.is_hot_spot(cell, enemies))
+        safe = next(
+            cell
+            for cell in cells
+            if not attack_index.is_hot_spot(cell, enemies)
+            and cell.cube_distance(hot) == 1
+        )
+        for vehicle_type, vehicle_class, expected in (
+            ("medium_tank", MediumTank, hot),
+            ("light_tank", LightTank, safe),
+        ):
+            vector = [vehicle_class.WEIGHTS.get(name, 0.0) for name in FEATURES]
+            choice = self.influence.choose(
+                [safe, hot], vector, vehicle_type, 0, priority=hot, step=hot
+            )
+            self.assertEqual(expected, choice)
+
+
+class TestVehicleWeights(unittest.TestCase):
+    def test_step(self):
+        sim = Simulator.from_map_data(MAP_DATA)
+        state = sim.get_state(1)
+        t_id, tank = next(
+            (t_id, tank)
+            for t_id, tank in state.our_tanks.items()
+            if tank.vehicle_type == "medium_tank"
+        )
+        vehicle = Vehicle.build(t_id, tank)
+        vehicle.priority = Cell(0, 0, 0)
+        path = vehicle.get_path(state, sim.map)
+        self.assertEqual(path[-1], vehicle.move_to_priority(sim.map, state))
+
+    def test_repair(self):
+        spawn = Cell(-5, -5, 10)
+        tank = Vehicle.build(0, TankModel(2, "medium_tank", spawn, 0, 0, spawn))
+        weights = dict(zip(FEATURES, tank.get_weights()))
+        self.assertEqual(0, weights["light_repair_distance"])
+        tank.model.health = 1
+        weights = dict(zip(FEATURES, tank.get_weights()))
+        self.assertEqual(Vehicle.REPAIR_WEIGHT, weights["light_repair_distance"])
+        self.assertEqual(Vehicle.REPAIR_WEIGHT, weights["hard_repair_distance"])
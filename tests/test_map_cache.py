@@ -0,0 +1,56 @@
+import os
+import struct
+import tempfile
+import unittest
+
+from logic import map_cache
+from logic.map_tables import MapTables
+from logic.model import GameMap
+from tests.test_simulator import MAP_DATA
+
+
+class TestMapCache(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.map = GameMap(MAP_DATA)
+        self.path = map_cache.get_path(self.directory, self.map)
+
+    def assert_equal_tables(self, expected, actual):
+        for name in ("cells", "index", "coords", "flags", "neighbours", "rays"):
+            self.assertEqual(getattr(expected, name), getattr(actual, name), name)
+        self.assertEqual(expected.base_distance, actual.base_distance)
+        self.assertEqual((expected.name, expected.size), (actual.name, actual.size))
+
+    def test_load(self):
+        self.assertIsNone(map_cache.load_tables(self.path, self.map))
+        built = map_cache.get_tables(self.map, self.directory)
+        self.assertTrue(os.path.exists(self.path))
+        loaded = map_cache.load_tables(self.path, self.map)
+        self.assert_equal_tables(MapTables(self.map), built)
+        self.assert_equal_tables(built, loaded)
+        self.assertEqual(built.distance(0, 5), loaded.distance(0, 5))
+
+    def test_content_hash(self):
+        other = GameMap(MAP_DATA)
+        self.assertEqual(self.path, map_cache.get_path(self.directory, other))
+        other.obstacles = set(other.obstacles)
+        other.obstacles.pop()
+        self.assertNotEqual(self.path, map_cache.get_path(self.directory, other))
+
+    def test_invalidation(self):
+        map_cache.get_tables(self.map, self.directory)
+        with open(self.path, "r+b") as file:
+            file.seek(4)
+            file.write(struct.pack("<H", map_cache.VERSION + 1))
+        self.assertIsNone(map_cache.load_tables(self.path, self.map))
+        map_cache.get_tables(self.map, self.directory)
+        self.assertIsNotNone(map_cache.load_tables(self.path, self.map))
+
+        with open(self.path, "r+b") as file:
+            file.truncate(os.path.getsize(self.path) - 1)
+        self.assertIsNone(map_cache.load_tables(self.path, self.map))
+        with open(self.path, "wb"):
+            pass
+        self.assertIsNone(map_cache.load_tables(self.path, self.map))
@@ -0,0 +1,111 @@
+import unittest
+from functools import reduce
+
+from logic.cell import Cell
+from logic.model import GameState, VehicleColumns
+from logic.simulator import Simulator
+from tests.test_simulator import MAP_DATA, move, shoot
+
+
+def to_cell(position):
+    return Cell(position["x"], position["y"], position["z"])
+
+
+class TestVehicleColumns(unittest.TestCase):
+    def setUp(self):
+        self.sim = Simulator.from_map_data(MAP_DATA)
+        self.sim.attacked[3] = frozenset({2})
+        self.data = self.sim.state_data()
+        self.vehicles = dict(self.data["vehicles"])
+        self.state = GameState(self.data, 1)
+
+    def test_views(self):
+        state = self.state
+        expected = {
+            int(t_id): i for t_id, i in self.vehicles.items() if i["player_id"] == 1
+        }
+        self.assertEqual(set(expected), set(state.our_tanks))
+        for t_id, tank in state.our_tanks.items():
+            i = expected[t_id]
+            self.assertEqual(t_id, tank.t_id)
+            self.assertEqual(i["vehicle_type"], tank.vehicle_type)
+            self.assertEqual(to_cell(i["position"]), tank.coordinates)
+            self.assertEqual(to_cell(i["spawn_position"]), tank.spawn_point)
+            self.assertEqual(i["health"], tank.health)
+        enemies = {
+            to_cell(i["position"]): int(t_id)
+            for t_id, i in self.vehicles.items()
+            if i["player_id"] != 1
+        }
+        self.assertEqual(
+            enemies, {cell: tank.t_id for cell, tank in state.enemy_tanks.items()}
+        )
+        self.assertEqual(
+            {to_cell(i["position"]) for i in self.vehicles.values()}, state.tank_cells
+        )
+        self.assertEqual({3}, state.get_non_neutral_players())
+        aggressive = {
+            to_cell(i["position"]): i["health"]
+            for i in self.vehicles.values()
+            if i["player_id"] == 3
+        }
+        self.assertEqual(aggressive, state.aggressive_tanks)
+        self.assertEqual(len(self.vehicles), len(state.vehicles))
+        for cell, row in state.vehicles.items():
+            self.assertEqual(cell, state.columns.get_cells()[row])
+        for tank in state.get_vehicles_within(Cell(0, 0, 0), 10):
+            self.assertIs(tank, state.our_tanks.get(tank.t_id, tank))
+            self.assertIs(tank, state.enemy_tanks.get(tank.coordinates, tank))
+
+    def test_lazy_enemies(self):
+        state = self.state
+        self.assertTrue(state.aggressive_tanks)
+        state.get_vehicles_within(Cell(-5, -5, 10), 3)
+        self.assertEqual({}, state.enemy_tanks.tanks)
+        cell = next(iter(state.enemy_tanks))
+        tank = state.enemy_tanks[cell]
+        self.assertIs(tank, state.enemy_tanks[cell])
+        self.assertEqual([cell], list(state.enemy_tanks.tanks))
+
+    def test_zobrist(self):
+        tanks = [*self.state.our_tanks.values(), *self.state.enemy_tanks.values()]
+        self.assertEqual(
+            reduce(lambda result, tank: result ^ tank.zobrist(), tanks, 0),
+            self.state.columns.get_zobrist(),
+        )
+        self.assertEqual(0, len(VehicleColumns({})))
+
+    def test_update(self):
+        state = self.state
+        state.update_data(move(2, Cell(-4, -4, 8)))
+        target = next(iter(state.aggressive_tanks))
+        state.update_data(shoot(1, target))
+        columns = state.columns
+        enemy = state.enemy_tanks[target]
+        self.assertEqual(enemy.health, columns.health[columns.rows[enemy.t_id]])
+        self.assertIn(Cell(-4, -4, 8), columns.get_cells())
+        self.assertEqual(state.tank_cells, set(columns.get_cells()))
+        self.assertEqual(state.zobrist, state.hash_state())
+        self.assertEqual(
+            [state.our_tanks[2]], state.get_vehicles_within(Cell(-4, -4, 8), 0)
+        )
+
+    def test_shoot_fresh_state(self):
+        target = next(
+            to_cell(i["position"])
+            for i in self.vehicles.values()
+            if i["player_id"] == 3 and i["vehicle_type"] == "heavy_tank"
+        )
+        medium_id = next(
+            t_id
+            for t_id, tank in self.state.our_tanks.items()
+            if tank.vehicle_type == "medium_tank"
+        )
+        self.state.update_data(shoot(medium_id, target))
+        health = self.state.enemy_tanks[target].health
+        self.assertEqual(2, health)
+        self.assertEqual(health, self.state.aggressive_tanks[target])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from logic.parallel import ParallelEvaluator, apply_delta, create_search, diff_state
+from logic.search import BeamSearch
+from logic.simulator import Simulator, SimulatedPlayer
+from tests.test_simulator import MAP_DATA, TempMapCache
+
+
+map_cache_dir = TempMapCache()
+setUpModule = map_cache_dir.start
+tearDownModule = map_cache_dir.stop
+
+
+class TestParallel(unittest.TestCase):
+    def setUp(self):
+        self.sim = Simulator.from_map_data(MAP_DATA)
+        self.state = self.sim.get_state(1)
+        self.player = SimulatedPlayer(1)
+        self.player.init_vehicles(self.state)
+
+    def test_delta(self):
+        old = self.sim.encode()
+        actions = BeamSearch().plan(self.state, self.sim.map, self.player.vehicles_list)
+        self.sim.step(actions)
+        new = self.sim.encode()
+        delta = diff_state(old, new)
+        self.assertLessEqual(len(delta["changed_vehicles"]), len(actions))
+        self.assertEqual(new, apply_delta(old, delta))
+        self.assertEqual(new, apply_delta(None, diff_state(None, new)))
+        decoded = Simulator.decode(self.sim.map, new, self.sim.tables)
+        self.assertEqual(self.sim.state_data(), decoded.state_data())
+
+    def test_score(self):
+        engine = BeamSearch()
+        root = Simulator.from_game_state(
+            self.sim.map, self.state, engine.get_tables(self.sim.map)
+        )
+        distances = engine.base_distance[self.sim.map.name]
+        candidates = [[]]
+        for command, cell in engine.candidates(root, 0, distances)[:-1]:
+            candidates.append([(command, 0, cell)])
+        expected = []
+        for candidate in candidates:
+            sim = root.fork()
+            for action in candidate:
+                sim.act(*action)
+            expected.append(engine.look_ahead(sim, 1, distances))
+        with ParallelEvaluator(2) as evaluator:
+            self.assertEqual(expected, evaluator.score(root, candidates, 1))
+            self.assertEqual(expected, evaluator.score(root, candidates, 1))
+
+    def test_create_search(self):
+        self.assertIsNone(create_search(0).evaluator)
+        engine = create_search(2)
+        self.assertEqual(2, engine.evaluator.processes)
+        actions = engine.plan(self.state, self.sim.map, self.player.vehicles_list)
+        self.assertEqual(2, len(engine.evaluator.workers))
+        engine.evaluator.close()
+        for action in actions:
+            self.assertTrue(self.sim.apply(action))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import random
+import unittest
+
+from config import game_balance as gb_cf
+from logic.cell import Cell
+from logic.model import GameMap
+from logic.pathfinding import DStarLite, Reachability, find_nearest
+from logic.simulator import Simulator
+from logic.vehicle import Vehicle
+from tests.test_simulator import MAP_DATA, move
+
+
+class TestReachability(unittest.TestCase):
+    def test_walls(self):
+        start = Cell(0, 0, 0)
+        walls = {Cell(1, -1, 0), Cell(1, 0, -1), Cell(0, 1, -1)}
+        passable = start.in_radius(3) - walls
+        reachable = Reachability(start, 2, passable, {Cell(-1, 1, 0)})
+        self.assertNotIn(Cell(2, -1, -1), reachable)
+        self.assertNotIn(Cell(-1, 1, 0), reachable)
+        self.assertNotIn(start, reachable)
+        self.assertIn(Cell(-2, 2, 0), reachable)
+        self.assertEqual(
+            [Cell(-1, 1, 0), Cell(-2, 2, 0)], reachable.get_path(Cell(-2, 2, 0))
+        )
+        cells = walls | {Cell(-1, 2, -1)}
+        self.assertEqual(Cell(-1, 2, -1), reachable.nearest(Cell(0, 3, -3), cells))
+        self.assertIsNone(reachable.nearest(Cell(0, 3, -3), walls))
+
+    def test_simulator_rules(self):
+        rng = random.Random(0)
+        sim = Simulator.from_map_data(MAP_DATA)
+        passable = sim.map.cells - sim.map.obstacles
+        for _ in range(10):
+            for vehicle in range(len(sim.owner)):
+                cells = sim.reachable_cells(vehicle)
+                if cells:
+                    sim.move(vehicle, rng.choice(cells))
+        tank_cells = {sim.tables.cells[cell] for cell in sim.position}
+        for vehicle, position in enumerate(sim.position):
+            start = sim.tables.cells[position]
+            spawn = sim.tables.cells[sim.spawn[vehicle]]
+            speed = gb_cf.SPEED_POINTS[sim.vehicle_type[vehicle]]
+            blocked = tank_cells | sim.map.spawn_points - {spawn}
+            reachable = Reachability(start, speed, passable, blocked)
+            expected = {sim.tables.cells[cell] for cell in sim.reachable_cells(vehicle)}
+            self.assertEqual(expected, reachable.cells)
+            for cell in reachable.cells:
+                path = reachable.get_path(cell)
+                self.assertEqual(reachable.distance[cell], len(path))
+                self.assertLessEqual(len(path), speed)
+                for previous, step in zip([start] + path, path):
+                    self.assertEqual(1, previous.cube_distance(step))
+                    self.assertIn(step, passable)
+
+
+class TestFindNearest(unittest.TestCase):
+    def test_walls(self):
+        start = Cell(0, 0, 0)
+        wall = {Cell(1, -1, 0), Cell(1, 0, -1), Cell(0, 1, -1), Cell(2, -1, -1)}
+        wall |= {Cell(1, 1, -2), Cell(2, 0, -2), Cell(3, -2, -1), Cell(3, -1, -2)}
+        behind_wall = Cell(2, 1, -3)
+        open_goal = Cell(-4, 0, 4)
+        passable = start.in_radius(6) - wall
+        goal, path = find_nearest(start, passable, {behind_wall, open_goal})
+        self.assertEqual(open_goal, goal)
+        self.assertEqual(4, len(path))
+        self.assertEqual((start, []), find_nearest(start, passable, {start}))
+        self.assertEqual((None, []), find_nearest(start, passable, wall))
+
+    def test_shortest(self):
+        rng = random.Random(0)
+        game_map = GameMap(MAP_DATA)
+        passable = game_map.get_available_cells()
+        cells = sorted(passable, key=tuple)
+        for _ in range(50):
+            start = rng.choice(cells)
+            goals = set(rng.sample(cells, rng.randint(1, 4)))
+            distance = Reachability(start, 100, passable, set()).distance
+            goal, path = find_nearest(start, passable, goals)
+            self.assertIn(goal, goals)
+            self.assertEqual(min(distance[cell] for cell in goals), len(path))
+            self.assertEqual(distance[goal], len(path))
+            for previous, step in zip([start] + path, path):
+                self.assertEqual(1, previous.cube_distance(step))
+                self.assertIn(step, passable)
+
+
+class TestDStarLite(unittest.TestCase):
+    def setUp(self):
+        self.map = GameMap(MAP_DATA)
+        self.passable = self.map.get_available_cells()
+        self.cells = sorted(self.passable, key=tuple)
+
+    def test_repair(self):
+        rng = random.Random(0)
+        for _ in range(5):
+            goal, start = rng.sample(self.cells, 2)
+            planner = DStarLite(goal, self.passable)
+            for _ in range(20):
+                blocked = set(rng.sample(self.cells, 30)) - {start, goal}
+                planner.update(start, blocked)
+                free = self.passable - blocked
+                distance = Reachability(start, 100, free, set()).distance
+                path = planner.get_path()
+                if goal not in distance:
+                    self.assertIsNone(path)
+                    continue
+                self.assertEqual(distance[goal], len(path))
+                for previous, step in zip([start] + path, path):
+                    self.assertEqual(1, previous.cube_distance(step))
+                    self.assertIn(step, free)
+                if path:
+                    start = path[min(len(path), rng.randint(1, 3)) - 1]
+
+    def test_incremental(self):
+        start, goal = Cell(-7, -3, 10), Cell(6, -3, -3)
+        planner = DStarLite(goal, self.passable)
+        planner.update(start, set())
+        path = planner.get_path()
+        self.assertEqual(13, len(path))
+        self.assertEqual(path[:2], planner.get_path(2))
+        expanded = planner.expanded
+        planner.update(path[1], set())
+        self.assertEqual(expanded, planner.expanded)
+        self.assertEqual(path[2:], planner.get_path())
+        planner.update(path[1], {Cell(-2, 9, -7)})
+        self.assertEqual(expanded, planner.expanded)
+        planner.update(path[1], {path[2]})
+        self.assertLess(expanded, planner.expanded)
+        distance = Reachability(path[1], 100, self.passable - {path[2]}, set()).distance
+        self.assertEqual(distance[goal], len(planner.get_path()))
+
+    def test_spawn_start(self):
+        spawn = Cell(-5, -5, 10)
+        self.assertNotIn(spawn, self.passable)
+        planner = DStarLite(Cell(0, 0, 0), self.passable)
+        blocked = spawn.neighbours() & self.passable
+        planner.update(spawn, blocked)
+        self.assertIsNone(planner.get_path())
+        self.assertEqual(0, planner.expanded)
+        planner.update(spawn, set())
+        self.assertEqual(10, len(planner.get_path()))
+
+
+class TestVehicleReachability(unittest.TestCase):
+    def test_once_per_turn(self):
+        sim = Simulator.from_map_data(MAP_DATA)
+        state = sim.get_state(1)
+        t_id, tank = next(
+            (t_id, tank)
+            for t_id, tank in state.our_tanks.items()
+            if tank.vehicle_type == "light_tank"
+        )
+        vehicle = Vehicle.build(t_id, tank)
+        reachable = vehicle.get_reachable(state, sim.map)
+        self.assertIs(reachable, vehicle.get_reachable(state, sim.map))
+        self.assertTrue(reachable.cells.isdisjoint(state.tank_cells))
+
+        other_id = next(i for i in state.our_tanks if i != t_id)
+        state.update_data(move(other_id, reachable.nearest(Cell(0, 0, 0))))
+        moved = vehicle.get_reachable(state, sim.map)
+        self.assertIsNot(reachable, moved)
+        self.assertTrue(moved.cells.isdisjoint(state.tank_cells))
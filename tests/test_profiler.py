@@ -0,0 +1,66 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from logic.profiler import Histogram, TurnProfiler
+
+
+class TestHistogram(unittest.TestCase):
+    def test_buckets(self):
+        for value in (0, 31, 32, 47, 48, 63, 64, 1000, 123456, 2**39):
+            index = Histogram.get_index(value)
+            self.assertLessEqual(Histogram.get_value(index), value)
+            self.assertGreater(Histogram.get_value(index + 1), value)
+            self.assertLessEqual(value - Histogram.get_value(index), value / 16)
+
+    def test_percentile(self):
+        histogram = Histogram()
+        self.assertEqual(0, histogram.percentile(50))
+        for value in range(1, 1001):
+            histogram.record(value)
+        self.assertEqual((1000, 1, 1000), (histogram.count, histogram.min, histogram.max))
+        self.assertAlmostEqual(500, histogram.percentile(50), delta=500 / 16)
+        self.assertAlmostEqual(990, histogram.percentile(99), delta=990 / 16)
+        self.assertEqual(1000, histogram.percentile(100))
+
+    def test_merge(self):
+        first, second, both = Histogram(), Histogram(), Histogram()
+        for value in (5, 50, 500):
+            first.record(value)
+            both.record(value)
+        for value in (7, 7000):
+            second.record(value)
+            both.record(value)
+        first.merge(second)
+        self.assertEqual(both.to_dict(), first.to_dict())
+
+
+class TestTurnProfiler(unittest.TestCase):
+    def test_instrument(self):
+        class Vehicle:
+            def make_turn(self, value):
+                return value * 2
+
+        profiler = TurnProfiler()
+        vehicle = Vehicle()
+        profiler.instrument(vehicle, ("make_turn",), "decision.Vehicle")
+        self.assertEqual(4, vehicle.make_turn(2))
+        vehicle.make_turn(3)
+        self.assertEqual(2, profiler.histograms["decision.Vehicle.make_turn"].count)
+        self.assertIn("decision.Vehicle.make_turn", profiler.summary())
+
+    def test_dump(self):
+        profiler = TurnProfiler()
+        for _ in range(3):
+            profiler.record("network", time.perf_counter() - 0.002)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.json")
+            profiler.dump(path)
+            with open(path) as file:
+                data = json.load(file)
+        network = data["phases"]["network"]
+        self.assertEqual(3, network["count"])
+        self.assertGreaterEqual(network["p50"], 2000)
+        self.assertEqual(3, sum(network["buckets"].values()))
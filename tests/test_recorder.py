@@ -0,0 +1,136 @@
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+from config import config as cf
+from connection import Connection
+from logic.model import GameState
+from logic.simulator import Simulator
+from recorder import ReplayReader, WireRecorder
+from tests.test_simulator import MAP_DATA
+
+TURNS = 3
+
+
+def serve(sock, sim):
+    """
+    Replies to requests of Connection like game server, turn ends on TURN
+    """
+    while True:
+        header = sock.recv(cf.ACTION_ENCODE_SIZE + cf.LENGTH_ENCODE_SIZE)
+        if not header:
+            break
+        action = cf.Actions(int.from_bytes(header[:4], byteorder="little"))
+        length = int.from_bytes(header[4:], byteorder="little")
+        if length:
+            sock.recv(length)
+        response = {
+            cf.Actions.LOGIN: {"idx": 1},
+            cf.Actions.MAP: MAP_DATA,
+            cf.Actions.GAME_STATE: sim.state_data(),
+        }.get(action)
+        if action == cf.Actions.TURN:
+            sim.end_turn()
+        payload = b"" if response is None else json.dumps(response).encode()
+        sock.sendall(
+            cf.StatusCode.OKEY.to_bytes(cf.RESULT_CODE_SIZE, byteorder="little")
+            + len(payload).to_bytes(cf.LENGTH_ENCODE_SIZE, byteorder="little")
+            + payload
+        )
+
+
+class TestRecorder(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "game.wgr")
+        self.sim = Simulator.from_map_data(MAP_DATA)
+
+    def record_game(self):
+        client, server = socket.socketpair()
+        thread = threading.Thread(target=serve, args=(server, self.sim))
+        thread.start()
+        connection = Connection(WireRecorder(self.path))
+        connection.sock.close()
+        connection.sock = client
+        connection.send(cf.Actions.LOGIN, {"name": "bot", "password": "42"})
+        game_map = connection.send(cf.Actions.MAP)
+        states = []
+        for _ in range(TURNS):
+            states.append(connection.send(cf.Actions.GAME_STATE))
+            connection.send(cf.Actions.GAME_STATE)
+            connection.send(cf.Actions.TURN)
+        connection.close_connection()
+        thread.join()
+        server.close()
+        return game_map, states
+
+    def test_replay(self):
+        game_map, states = self.record_game()
+        with ReplayReader(self.path) as reader:
+            self.assertEqual(2 + 3 * TURNS, len(reader))
+            self.assertEqual([(1, turn) for turn in range(TURNS)], reader.get_turns())
+            login = reader.get_record(0)
+            self.assertEqual(cf.Actions.LOGIN, login.action)
+            self.assertEqual(cf.StatusCode.OKEY, login.status)
+            self.assertNotIn(b"password", login.request)
+            self.assertLessEqual(login.sent, login.received)
+            self.assertEqual(1, reader.get_idx(1))
+            self.assertEqual(game_map["name"], reader.get_map(1).name)
+            for turn in reversed(range(TURNS)):
+                state = reader.get_state(1, turn)
+                expected = GameState(states[turn], 1)
+                self.assertEqual(expected.zobrist, state.zobrist)
+                self.assertEqual(turn, state.current_turn)
+            self.assertIsNone(reader.get_record(4).get_response())
+
+    def test_incomplete_record(self):
+        self.record_game()
+        with open(self.path, "ab") as file:
+            file.write(b"\x01\x00\x00")
+        with ReplayReader(self.path) as reader:
+            self.assertEqual(2 + 3 * TURNS, len(reader))
+
+    def test_append(self):
+        self.record_game()
+        self.record_game()
+        with ReplayReader(self.path) as reader:
+            self.assertEqual(2 * (2 + 3 * TURNS), len(reader))
+
+    def test_flush_interval(self):
+        recorder = WireRecorder(self.path, flush_interval=1000)
+        self.addCleanup(recorder.close)
+        flushes = []
+        recorder.flush = lambda: flushes.append(True)
+        for _ in range(5):
+            sent = time.time()
+            recorder.record(cf.Actions.TURN, None, cf.StatusCode.OKEY, b"", sent, sent)
+        self.assertFalse(flushes)
+
+    def test_error_response(self):
+        recorder = WireRecorder(self.path)
+        response = json.dumps({"error_message": "Game is not started"}).encode()
+        sent = time.time()
+        recorder.record(
+            cf.Actions.GAME_STATE,
+            None,
+            cf.StatusCode.INAPPROPRIATE_GAME_STATE,
+            response,
+            sent,
+            sent,
+        )
+        recorder.close()
+        with ReplayReader(self.path) as reader:
+            self.assertEqual(1, len(reader))
+            self.assertEqual([], reader.get_turns())
+            record = reader.get_record(0)
+            self.assertEqual(cf.StatusCode.INAPPROPRIATE_GAME_STATE, record.status)
+            self.assertIn("error_message", record.get_response())
+
+
+if __name__ == "__main__":
+    unittest.main()
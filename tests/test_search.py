@@ -0,0 +1,69 @@
+import random
+import unittest
+
+from logic.model import GameState
+from logic.search import BeamSearch
+from logic.simulator import Simulator, SimulatedPlayer
+from tests.test_simulator import MAP_DATA, TempMapCache
+
+
+map_cache_dir = TempMapCache()
+setUpModule = map_cache_dir.start
+tearDownModule = map_cache_dir.stop
+
+
+class TestBeamSearch(unittest.TestCase):
+    def setUp(self):
+        self.sim = Simulator.from_map_data(MAP_DATA)
+        self.player = SimulatedPlayer(1)
+        self.state = self.sim.get_state(1)
+        self.player.init_vehicles(self.state)
+
+    def test_plan(self):
+        engine = BeamSearch()
+        actions = engine.plan(self.state, self.sim.map, self.player.vehicles_list)
+        self.assertTrue(actions)
+        for action in actions:
+            self.assertTrue(self.sim.apply(action))
+        cached = engine.plan(self.state, self.sim.map, self.player.vehicles_list)
+        self.assertIs(actions, cached)
+
+    def test_capture_points_key(self):
+        engine = BeamSearch()
+        actions = engine.plan(self.state, self.sim.map, self.player.vehicles_list)
+        data = self.sim.state_data()
+        t_id = str(self.player.vehicles_list[0].t_id)
+        data["vehicles"][t_id]["capture_points"] = 1
+        state = GameState(data, 1)
+        self.assertEqual(self.state.zobrist, state.zobrist)
+        other = engine.plan(state, self.sim.map, self.player.vehicles_list)
+        self.assertIsNot(actions, other)
+
+    def test_time_budget(self):
+        engine = BeamSearch(time_budget=0)
+        actions = engine.plan(self.state, self.sim.map, self.player.vehicles_list)
+        self.assertEqual(len(self.player.vehicles_list), len(actions))
+
+    def test_play(self):
+        random.seed(0)
+        sim = Simulator.from_map_data(MAP_DATA, num_turns=15)
+        players = {i: SimulatedPlayer(i) for i in sim.players}
+        players[1] = SimulatedPlayer(1, engine=BeamSearch())
+        sim.play(players)
+        self.assertTrue(sim.is_finished)
+
+    def test_fork(self):
+        child = self.sim.fork()
+        actions = BeamSearch().plan(
+            self.state, self.sim.map, self.player.vehicles_list
+        )
+        before = self.sim.state_data()
+        child.step(actions)
+        self.assertEqual(before, self.sim.state_data())
+        self.assertNotEqual(before, child.state_data())
+        child.undo()
+        self.assertEqual(before, child.state_data())
+
+
+if __name__ == "__main__":
+    unittest.main()
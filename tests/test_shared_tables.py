@@ -0,0 +1,144 @@
+import multiprocessing
+import unittest
+from unittest import mock
+
+from logic.cell import Cell
+from logic.influence import InfluenceCache
+from logic.map_tables import MapTables, NO_CELL
+from logic.model import GameMap
+from logic.search import BeamSearch
+from logic import shared_tables
+from logic.shared_tables import (
+    SharedMapTables,
+    attach_tables,
+    get_map_tables,
+    share_tables,
+)
+from logic.simulator import Simulator
+from tests.test_simulator import MAP_DATA, TempMapCache
+
+
+map_cache_dir = TempMapCache()
+setUpModule = map_cache_dir.start
+tearDownModule = map_cache_dir.stop
+
+
+def read_rays(queue):
+    tables = attach_tables(GameMap(MAP_DATA))
+    queue.put(None if tables is None else list(tables.rays))
+
+
+def share_rays(queue):
+    tables = share_tables(GameMap(MAP_DATA))
+    queue.put(list(tables.rays))
+    queue.get(timeout=30)  # publisher lives until the other bot has attached
+    del tables
+    shared_tables.publisher.close()  # atexit is not called in child process
+
+
+def use_tables(queue):
+    map_ = GameMap(MAP_DATA)
+    error = AssertionError("tables are built")
+    with mock.patch.object(MapTables, "__init__", side_effect=error), mock.patch(
+        "logic.shared_tables.get_tables", side_effect=error
+    ):
+        map_.tables = share_tables(map_)
+        layers = InfluenceCache().get_layers(map_)
+        tables = BeamSearch().get_tables(map_)
+    queue.put(
+        (
+            tables is map_.tables is get_map_tables(map_),
+            layers.tables is map_.tables,
+            bool(shared_tables.publisher.blocks),
+            list(tables.rays),
+        )
+    )
+
+
+class TestSharedTables(unittest.TestCase):
+    def setUp(self):
+        self.map = GameMap(MAP_DATA)
+        self.tables = MapTables(self.map)
+
+    def test_attach(self):
+        self.assertIsNone(attach_tables(self.map))
+        with SharedMapTables() as shared:
+            shared.publish(self.map, self.tables)
+            attached = attach_tables(self.map)
+            self.assertEqual(self.tables.cells, list(attached.cells))
+            self.assertEqual(self.tables.cells[-3:], attached.cells[-3:])
+            self.assertEqual(self.tables.index, dict(attached.index))
+            self.assertEqual(
+                [self.tables.index[cell] for cell in self.map.base],
+                [attached.index[cell] for cell in self.map.base],
+            )
+            self.assertNotIn(Cell(20, -20, 0), attached.index)
+            self.assertEqual(NO_CELL, attached.index.get(Cell(1, 1, 1), NO_CELL))
+            self.assertEqual(
+                list(self.tables.base_distance), list(attached.base_distance)
+            )
+            for name in ("coords", "neighbours", "rays", "flags"):
+                self.assertEqual(
+                    list(getattr(self.tables, name)), list(getattr(attached, name))
+                )
+            self.assertEqual(self.tables.get_ray(7, 2, 3), attached.get_ray(7, 2, 3))
+            with self.assertRaises(TypeError):
+                attached.neighbours[0] = 1
+
+            sim = Simulator(self.map, [1, 2, 3], tables=attached)
+            self.assertEqual(
+                self.tables.bfs_distances([0]), attached.bfs_distances([0])
+            )
+            BeamSearch().greedy_turn(sim, attached.base_distance)
+            del sim, attached
+        self.assertIsNone(attach_tables(self.map))
+
+    def test_other_process(self):
+        queue = multiprocessing.Queue()
+        with SharedMapTables() as shared:
+            shared.publish(self.map, self.tables)
+            process = multiprocessing.Process(target=read_rays, args=(queue,))
+            process.start()
+            rays = queue.get(timeout=30)
+            process.join()
+            self.assertEqual(list(self.tables.rays), rays)
+            self.assertIsNotNone(attach_tables(self.map))
+
+    def test_share(self):
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=share_rays, args=(queue,))
+        process.start()
+        rays = queue.get(timeout=30)
+        attached = share_tables(self.map)
+        self.assertFalse(shared_tables.publisher.blocks)
+        self.assertEqual(list(self.tables.rays), rays)
+        self.assertEqual(rays, list(attached.rays))
+        queue.put(None)
+        process.join()
+        del attached
+        self.assertIsNone(attach_tables(self.map))
+
+        self.addCleanup(shared_tables.publisher.close)
+        attached = share_tables(self.map)
+        self.assertEqual(1, len(shared_tables.publisher.blocks))
+        self.assertEqual(list(self.tables.rays), list(attached.rays))
+
+    def test_use_in_other_process(self):
+        queue = multiprocessing.Queue()
+        with SharedMapTables() as shared:
+            shared.publish(self.map, self.tables)
+            process = multiprocessing.Process(target=use_tables, args=(queue,))
+            process.start()
+            same, layers, published, rays = queue.get(timeout=30)
+            process.join()
+        self.assertTrue(same)
+        self.assertTrue(layers)
+        self.assertFalse(published)
+        self.assertEqual(list(self.tables.rays), rays)
+
+    def test_get_map_tables(self):
+        tables = get_map_tables(self.map)
+        self.assertIs(tables, self.map.tables)
+        self.assertIs(tables, get_map_tables(self.map))
+        self.assertIsNone(getattr(tables, "block", None))
+        self.assertEqual(list(self.tables.rays), list(tables.rays))
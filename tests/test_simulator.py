@@ -0,0 +1,157 @@
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from config import config as cf
+from config.config import Actions
+from logic.cell import Cell
+from logic.model import GameState
+from logic.simulator import Simulator, SimulatedPlayer
+
+
+def point(x, y, z):
+    return {"x": x, "y": y, "z": z}
+
+
+def rotate(points):
+    return [point(i["z"], i["x"], i["y"]) for i in points]
+
+
+SPAWN = {
+    "spg": [point(-7, -3, 10)],
+    "light_tank": [point(-6, -4, 10)],
+    "heavy_tank": [point(-5, -5, 10)],
+    "medium_tank": [point(-4, -6, 10)],
+    "at_spg": [point(-3, -7, 10)],
+}
+MAP_DATA = {
+    "size": 11,
+    "name": "test_map",
+    "spawn_points": [
+        SPAWN,
+        {key: rotate(value) for key, value in SPAWN.items()},
+        {key: rotate(rotate(value)) for key, value in SPAWN.items()},
+    ],
+    "content": {
+        "base": [point(0, 0, 0), point(1, -1, 0), point(-1, 1, 0)],
+        "obstacle": [point(-1, -1, 2), point(2, -1, -1), point(-1, 2, -1)],
+        "light_repair": [point(-3, 6, -3)],
+        "hard_repair": [point(6, -3, -3)],
+        "catapult": [point(-3, -3, 6)],
+    },
+}
+
+
+def move(t_id, cell):
+    return Actions.MOVE, {"vehicle_id": t_id, "target": point(*cell)}
+
+
+def shoot(t_id, cell):
+    return Actions.SHOOT, {"vehicle_id": t_id, "target": point(*cell)}
+
+
+class TempMapCache:
+    """
+    Points MAP_CACHE_DIR of config to temporary directory, so tests do
+    not leave cache files in home directory
+    """
+
+    def __init__(self):
+        self.directory = None
+        self.patch = None
+
+    def start(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.patch = mock.patch.object(cf, "MAP_CACHE_DIR", self.directory.name)
+        self.patch.start()
+
+    def stop(self):
+        self.patch.stop()
+        self.directory.cleanup()
+
+
+map_cache_dir = TempMapCache()
+setUpModule = map_cache_dir.start
+tearDownModule = map_cache_dir.stop
+
+
+class TestSimulator(unittest.TestCase):
+    def setUp(self):
+        self.sim = Simulator.from_map_data(MAP_DATA)
+
+    def position(self, t_id):
+        return self.sim.tables.cells[self.sim.position[t_id - 1]]
+
+    def test_state_data(self):
+        state = GameState(self.sim.state_data(), 1)
+        self.assertEqual(5, len(state.our_tanks))
+        self.assertEqual(10, len(state.enemy_tanks))
+        self.assertEqual(15, len(state.tank_cells))
+        self.assertEqual(1, state.current_player)
+
+    def test_move(self):
+        self.assertTrue(self.sim.apply(move(2, (-4, -4, 8))))
+        self.assertEqual(Cell(-4, -4, 8), self.position(2))
+        self.assertFalse(self.sim.apply(move(2, (-3, -4, 7))))
+        self.assertFalse(self.sim.apply(move(3, (-1, -1, 2))))
+        self.assertFalse(self.sim.apply(move(3, (-5, -3, 8))))
+
+    def place(self, t_id, cell):
+        index = self.sim.tables.index[Cell(*cell)]
+        self.sim.occupied[self.sim.position[t_id - 1]] = -1
+        self.sim.occupied[index] = t_id - 1
+        self.sim.position[t_id - 1] = index
+
+    def test_catapult(self):
+        self.place(2, (-3, -2, 5))
+        self.assertTrue(self.sim.apply(move(2, (-3, -3, 6))))
+        self.assertEqual(1, self.sim.shoot_range_bonus[1])
+        self.assertEqual(1, self.sim.catapult_usage[self.sim.position[1]])
+
+    def test_shoot_and_respawn(self):
+        self.place(3, (0, -1, 1))
+        self.place(6, (-1, 0, 1))
+        self.sim.health[5] = 1
+        self.assertFalse(self.sim.apply(shoot(3, (1, 0, -1))))
+        self.assertTrue(self.sim.apply(shoot(3, (-1, 0, 1))))
+        self.assertEqual(self.sim.spawn[5], self.sim.position[5])
+        self.assertEqual(1, self.sim.kill_points[1])
+        self.assertEqual({2}, self.sim.attacked[1])
+
+    def test_at_spg_ray(self):
+        self.place(5, (0, -3, 3))
+        self.place(6, (0, -2, 2))
+        self.place(13, (0, 0, 0))
+        self.assertTrue(self.sim.apply(shoot(5, (0, -2, 2))))
+        self.assertEqual(self.sim.spawn[5], self.sim.position[5])
+        self.assertEqual(2, self.sim.health[12])
+        self.assertEqual({2, 3}, self.sim.attacked[1])
+
+    def test_neutrality(self):
+        self.sim.attacked[3] = frozenset({2})
+        self.assertFalse(self.sim.can_attack(1, 2))
+        self.assertTrue(self.sim.can_attack(1, 3))
+        self.sim.attacked[2] = frozenset({1})
+        self.assertTrue(self.sim.can_attack(1, 2))
+
+    def test_undo(self):
+        before = self.sim.state_data()
+        self.sim.step([move(2, (-4, -4, 8))])
+        self.assertEqual(2, self.sim.current_player)
+        self.sim.undo()
+        self.assertEqual(before, self.sim.state_data())
+
+    def test_play(self):
+        random.seed(0)
+        players = {i: SimulatedPlayer(i) for i in self.sim.players}
+        winner = self.sim.play(players)
+        self.assertTrue(self.sim.is_finished)
+        self.assertIn(winner, self.sim.players + [None])
+        while self.sim.steps:
+            self.sim.undo()
+        self.assertEqual(Simulator.from_map_data(MAP_DATA).state_data(), self.sim.state_data())
+
+
+if __name__ == "__main__":
+    unittest.main()
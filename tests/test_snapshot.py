@@ -0,0 +1,163 @@
+import dataclasses
+import unittest
+
+from logic.model import GameState
+from logic.search import BeamSearch
+from logic.simulator import Simulator
+from logic.snapshot import (
+    ColumnsSnapshot,
+    GameSnapshot,
+    HealthChanged,
+    VehicleAdded,
+    VehicleMoved,
+    VehicleRemoved,
+    ViewModel,
+)
+from tests.test_simulator import MAP_DATA, TempMapCache
+
+
+map_cache_dir = TempMapCache()
+setUpModule = map_cache_dir.start
+tearDownModule = map_cache_dir.stop
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.sim = Simulator.from_map_data(MAP_DATA)
+        self.engine = BeamSearch()
+        self.engine.get_tables(self.sim.map)
+
+    def play(self, turns):
+        snapshots = [GameSnapshot.from_state(self.sim.get_state(1))]
+        for _ in range(turns):
+            self.engine.greedy_turn(self.sim, self.engine.base_distance["test_map"])
+            snapshots.append(GameSnapshot.from_state(self.sim.get_state(1)))
+        return snapshots
+
+    def test_from_state(self):
+        state = GameState(self.sim.state_data(), 1)
+        snapshot = GameSnapshot.from_state(state)
+        self.assertEqual(state.tank_cells, snapshot.vehicle_cells.keys())
+        self.assertEqual(
+            list(range(1, len(snapshot.vehicles) + 1)),
+            [vehicle.t_id for vehicle in snapshot.vehicles],
+        )
+        for t_id, tank in state.our_tanks.items():
+            vehicle = snapshot.vehicle_cells[tank.coordinates]
+            self.assertEqual(
+                (t_id, 1, tank.health),
+                (vehicle.t_id, vehicle.player_id, vehicle.health),
+            )
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            snapshot.current_turn = 1
+
+    def test_diff(self):
+        first, second = self.play(1)
+        added = [
+            change
+            for change in first.diff(None).changes
+            if isinstance(change, VehicleAdded)
+        ]
+        self.assertEqual(len(first.vehicles), len(added))
+        self.assertEqual((), first.diff(first).changes)
+        positions = {vehicle.t_id: vehicle.position for vehicle in first.vehicles}
+        moved = {
+            vehicle.t_id
+            for vehicle in second.vehicles
+            if positions[vehicle.t_id] != vehicle.position
+        }
+        self.assertTrue(moved)
+        self.assertEqual(
+            moved,
+            {
+                change.t_id
+                for change in second.diff(first).changes
+                if isinstance(change, VehicleMoved)
+            },
+        )
+
+    def test_apply(self):
+        snapshots = self.play(12)
+        model = ViewModel()
+        previous = None
+        for snapshot in snapshots:
+            model.apply(snapshot.diff(previous))
+            previous = snapshot
+            self.assertEqual(snapshot.vehicle_cells, model.vehicle_cells)
+            self.assertEqual(dict(snapshot.catapult_usage), model.catapult_usage)
+        self.assertEqual(snapshots[-1].current_turn, model.current_turn)
+
+    def test_apply_swap(self):
+        snapshot = GameSnapshot.from_state(self.sim.get_state(1))
+        first, second = snapshot.vehicles[:2]
+        free = next(
+            cell
+            for cell in sorted(self.sim.map.get_available_cells(), key=tuple)
+            if cell not in snapshot.vehicle_cells
+        )
+        model = ViewModel()
+        model.apply(snapshot.diff(None))
+        diff = dataclasses.replace(
+            snapshot.diff(snapshot),
+            changes=(
+                VehicleMoved(second.t_id, first.position),
+                VehicleMoved(first.t_id, free),
+            ),
+        )
+        dirty = model.apply(diff)
+        self.assertEqual({first.position, second.position, free}, dirty)
+        self.assertEqual(second.t_id, model.vehicle_cells[first.position].t_id)
+        self.assertEqual(first.t_id, model.vehicle_cells[free].t_id)
+        self.assertNotIn(second.position, model.vehicle_cells)
+        self.assertEqual(len(model.vehicles), len(model.vehicle_cells))
+
+    def test_columns_diff(self):
+        snapshots = [ColumnsSnapshot.from_state(self.sim.get_state(1))]
+        for _ in range(12):
+            self.engine.greedy_turn(self.sim, self.engine.base_distance["test_map"])
+            snapshots.append(ColumnsSnapshot.from_state(self.sim.get_state(1)))
+        model = ViewModel()
+        previous = None
+        for snapshot in snapshots:
+            diff = snapshot.diff(previous)
+            expected = snapshot.to_game_snapshot().diff(
+                None if previous is None else previous.to_game_snapshot()
+            )
+            self.assertEqual(expected, diff)
+            model.apply(diff)
+            previous = snapshot
+        last = snapshots[-1].to_game_snapshot()
+        self.assertEqual(last.vehicle_cells, model.vehicle_cells)
+        self.assertEqual((), snapshots[-1].diff(snapshots[-1]).changes)
+
+    def test_merge(self):
+        snapshots = self.play(12)
+        diff = snapshots[0].diff(None)
+        for previous, snapshot in zip(snapshots, snapshots[1:]):
+            diff = diff.merge(snapshot.diff(previous))
+        self.assertLessEqual(len(diff.changes), 3 * len(snapshots[-1].vehicles))
+        model = ViewModel()
+        model.apply(diff)
+        self.assertEqual(snapshots[-1].vehicle_cells, model.vehicle_cells)
+
+    def test_merge_removed(self):
+        first = GameSnapshot.from_state(self.sim.get_state(1))
+        vehicle = first.vehicles[0]
+        second = dataclasses.replace(first, vehicles=first.vehicles[1:])
+        diff = first.diff(None).merge(
+            dataclasses.replace(
+                second.diff(first),
+                changes=(HealthChanged(vehicle.t_id, 1),)
+                + second.diff(first).changes,
+            )
+        )
+        self.assertNotIn(VehicleAdded(vehicle), diff.changes)
+        self.assertIn(VehicleRemoved(vehicle.t_id), diff.changes)
+        model = ViewModel()
+        dirty = model.apply(diff)
+        self.assertNotIn(vehicle.t_id, model.vehicles)
+        self.assertNotIn(vehicle.position, dirty)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import random
+import unittest
+
+from config.config import Actions
+from logic.cell import Cell
+from logic.model import CENTER_POINT
+from logic.simulator import Simulator
+from logic.spatial import HexBuckets
+from tests.test_simulator import MAP_DATA, point
+
+
+class TestHexBuckets(unittest.TestCase):
+    def test_within(self):
+        rng = random.Random(0)
+        cells = sorted(Cell(*CENTER_POINT).in_radius(20), key=tuple)
+        placed = rng.sample(cells, 200)
+        buckets = HexBuckets(3)
+        for number, cell in enumerate(placed):
+            buckets.add(cell, number)
+        self.assertEqual(200, len(buckets))
+        for center in rng.sample(cells, 50):
+            for radius in (0, 2, 5, 30):
+                expected = {
+                    (cell, number)
+                    for number, cell in enumerate(placed)
+                    if center.cube_distance(cell) <= radius
+                }
+                self.assertEqual(expected, set(buckets.within(center, radius)))
+
+    def test_move(self):
+        buckets = HexBuckets()
+        buckets.add(Cell(0, 0, 0), "tank")
+        buckets.move(Cell(0, 0, 0), Cell(-9, 9, 0))
+        self.assertNotIn(Cell(0, 0, 0), buckets)
+        self.assertIn(Cell(-9, 9, 0), buckets)
+        self.assertEqual([], list(buckets.within(Cell(0, 0, 0), 3)))
+        self.assertEqual("tank", buckets.remove(Cell(-9, 9, 0)))
+        self.assertEqual(({}, 0), (buckets.buckets, len(buckets)))
+
+
+class TestGameStateVehicles(unittest.TestCase):
+    def setUp(self):
+        self.sim = Simulator.from_map_data(MAP_DATA)
+        self.state = self.sim.get_state(1)
+
+    def test_filters(self):
+        center = Cell(-5, -5, 10)
+        tanks = self.state.get_vehicles_within(center, 3)
+        self.assertEqual(5, len(tanks))
+        ours = self.state.get_vehicles_within(center, 3, player_id=1)
+        self.assertEqual(tanks, ours)
+        self.assertEqual([], self.state.get_vehicles_within(center, 3, enemy=True))
+        everything = self.state.get_vehicles_within(center, 30)
+        self.assertEqual(15, len(everything))
+        enemies = self.state.get_vehicles_within(center, 30, enemy=True)
+        self.assertEqual(
+            set(self.state.enemy_tanks), {tank.coordinates for tank in enemies}
+        )
+        aggressive = self.state.get_vehicles_within(center, 30, aggressive=True)
+        self.assertEqual(
+            set(self.state.aggressive_tanks), {tank.coordinates for tank in aggressive}
+        )
+
+    def test_update_data(self):
+        t_id = next(iter(self.state.our_tanks))
+        tank = self.state.our_tanks[t_id]
+        start = tank.coordinates
+        target = next(
+            cell
+            for cell in start.neighbours()
+            if cell not in self.state.tank_cells and cell in self.sim.map.cells
+        )
+        self.state.update_data(
+            (Actions.MOVE, {"vehicle_id": t_id, "target": point(*target)})
+        )
+        self.assertEqual([tank], self.state.get_vehicles_within(target, 0))
+        self.assertEqual([], self.state.get_vehicles_within(start, 0))
@@ -0,0 +1,35 @@
+import unittest
+
+from logic.tournament import run_tournament, VARIANTS
+from tests.test_simulator import MAP_DATA, TempMapCache
+
+
+map_cache_dir = TempMapCache()
+setUpModule = map_cache_dir.start
+tearDownModule = map_cache_dir.stop
+
+
+class TestTournament(unittest.TestCase):
+    def test_report(self):
+        report = run_tournament(MAP_DATA, ["default"] * 3, 3, processes=1)
+        self.assertEqual(3, report.games)
+        stat = report.statistic["default"]
+        self.assertEqual(9, stat.games)
+        self.assertEqual(3 - stat.draws // 3, stat.wins)
+        self.assertEqual(9 * 15, len(stat.latencies))
+
+    def test_deterministic(self):
+        variants = dict(VARIANTS, other=VARIANTS["default"])
+        seating = ["default", "other", "default"]
+        first = run_tournament(MAP_DATA, seating, 2, 1, 7, 15, variants)
+        second = run_tournament(MAP_DATA, seating, 2, 2, 7, 15, variants)
+        for name in ("default", "other"):
+            self.assertEqual(
+                first.statistic[name].capture_points,
+                second.statistic[name].capture_points,
+            )
+            self.assertEqual(first.statistic[name].wins, second.statistic[name].wins)
+
+
+if __name__ == "__main__":
+    unittest.main()
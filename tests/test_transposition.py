@@ -0,0 +1,80 @@
+import unittest
+
+from config.config import Actions
+from logic.model import GameMap, GameState
+from logic.simulator import Simulator
+from logic.transposition import TranspositionTable, zobrist_key
+from logic.vehicle import Vehicle
+from tests.test_simulator import MAP_DATA, TempMapCache, point
+
+
+map_cache_dir = TempMapCache()
+setUpModule = map_cache_dir.start
+tearDownModule = map_cache_dir.stop
+
+
+class TestTransposition(unittest.TestCase):
+    def test_zobrist_key(self):
+        self.assertEqual(zobrist_key("a", 1), zobrist_key("a", 1))
+        self.assertNotEqual(zobrist_key("a", 1), zobrist_key("a", 2))
+
+    def test_table(self):
+        table = TranspositionTable(2)
+        table.put(1, "a")
+        table.put(2, "b")
+        self.assertEqual("a", table.get(1))
+        table.put(3, "c")
+        self.assertNotIn(2, table)
+        self.assertIn(1, table)
+        self.assertIsNone(table.get(2))
+        self.assertEqual((1, 1), (table.hits, table.misses))
+
+    def test_incremental_hash(self):
+        sim = Simulator.from_map_data(MAP_DATA)
+        state = GameState(sim.state_data(), 1)
+        action = Actions.MOVE, {"vehicle_id": 2, "target": point(-4, -4, 8)}
+        state.update_data(action)
+        sim.apply(action)
+        self.assertEqual(GameState(sim.state_data(), 1).zobrist, state.zobrist)
+        self.assertNotEqual(GameState(sim.state_data(), 2).zobrist, 0)
+
+    def test_capture_points_key(self):
+        sim = Simulator.from_map_data(MAP_DATA)
+        keys = set()
+        for t_id, capture_points in ((None, 0), ("1", 1), ("7", 1)):
+            data = sim.state_data()
+            if t_id is not None:
+                data["vehicles"][t_id]["capture_points"] = capture_points
+            keys.add(GameState(data, 1).get_decision_key())
+        self.assertEqual(3, len(keys))
+
+    def test_cached_decision_on_base(self):
+        sim = Simulator.from_map_data(MAP_DATA)
+        game_map = GameMap(MAP_DATA)
+        states = []
+        for total in (0, 5):
+            data = sim.state_data()
+            medium = next(
+                i
+                for i in data["vehicles"].values()
+                if i["player_id"] == 1 and i["vehicle_type"] == "medium_tank"
+            )
+            medium.update(position=point(0, 0, 0), health=1, capture_points=total)
+            states.append(GameState(data, 1))
+        t_id = next(
+            t_id
+            for t_id, tank in states[0].our_tanks.items()
+            if tank.vehicle_type == "medium_tank"
+        )
+        decisions = TranspositionTable(10)
+        turns = []
+        for state in states:
+            vehicle = Vehicle.build(t_id, state.our_tanks[t_id])
+            vehicle.decisions = decisions
+            turns.append(vehicle.make_turn(state, game_map))
+        fresh = Vehicle.build(t_id, states[1].our_tanks[t_id])
+        self.assertEqual(fresh.make_turn(states[1], game_map), turns[1])
+
+
+if __name__ == "__main__":
+    unittest.main()